@@ -0,0 +1,179 @@
+"""Offline benchmarks for the collectors and fleet runner.
+
+    python -m benchmarks                      # every scenario with recorded server times
+    python -m benchmarks --quick              # scaled down for CI
+    python -m benchmarks --json out.json      # save results
+    python -m benchmarks --baseline out.json  # exit 1 if throughput or p90 regressed
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.backends import FakeAsyncSSHConnection, FakeSSHConnection, FakeWinRMConnection
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+from syscheck.fleet import run_fleet, run_fleet_async
+
+COLLECTOR_SCENARIOS = {
+    "linux-commands": (FakeSSHConnection, lambda: LinuxCollector(distro="rhel")),
+    "linux-batched": (FakeSSHConnection, lambda: LinuxCollector(distro="rhel", batched=True)),
+    "linux-channels": (FakeSSHConnection, lambda: LinuxCollector(distro="rhel", channels=4)),
+    "linux-proc-batched": (FakeSSHConnection, lambda: LinuxCollector(distro="rhel", batched=True, mode="proc")),
+    "windows-commands": (FakeWinRMConnection, lambda: WindowsCollector()),
+    "windows-batched": (FakeWinRMConnection, lambda: WindowsCollector(batched=True)),
+}
+
+FLEET_SCENARIOS = {
+    "linux": (FakeSSHConnection, lambda: LinuxCollector(distro="rhel", batched=True)),
+    "windows": (FakeWinRMConnection, lambda: WindowsCollector(batched=True)),
+}
+
+
+def percentile(values: list, percent: float) -> float:
+    # Nearest-rank, so every reported value is one that was actually measured
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(name: str, latencies: list, wall: float, units: int) -> dict:
+    return {
+        "name": name,
+        "count": units,
+        "wall": round(wall, 4),
+        "throughput": round(units / wall, 3) if wall else 0.0,
+        "p50": round(percentile(latencies, 50), 4),
+        "p90": round(percentile(latencies, 90), 4),
+        "p99": round(percentile(latencies, 99), 4),
+        "max": round(max(latencies), 4),
+    }
+
+
+def run_host(connection_class, make_collector, host: str, options) -> dict:
+    connector = connection_class(host, rtt=options.rtt, server_scale=options.server_scale)
+    try:
+        connector.connect()
+        return make_collector().collect(connector)
+    finally:
+        connector.close()
+
+
+def bench_collector(name: str, options) -> dict:
+    connection_class, make_collector = COLLECTOR_SCENARIOS[name]
+    latencies = []
+    started = time.perf_counter()
+    for iteration in range(options.iterations):
+        begin = time.perf_counter()
+        run_host(connection_class, make_collector, f"host{iteration}", options)
+        latencies.append(time.perf_counter() - begin)
+    return summarize(f"collector/{name}", latencies, time.perf_counter() - started, options.iterations)
+
+
+def bench_fleet(os_name: str, hosts: int, options) -> dict:
+    connection_class, make_collector = FLEET_SCENARIOS[os_name]
+    jobs = [
+        (f"{os_name}{index:04d}", lambda host=f"{os_name}{index:04d}": run_host(connection_class, make_collector, host, options))
+        for index in range(hosts)
+    ]
+    started = time.perf_counter()
+    finished = run_fleet(jobs, workers=options.workers)
+    wall = time.perf_counter() - started
+    return summarize(f"fleet/{os_name}/{hosts}", [result.elapsed for result in finished], wall, hosts)
+
+
+def bench_fleet_async(hosts: int, options) -> dict:
+    async def job(host):
+        connector = FakeAsyncSSHConnection(host, rtt=options.rtt, server_scale=options.server_scale)
+        await connector.connect()
+        try:
+            return await LinuxCollector(distro="rhel", batched=True).collect_async(connector)
+        finally:
+            await connector.close()
+
+    jobs = [(f"linux{index:04d}", lambda host=f"linux{index:04d}": job(host)) for index in range(hosts)]
+    started = time.perf_counter()
+    finished = asyncio.run(run_fleet_async(jobs, concurrency=options.concurrency))
+    wall = time.perf_counter() - started
+    return summarize(f"fleet-async/linux/{hosts}", [result.elapsed for result in finished], wall, hosts)
+
+
+def compare(results: list, baseline_path: str, tolerance: float) -> list:
+    with open(baseline_path) as f:
+        baseline = {entry["name"]: entry for entry in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if not previous:
+            continue
+        if result["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{result['name']}: throughput {result['throughput']} < {previous['throughput']}")
+        if result["p90"] > previous["p90"] * (1 + tolerance):
+            regressions.append(f"{result['name']}: p90 {result['p90']}s > {previous['p90']}s")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SysCheck-Lite offline benchmarks against simulated SSH/WinRM hosts")
+    parser.add_argument("--scenario", choices=["collector", "fleet", "all"], default="all", help="Which benchmarks to run")
+    parser.add_argument("--os", choices=["linux", "windows", "all"], default="all", help="Limit scenarios to one OS")
+    parser.add_argument("--hosts", default="1,10,100,1000", help="Comma separated fleet sizes")
+    parser.add_argument("--iterations", type=int, default=10, help="Collections per collector scenario")
+    parser.add_argument("--workers", type=int, default=100, help="Thread pool size for fleet scenarios")
+    parser.add_argument("--concurrency", type=int, default=1000, help="Concurrent hosts for the asyncio fleet scenario")
+    parser.add_argument("--rtt", type=float, default=0.02, help="Simulated network round trip in seconds")
+    parser.add_argument("--server-scale", type=float, default=1.0, help="Multiplier applied to the recorded server times")
+    parser.add_argument("--quick", action="store_true", help="Small fleets, 5 ms RTT and server times scaled to 10%% for CI")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --json file and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression against the baseline")
+    options = parser.parse_args(argv)
+    if options.quick:
+        options.hosts, options.iterations, options.rtt, options.server_scale = "1,10,100", 5, 0.005, 0.1
+    return options
+
+
+def main(argv=None) -> int:
+    options = parse_args(argv)
+    host_counts = [int(count) for count in options.hosts.split(",") if count.strip()]
+    oses = ["linux", "windows"] if options.os == "all" else [options.os]
+
+    results = []
+    if options.scenario in ("collector", "all"):
+        for name in COLLECTOR_SCENARIOS:
+            if name.split("-")[0] in oses:
+                results.append(bench_collector(name, options))
+                print_result(results[-1])
+    if options.scenario in ("fleet", "all"):
+        for os_name in oses:
+            for hosts in host_counts:
+                results.append(bench_fleet(os_name, hosts, options))
+                print_result(results[-1])
+        if "linux" in oses:
+            for hosts in host_counts:
+                results.append(bench_fleet_async(hosts, options))
+                print_result(results[-1])
+
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump({"rtt": options.rtt, "server_scale": options.server_scale, "results": results}, f, indent=2)
+
+    if options.baseline:
+        regressions = compare(results, options.baseline, options.tolerance)
+        for regression in regressions:
+            print(f"\033[91m[!] Regression {regression}\033[0m")
+        return 1 if regressions else 0
+    return 0
+
+
+def print_result(result: dict) -> None:
+    print(
+        f"{result['name']:<30} {result['count']:>6}  {result['wall']:>8.3f}s  {result['throughput']:>9.2f}/s  "
+        f"p50 {result['p50']:.3f}s  p90 {result['p90']:.3f}s  p99 {result['p99']:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
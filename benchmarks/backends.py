@@ -0,0 +1,136 @@
+"""Fake SSH and WinRM connections that replay recorded outputs with simulated latency.
+
+They expose the same methods the collectors call on SSHConnection,
+WinRMConnection and AsyncSSHConnection, so collectors and the fleet runner
+are exercised unchanged.
+"""
+import asyncio
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.recordings import LINUX_OUTPUTS, WINDOWS_OUTPUTS, lookup
+
+SHELL_MARKER = re.compile(r"^printf '%s\\n' '(__SYSCHECK_\w+?_(\d+)_BEGIN__)'$")
+POWERSHELL_ENTRY = re.compile(r"^    \$__sc\['((?:[^']|'')*)'\] = \(& \{ (.*) \} \| Out-String\)\.Trim\(\)$")
+
+
+def replay_shell_batch(script: str, recordings: list) -> tuple:
+    # Answers a build_shell_batch script the way bash would, one marked section per command
+    lines = script.splitlines()
+    output = []
+    server_time = 0.0
+    for index, line in enumerate(lines):
+        match = SHELL_MARKER.match(line)
+        if not match:
+            continue
+        begin = match.group(1)
+        prefix = begin[:-len("BEGIN__")]
+        command = lines[index + 2]
+        stdout, seconds = lookup(recordings, command)
+        server_time += seconds
+        output.extend([begin, stdout, f"{prefix}STDERR__ 0", "", f"{prefix}END__"])
+    return "\n".join(output), server_time
+
+
+def replay_powershell_batch(script: str, recordings: list) -> tuple:
+    payload = {}
+    server_time = 0.0
+    for line in script.splitlines():
+        match = POWERSHELL_ENTRY.match(line)
+        if match:
+            stdout, seconds = lookup(recordings, match.group(2))
+            payload[match.group(1).replace("''", "'")] = stdout
+            server_time += seconds
+    return json.dumps(payload), server_time
+
+
+class FakeConnection:
+    recordings = []
+    # Round trips spent on TCP, key exchange and authentication before the first command
+    connect_round_trips = 1
+
+    def __init__(self, host: str, rtt: float = 0.02, server_scale: float = 1.0, **_):
+        self.host = host
+        self.rtt = rtt
+        self.server_scale = server_scale
+        self.connected = False
+        self.commands_run = 0
+
+    def respond(self, command: str) -> tuple:
+        return lookup(self.recordings, command)
+
+    def connect(self) -> bool:
+        time.sleep(self.rtt * self.connect_round_trips)
+        self.connected = True
+        return True
+
+    def run_command(self, command: str, log = "") -> str:
+        if not self.connected:
+            raise RuntimeError("Fake client not connected")
+        output, server_time = self.respond(command)
+        self.commands_run += 1
+        time.sleep(self.rtt + server_time * self.server_scale)
+        return output
+
+    def is_active(self) -> bool:
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+class FakeSSHConnection(FakeConnection):
+    recordings = LINUX_OUTPUTS
+    connect_round_trips = 4
+
+    def respond(self, command: str) -> tuple:
+        if "__SYSCHECK_" in command:
+            return replay_shell_batch(command, self.recordings)
+        return lookup(self.recordings, command)
+
+    def run_commands(self, commands: dict, max_channels: int = 4) -> dict:
+        # Channels share the transport, so the commands overlap the same way they do over paramiko
+        with ThreadPoolExecutor(max_workers=max(1, min(max_channels, len(commands) or 1))) as executor:
+            outputs = list(executor.map(self.run_command, commands.values()))
+        return dict(zip(commands, outputs))
+
+
+class FakeWinRMConnection(FakeConnection):
+    recordings = WINDOWS_OUTPUTS
+    # NTLM negotiation plus the whoami probe made by WinRMConnection.connect
+    connect_round_trips = 3
+
+    def respond(self, command: str) -> tuple:
+        if command.startswith("$__sc = [ordered]@{}"):
+            return replay_powershell_batch(command, self.recordings)
+        return lookup(self.recordings, command)
+
+
+class FakeAsyncSSHConnection(FakeSSHConnection):
+    async def connect(self) -> bool:
+        await asyncio.sleep(self.rtt * self.connect_round_trips)
+        self.connected = True
+        return True
+
+    async def run_command(self, command: str, log = "") -> str:
+        if not self.connected:
+            raise RuntimeError("Fake client not connected")
+        output, server_time = self.respond(command)
+        self.commands_run += 1
+        await asyncio.sleep(self.rtt + server_time * self.server_scale)
+        return output
+
+    async def run_commands(self, commands: dict, max_channels: int = 4) -> dict:
+        semaphore = asyncio.Semaphore(max(1, max_channels))
+
+        async def run_one(command):
+            async with semaphore:
+                return await self.run_command(command)
+
+        outputs = await asyncio.gather(*(run_one(command) for command in commands.values()))
+        return dict(zip(commands, outputs))
+
+    async def close(self):
+        self.connected = False
@@ -0,0 +1,88 @@
+"""Command outputs captured from real hosts, with the server time each command took.
+
+Each entry is (substring of the command, output, server seconds). The first
+entry whose substring appears in a command answers it.
+"""
+
+LINUX_SERVICES = "\n".join(
+    [
+        "sshd.service                     loaded active running OpenSSH server daemon",
+        "nginx.service                    loaded active running A high performance web server and a reverse proxy server",
+        "mariadb.service                  loaded active running MariaDB 10.5 database server",
+        "firewalld.service                loaded active running firewalld - dynamic firewall daemon",
+        "postgresql.service               loaded failed failed  PostgreSQL database server",
+    ]
+    + [f"system-unit-{index:03d}.service         loaded active running Generated unit {index}" for index in range(120)]
+)
+
+LINUX_JOURNAL = "\n".join(
+    f"Oct 18 0{index}:12:44 web01 kernel: ata1.00: failed command: READ FPDMA QUEUED (tag {index})" for index in range(10)
+)
+
+LINUX_OUTPUTS = [
+    ("hostname", "web01.example.com", 0.001),
+    ("uptime -p", "up 3 weeks, 2 days, 4 hours, 11 minutes", 0.002),
+    ("/etc/os-release", '"Rocky Linux 9.4 (Blue Onyx)"', 0.002),
+    ("uname -r", "5.14.0-427.13.1.el9_4.x86_64", 0.001),
+    ("top -bn1", "7.4% used", 0.150),
+    ("/Mem:/", "8058470400 2311929856", 0.002),
+    ("/Swap:/", "4294963200 12582912", 0.002),
+    ("stat -c %y", "2026-10-02 03:14:07.123456789 +0000", 0.001),
+    ("timedatectl", "UTC", 0.030),
+    ("getenforce", "Enforcing", 0.002),
+    (
+        "df -B1",
+        "Filesystem       1B-blocks        Used       Avail Use% Mounted on\n"
+        "/dev/mapper/rl-root 53660876800 21474836480 32186040320  41% /\n"
+        "/dev/sda1        1063256064   334495744   728760320  32% /boot\n"
+        "/dev/mapper/rl-home 26830438400 24159191040  2671247360  91% /home\n"
+        "tmpfs            4029235200           0  4029235200   0% /dev/shm",
+        0.003,
+    ),
+    ("journalctl", LINUX_JOURNAL, 0.045),
+    ("systemctl list-units", LINUX_SERVICES, 0.025),
+    (
+        "/proc/uptime",
+        "1987861.52 7512331.33\n0.42 0.31 0.20 2/312 5123\n"
+        "MemTotal:        7869600 kB\nMemFree:          812340 kB\nMemAvailable:    5612344 kB\n"
+        "SwapTotal:       4194300 kB\nSwapFree:        4182012 kB\n"
+        "cpu  1000 0 500 8000 500 0 0 0 0 0\nctxt 987654\ncpu  1100 0 550 8300 550 0 0 0 0 0",
+        0.500,
+    ),
+]
+
+WINDOWS_SERVICES = "\n".join(
+    ["MSSQLSERVER\tRunning", "SQLSERVERAGENT\tRunning", "W3SVC\tRunning", "IISADMIN\tRunning", "Dnscache\tRunning",
+     "WinDefend\tRunning", "mpssvc\tRunning", "DHCPServer\tStopped"]
+    + [f"Service{index:03d}\t{'Running' if index % 3 else 'Stopped'}" for index in range(220)]
+)
+
+WINDOWS_EVENTS = "\n".join(
+    f"10/18/2026 0{index}:02:11 [7031] The Print Spooler service terminated unexpectedly. It has done this {index} time(s)."
+    for index in range(10)
+)
+
+WINDOWS_OUTPUTS = [
+    ("hostname", "WIN-APP01", 0.010),
+    ("LastBootUpTime", "Monday, October 6, 2026 2:14:51 AM", 0.120),
+    (").Caption", "Microsoft Windows Server 2022 Standard", 0.120),
+    (").Version", "10.0.20348", 0.120),
+    # Get-Counter waits for its one second sample interval
+    ("Get-Counter", "12.37", 1.050),
+    ("TotalVisibleMemorySize", "17179332608 9865125888", 0.130),
+    ("Win32_PageFileUsage", "2550136832 104857600", 0.140),
+    ("Get-HotFix", "Tuesday, October 14, 2026 12:00:00 AM", 0.600),
+    ("Get-TimeZone", "UTC", 0.020),
+    ("Get-MpComputerStatus", "True", 0.250),
+    ("Get-PSDrive", "C 85899345920 42949672960\nD 214748364800 322122547200", 0.060),
+    ("Get-EventLog", WINDOWS_EVENTS, 0.400),
+    ("Get-WinEvent", WINDOWS_EVENTS, 0.350),
+    ("Get-Service", WINDOWS_SERVICES, 0.300),
+]
+
+
+def lookup(recordings: list, command: str) -> tuple:
+    for pattern, output, server_time in recordings:
+        if pattern in command:
+            return output, server_time
+    return "", 0.001
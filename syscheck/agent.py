@@ -0,0 +1,234 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from syscheck.timings import timed
+
+
+class NeedPassword(Exception):
+    pass
+
+
+class _Session:
+    def __init__(self):
+        self.connector = None
+        self.lock = threading.Lock()
+        self.last_used = time.time()
+
+
+class SessionPool:
+    def __init__(self, factory, max_sessions: int = 32, idle_timeout: float = 600):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def session_key(target: dict) -> tuple:
+        return tuple(target.get(field) for field in ("os", "host", "user", "key", "domain"))
+
+    def _checkout(self, key: tuple) -> _Session:
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                if len(self.sessions) >= self.max_sessions:
+                    self._evict_lru()
+                session = self.sessions[key] = _Session()
+            session.last_used = time.time()
+            return session
+
+    def _evict_lru(self) -> None:
+        idle = [(s.last_used, k) for k, s in self.sessions.items() if not s.lock.locked()]
+        if not idle:
+            raise ConnectionError(f"Agent is at its limit of {self.max_sessions} busy sessions")
+        _, key = min(idle)
+        self._close(self.sessions.pop(key))
+
+    @staticmethod
+    def _close(session: _Session) -> None:
+        if session.connector:
+            try:
+                session.connector.close()
+            except Exception:
+                pass
+            session.connector = None
+
+    def run(self, target: dict, password: Optional[str] = None, command: Optional[str] = None) -> Optional[str]:
+        session = self._checkout(self.session_key(target))
+        with session.lock:
+            if session.connector is None or not session.connector.is_active():
+                if not target.get("key") and password is None:
+                    raise NeedPassword()
+                connector = self.factory(target, password)
+                connector.connect()
+                session.connector = connector
+
+            output = session.connector.run_command(command) if command is not None else None
+            session.last_used = time.time()
+            return output
+
+    def evict_idle(self) -> int:
+        now = time.time()
+        evicted = 0
+        with self.lock:
+            for key, session in list(self.sessions.items()):
+                if now - session.last_used > self.idle_timeout and not session.lock.locked():
+                    self._close(self.sessions.pop(key))
+                    evicted += 1
+        return evicted
+
+    def close_all(self) -> None:
+        with self.lock:
+            for session in self.sessions.values():
+                self._close(session)
+            self.sessions.clear()
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.dispatch(json.loads(line))
+            except NeedPassword:
+                reply = {"ok": False, "need_password": True, "error": "Password required to open a new session"}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+# socketserver only defines UnixStreamServer where AF_UNIX exists; serve() refuses to start elsewhere
+_UnixStreamServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+class AgentServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, pool: SessionPool):
+        self.pool = pool
+        super().__init__(str(socket_path), _AgentHandler)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "sessions": len(self.pool.sessions)}
+        if op == "connect":
+            self.pool.run(request["target"], request.get("password"))
+            return {"ok": True}
+        if op == "run":
+            return {"ok": True, "output": self.pool.run(request["target"], request.get("password"), request["command"])}
+        if op == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        raise ValueError(f"Unknown agent operation: {op}")
+
+
+def serve(socket_path: Path, factory, max_sessions: int = 32, idle_timeout: float = 600) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("The SysCheck agent requires Unix domain socket support")
+
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if agent_available(socket_path):
+        raise ValueError(f"An agent is already running at {socket_path}")
+    if socket_path.exists():
+        socket_path.unlink()
+
+    pool = SessionPool(factory, max_sessions=max_sessions, idle_timeout=idle_timeout)
+    server = AgentServer(socket_path, pool)
+    os.chmod(socket_path, 0o600)
+
+    def reap():
+        while True:
+            time.sleep(min(idle_timeout, 30))
+            pool.evict_idle()
+
+    threading.Thread(target=reap, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        pool.close_all()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def send_request(socket_path: Path, request: dict, timeout: float = 1.0) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        return json.loads(sock.makefile("rb").readline())
+
+
+def agent_available(socket_path: Path) -> bool:
+    if not hasattr(socket, "AF_UNIX") or not Path(socket_path).exists():
+        return False
+    try:
+        return send_request(socket_path, {"op": "ping"}, timeout=0.5).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+
+class AgentConnection:
+    def __init__(self, socket_path: Path, target: dict, password: Optional[str] = None, prompt_password=None):
+        self.socket_path = Path(socket_path)
+        self.target = target
+        self.host = target.get("host")
+        self.password = password
+        self.prompt_password = prompt_password
+        self.sock = None
+        self.stream = None
+
+    def _request(self, request: dict) -> dict:
+        self.stream.write(json.dumps(request).encode() + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def connect(self) -> bool:
+        try:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(str(self.socket_path))
+            self.stream = self.sock.makefile("rwb")
+            reply = self._request({"op": "connect", "target": self.target, "password": self.password})
+
+            if reply.get("need_password") and self.prompt_password:
+                self.password = self.prompt_password()
+                reply = self._request({"op": "connect", "target": self.target, "password": self.password})
+        except OSError as e:
+            raise ConnectionError(f"Failed to reach SysCheck agent at {self.socket_path}: {e}")
+
+        if not reply.get("ok"):
+            raise ConnectionError(reply.get("error", f"Agent failed to connect to {self.host}"))
+        return True
+
+    def run_command(self, command: str, log = "") -> str:
+        if not self.stream:
+            raise RuntimeError("Agent connection not open")
+
+        try:
+            with timed(self.host, "command", command) as span:
+                span.bytes_out = len(command)
+                reply = self._request({"op": "run", "target": self.target, "password": self.password, "command": command})
+                span.bytes_in = len(reply.get("output") or "")
+        except (OSError, ValueError) as e:
+            return f"Error Collecting : {e}"
+
+        return reply["output"] if reply.get("ok") else f"Error Collecting : {reply.get('error')}"
+
+    def is_active(self) -> bool:
+        return self.stream is not None
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.sock:
+            self.sock.close()
+            self.sock = None
@@ -0,0 +1,45 @@
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+EMPTY_DIGEST = hashlib.sha256(b"").hexdigest()
+
+
+def digest_of(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def blob_ref(digest: str) -> str:
+    return f"sha256:{digest}"
+
+
+class BlobStore:
+    # Content-addressed text blobs shared by every host, one file per SHA-256 digest
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _file(self, digest: str) -> Path:
+        return self.path / digest[:2] / digest
+
+    def get(self, digest: str) -> Optional[str]:
+        if not DIGEST_PATTERN.match(digest) or digest == EMPTY_DIGEST:
+            return None
+        try:
+            return self._file(digest).read_bytes().decode()
+        except OSError:
+            return None
+
+    def put(self, text: str) -> str:
+        digest = digest_of(text)
+        path = self._file(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Hosts finishing together may write the same blob, the rename keeps every reader seeing a whole file
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(text.encode())
+            os.replace(temp_path, path)
+        return digest
@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from syscheck.collectors.parsers import is_error
+
+
+class ResultCache:
+    def __init__(self, path: Path, refresh: bool = False):
+        self.path = Path(path)
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with self.path.open() as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, host: str, metric: str, ttl: float):
+        if self.refresh:
+            return None
+        with self.lock:
+            entry = self.entries.get(host, {}).get(metric)
+        if entry is None or time.time() - entry["time"] > ttl:
+            return None
+        return entry["value"]
+
+    def set(self, host: str, metric: str, value) -> None:
+        if isinstance(value, str) and is_error(value):
+            return
+        with self.lock:
+            self.entries.setdefault(host, {})[metric] = {"value": value, "time": time.time()}
+            self.dirty = True
+
+    def lookup(self, host: str, ttls: dict) -> dict:
+        cached = {}
+        for metric, ttl in ttls.items():
+            value = self.get(host, metric, ttl)
+            if value is not None:
+                cached[metric] = value
+        return cached
+
+    def store(self, host: str, values: dict) -> None:
+        for metric, value in values.items():
+            self.set(host, metric, value)
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with temp_path.open("w") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
@@ -1,4 +1,12 @@
-import fnmatch
+from syscheck.collectors.events import build_journal_command, advance_cursor
+from syscheck.collectors.matcher import service_matcher
+from syscheck.collectors.batch import build_shell_batch, parse_shell_batch, send_batch
+from syscheck.collectors.procfs import PROC_METRICS, build_proc_command, parse_proc_snapshot
+from syscheck.collectors.probe import NO_PYTHON, PROBE_METRICS, build_probe_command, parse_probe_output
+from syscheck.collectors.fingerprint import FINGERPRINT_METRICS, hash_commands, resolve_fingerprints, store_fetched
+from syscheck.collectors.parsers import is_error, parse_percent, parse_memory, parse_linux_disks, parse_service_state
+from syscheck.collectors.steps import run_steps, run_steps_async
+from syscheck.timings import timed
 
 DEFAULT_SERVICE_PATTERNS = [
     "*ssh*", 
@@ -12,17 +20,47 @@ DEFAULT_SERVICE_PATTERNS = [
     "*sshd*"
     ]
 
+STATIC_METRIC_TTLS = {
+    "Hostname": 24 * 3600,
+    "OS Version": 24 * 3600,
+    "Kernel": 3600,
+    "Last Update": 3600,
+    "TimeZone": 24 * 3600,
+}
+
+EVENT_METRIC = "New Journalctl Errors"
+
+# Cache entry marking a host without python3, kept for a day so a later install of python3 is picked up
+PROBE_UNAVAILABLE = "Probe Unavailable"
+PROBE_UNAVAILABLE_TTL = 24 * 3600
+
+VOLATILE_METRICS = ["Uptime", "Load Average", "CPU Usage", "Memory Usage", "Swap Usage", "Disk Usage", "Services", "Proc Snapshot"]
+
 class LinuxCollector:
-    def __init__(self, services=None, distro=None):
+    def __init__(self, services=None, distro=None, batched=False, channels=1, mode="commands", cpu_interval=0.5, cache=None,
+                 incremental=False, max_events=100, cursors=None, blobs=None):
         self.services = DEFAULT_SERVICE_PATTERNS + (services or [])
+        self.cache = cache
+        self.incremental = incremental
+        self.max_events = max_events
+        self.cursors = cursors
+        self.blobs = blobs
+        self.batched = batched
+        self.channels = channels
+        self.mode = mode
+        self.cpu_interval = cpu_interval
+        # Hosts found without python3 in probe mode, they are collected with plain commands from then on. The cache
+        # carries this across hosts' collectors and runs, the set covers collectors created without one.
+        self.probe_unavailable = set()
         
         
         if distro in ['rhel', 'rocky']:
-            package_command = "stat -c %y /var/log/dnf.rpm.log"
+            self.package_log = "/var/log/dnf.rpm.log"
         elif distro in ['debian', 'ubuntu']:
-            package_command = "stat -c %y /var/log/apt/history.log"
+            self.package_log = "/var/log/apt/history.log"
         else:
             raise ValueError("Unsupported Distribution")
+        package_command = f"stat -c %y {self.package_log}"
         
         self.collection_commands = {
             "Hostname": "hostname",
@@ -30,33 +68,187 @@ class LinuxCollector:
             "OS Version": "cat /etc/os-release | grep PRETTY_NAME | cut -d= -f2",
             "Kernel": "uname -r",
             "CPU Usage": "top -bn1 | grep \"Cpu(s)\" | awk '{print $2 + $4 \"% used\"}'",
-            "Memory Usage": "free | awk '/Mem:/ { printf(\"%.2f%% used\\n\", $3/$2 * 100) }'",
-            "Swap Usage": "free | awk '/Swap:/ && $2 > 0 { printf(\"%.2f%% used\\n\", $3/$2 * 100) }'",
+            "Memory Usage": "free -b | awk '/Mem:/ { print $2, $3 }'",
+            "Swap Usage": "free -b | awk '/Swap:/ { print $2, $3 }'",
             "Last Update": package_command,
             "TimeZone": "timedatectl show -p Timezone --value",
             "SELinux Status": "getenforce",
-            "Disk Usage": "df -h --output=source,size,used,avail,pcent,target",
+            "Disk Usage": "df -B1 --output=source,size,used,avail,pcent,target",
             "Last 10 Journalctl Errors": "journalctl -p 3 -n 10 --no-pager"
         }
-    def collect(self, connector):
-        system_info = {}
+        self.parsers = {
+            "CPU Usage": parse_percent,
+            "Memory Usage": parse_memory,
+            "Swap Usage": parse_memory,
+            "Disk Usage": parse_linux_disks,
+        }
+        self.service_list_command = "systemctl list-units --type=service --no-pager --no-legend --plain"
 
-        for key, command in self.collection_commands.items():
-            result = connector.run_command(command).strip()
-            system_info[key] = result.splitlines() if '\n' in result else result
+        if incremental:
+            # Only errors logged since the cursor saved for the host are fetched, so the command is built per host
+            self.collection_commands = {
+                (EVENT_METRIC if key == "Last 10 Journalctl Errors" else key): (None if key == "Last 10 Journalctl Errors" else command)
+                for key, command in self.collection_commands.items()
+            }
 
+        if mode == "proc":
+            # Metrics read from /proc are filled in from one snapshot command, keeping their place in the report
+            proc_commands = {}
+            for key, command in self.collection_commands.items():
+                proc_commands[key] = None if key in PROC_METRICS else command
+                if key == "Uptime":
+                    proc_commands["Load Average"] = None
+            self.collection_commands = proc_commands
+            self.proc_command = build_proc_command(cpu_interval)
+        elif mode not in ("commands", "probe"):
+            raise ValueError(f"Unsupported collection mode: {mode}")
+
+    def build_commands(self, skip=(), host=None) -> dict:
+        commands = {key: command for key, command in self.collection_commands.items() if command is not None and key not in skip}
+        if self.mode == "proc":
+            commands["Proc Snapshot"] = self.proc_command
+        if self.incremental:
+            cursor = self.cursors.get(host, EVENT_METRIC, float("inf")) if self.cursors else None
+            commands[EVENT_METRIC] = build_journal_command(cursor, self.max_events)
         if self.services:
-            all_services = connector.run_command("systemctl list-units --type=service --no-pager --no-legend").splitlines()
-            available_services = [line.split()[0].replace('.service', '') for line in all_services]
+            commands["Services"] = self.service_list_command
+        return commands
+
+    def build_batch(self, commands):
+        return build_shell_batch(commands)
+
+    def parse_batch(self, output, commands, token):
+        results = parse_shell_batch(output, commands, token)
+        return {key: result.output for key, result in results.items()}
+
+    def run_batched(self, connector, commands):
+        script, token = self.build_batch(commands)
+        with timed(connector.host, "batch", f"{len(commands)} commands"):
+            return self.parse_batch((yield lambda: send_batch(connector, script)), commands, token)
+
+    def build_probe(self, commands) -> str:
+        return build_probe_command(commands, self.package_log, self.cpu_interval)
+
+    def use_probe(self, connector) -> bool:
+        if self.mode != "probe" or connector.host in self.probe_unavailable:
+            return False
+        return not (self.cache and self.cache.get(connector.host, PROBE_UNAVAILABLE, PROBE_UNAVAILABLE_TTL))
+
+    def parse_probe(self, connector, output):
+        if output.strip() == NO_PYTHON:
+            self.probe_unavailable.add(connector.host)
+            if self.cache:
+                self.cache.set(connector.host, PROBE_UNAVAILABLE, True)
+        return parse_probe_output(output)
+
+    def run_probe(self, connector, commands):
+        script = self.build_probe(commands)
+        with timed(connector.host, "probe", f"{len(commands)} metrics"):
+            return self.parse_probe(connector, (yield lambda: send_batch(connector, script)))
+
+    def cached_metrics(self, connector) -> dict:
+        return self.cache.lookup(connector.host, STATIC_METRIC_TTLS) if self.cache else {}
+
+    def update_cache(self, connector, system_info, cached) -> None:
+        if self.cache:
+            fetched = {key: system_info[key] for key in STATIC_METRIC_TTLS if key in system_info and key not in cached}
+            self.cache.store(connector.host, fetched)
+
+    def execute_steps(self, connector, commands):
+        outputs = (yield from self.run_probe(connector, commands)) if self.use_probe(connector) else None
+        if outputs is None:
+            outputs = (yield from self.run_batched(connector, commands)) if self.batched else {}
+
+        # Anything the probe or batch could not account for is retried on its own
+        remaining = {key: command for key, command in commands.items() if key not in outputs}
+        retries = 1 if self.batched else 0
+        if self.channels > 1 and hasattr(connector, "run_commands"):
+            with timed(connector.host, "channels", f"{len(remaining)} commands", retries * len(remaining)):
+                outputs.update((yield lambda: connector.run_commands(remaining, max_channels=self.channels)))
+        else:
+            for key, command in remaining.items():
+                with timed(connector.host, "metric", key, retries):
+                    outputs[key] = yield lambda command=command: connector.run_command(command)
+        return outputs
+
+    def execute(self, connector, commands) -> dict:
+        return run_steps(self.execute_steps(connector, commands))
+
+    def fingerprinted(self, commands) -> dict:
+        # Metrics the probe reads natively never run as commands, so there is nothing to hash remotely
+        skip = PROBE_METRICS if self.mode == "probe" else ()
+        return {key: commands[key] for key in FINGERPRINT_METRICS if key in commands and key not in skip} if self.blobs else {}
+
+    def execute_fingerprinted(self, connector, commands):
+        # Static sections come back as digests first, only text whose digest is new to the blob store is fetched
+        originals = self.fingerprinted(commands)
+        outputs = yield from self.execute_steps(connector, {**commands, **hash_commands(originals)})
+        fingerprints, missing = resolve_fingerprints(self.blobs, originals, outputs)
+        if missing:
+            fingerprints.update(store_fetched(self.blobs, (yield from self.execute_steps(connector, missing)), outputs))
+        return outputs, fingerprints
+
+    def collect_steps(self, connector):
+        cached = self.cached_metrics(connector)
+        commands = self.build_commands(skip=cached, host=connector.host)
+        outputs, fingerprints = yield from self.execute_fingerprinted(connector, commands)
+
+        if self.incremental:
+            outputs[EVENT_METRIC] = advance_cursor(self.cursors, connector.host, EVENT_METRIC, outputs[EVENT_METRIC])
+        system_info = self.build_system_info(outputs, cached)
+        self.update_cache(connector, system_info, cached)
+        if fingerprints:
+            system_info["Fingerprints"] = fingerprints
+        return system_info
+
+    def collect(self, connector):
+        with timed(connector.host, "collect", type(self).__name__):
+            return run_steps(self.collect_steps(connector))
+
+    async def collect_async(self, connector):
+        with timed(connector.host, "collect", type(self).__name__):
+            return await run_steps_async(self.collect_steps(connector))
+
+    def collect_volatile(self, connector):
+        commands = {key: command for key, command in self.build_commands().items() if key in VOLATILE_METRICS}
+        return self.build_system_info(self.execute(connector, commands), only=VOLATILE_METRICS)
+
+    def build_system_info(self, outputs, cached=None, only=None):
+        system_info = {}
+        cached = cached or {}
+        proc_metrics = parse_proc_snapshot(outputs["Proc Snapshot"].strip()) if "Proc Snapshot" in outputs else {}
+
+        for key in self.collection_commands:
+            if only is not None and key not in only:
+                continue
+            if key in cached:
+                system_info[key] = cached[key]
+                continue
+            if key in proc_metrics:
+                system_info[key] = proc_metrics[key]
+                continue
+            if not isinstance(outputs[key], str):
+                system_info[key] = outputs[key]
+                continue
+            result = outputs[key].strip()
+            parsed = self.parsers[key](result) if key in self.parsers and not is_error(result) else None
+            if parsed is not None:
+                system_info[key] = parsed
+            else:
+                system_info[key] = result.splitlines() if '\n' in result else result
 
-            matched = set()
-            for pattern in self.services:
-                matched.update(fnmatch.filter(available_services, pattern))
+        if self.services and "Services" in outputs:
+            # ACTIVE column from list-units is the same state `systemctl is-active` reports
+            available_services = {}
+            for line in outputs["Services"].splitlines():
+                columns = line.split()
+                if len(columns) >= 3:
+                    available_services[columns[0].replace('.service', '')] = parse_service_state(columns[2])
 
-            status_results = {}
-            for service in matched:
-                status = connector.run_command(f"systemctl is-active {service}").strip()
-                status_results[service] = status
+            matcher = service_matcher(tuple(self.services))
+            status_results = {
+                service: status for service, status in available_services.items() if matcher.matches(service)
+            }
 
             system_info["Services"] = status_results
 
@@ -1,4 +1,9 @@
-import fnmatch
+from syscheck.collectors.events import build_eventlog_command, advance_cursor
+from syscheck.collectors.matcher import service_matcher
+from syscheck.collectors.batch import build_powershell_batch, parse_powershell_batch, send_batch
+from syscheck.collectors.parsers import is_error, parse_percent, parse_memory, parse_windows_disks, parse_service_state
+from syscheck.collectors.steps import run_steps, run_steps_async
+from syscheck.timings import timed
 
 DEFAULT_SERVICE_PATTERNS = [
     "*SQL*",          
@@ -10,49 +15,148 @@ DEFAULT_SERVICE_PATTERNS = [
     "*Firewall*",       
 ]
 
+STATIC_METRIC_TTLS = {
+    "Hostname": 24 * 3600,
+    "OS Version": 24 * 3600,
+    "Build": 24 * 3600,
+    "Last Windows Update": 3600,
+    "TimeZone": 24 * 3600,
+}
+
+EVENT_METRIC = "New System Errors"
+
+VOLATILE_METRICS = ["Uptime", "CPU Usage", "Memory Usage", "Swap Usage", "Disk Usage", "Services"]
+
 class WindowsCollector:
-    def __init__(self, services=None):
+    def __init__(self, services=None, batched=False, cache=None, incremental=False, max_events=100, cursors=None):
         self.services = DEFAULT_SERVICE_PATTERNS + (services or [])
+        self.cache = cache
+        self.incremental = incremental
+        self.max_events = max_events
+        self.cursors = cursors
+        self.batched = batched
         self.collection_commands = {
             "Hostname": "hostname",
             "Uptime": "(Get-CimInstance Win32_OperatingSystem).LastBootUpTime",
             "OS Version": "(Get-CimInstance Win32_OperatingSystem).Caption",
             "Build": "(Get-CimInstance Win32_OperatingSystem).Version",
             "CPU Usage": "$cpu = Get-Counter '\\Processor(_Total)\\% Processor Time' -SampleInterval 1 -MaxSamples 2; " + "[math]::Round(($cpu.CounterSamples | Select -ExpandProperty CookedValue | " + "Measure-Object -Average).Average, 2)",
-            "Memory Usage": "(Get-CimInstance Win32_OperatingSystem | Select-Object @{Name='UsedMemory';Expression={$_.TotalVisibleMemorySize - $_.FreePhysicalMemory}},@{Name='TotalMemory';Expression={$_.TotalVisibleMemorySize}}) | ForEach-Object {\"{0:N2}% used\" -f (($_.UsedMemory / $_.TotalMemory) * 100)}",
-            "Swap Usage": "(Get-CimInstance Win32_PageFileUsage | Select-Object @{Name='UsedMB';Expression={$_.CurrentUsage}},@{Name='AllocatedMB';Expression={$_.AllocatedBaseSize}}) | ForEach-Object {\"{0:N2}% used\" -f (($_.UsedMB / $_.AllocatedMB) * 100)}",
+            "Memory Usage": "$os = Get-CimInstance Win32_OperatingSystem; \"{0} {1}\" -f ($os.TotalVisibleMemorySize * 1KB), (($os.TotalVisibleMemorySize - $os.FreePhysicalMemory) * 1KB)",
+            "Swap Usage": "Get-CimInstance Win32_PageFileUsage | ForEach-Object { \"{0} {1}\" -f ($_.AllocatedBaseSize * 1MB), ($_.CurrentUsage * 1MB) }",
             "Last Windows Update": "Get-HotFix | Sort-Object InstalledOn -Descending | Select-Object -First 1 -ExpandProperty InstalledOn",
             "TimeZone": "(Get-TimeZone).Id",
             "Windows Defender Enabled": "Get-MpComputerStatus | Select-Object -ExpandProperty AMServiceEnabled",
-            "Disk Usage": "Get-PSDrive -PSProvider 'FileSystem' | Select-Object Name,Used,Free | ForEach-Object {\"{0}: Used: {1}G Free: {2}G\" -f $_.Name,($_.Used / 1GB -as [int]),($_.Free / 1GB -as [int])}",
+            "Disk Usage": "Get-PSDrive -PSProvider 'FileSystem' | Where-Object { $_.Used -ne $null } | ForEach-Object { \"{0} {1} {2}\" -f $_.Name, $_.Used, $_.Free }",
             "Last 10 System Errors": "Get-EventLog -LogName System -EntryType Error -Newest 10 | ForEach-Object { \"$($_.TimeGenerated) [$($_.EventID)] $($_.Message)`n\" }",
         }
+        if incremental:
+            # Only errors logged since the cursor saved for the host are fetched, so the command is built per host
+            self.collection_commands = {
+                (EVENT_METRIC if key == "Last 10 System Errors" else key): (None if key == "Last 10 System Errors" else command)
+                for key, command in self.collection_commands.items()
+            }
+
+        self.parsers = {
+            "CPU Usage": parse_percent,
+            "Memory Usage": parse_memory,
+            "Swap Usage": parse_memory,
+            "Disk Usage": parse_windows_disks,
+        }
+        self.service_list_command = "Get-Service | ForEach-Object { \"{0}`t{1}\" -f $_.Name, $_.Status }"
+
+    def build_commands(self, skip=(), host=None) -> dict:
+        commands = {key: command for key, command in self.collection_commands.items() if command is not None and key not in skip}
+        if self.incremental:
+            cursor = self.cursors.get(host, EVENT_METRIC, float("inf")) if self.cursors else None
+            commands[EVENT_METRIC] = build_eventlog_command(cursor, self.max_events)
+        if self.services:
+            commands["Services"] = self.service_list_command
+        return commands
+
+    def build_batch(self, commands):
+        return build_powershell_batch(commands), None
+
+    def parse_batch(self, output, commands, token):
+        return parse_powershell_batch(output, commands)
+
+    def run_batched(self, connector, commands):
+        script, token = self.build_batch(commands)
+        with timed(connector.host, "batch", f"{len(commands)} commands"):
+            return self.parse_batch((yield lambda: send_batch(connector, script)), commands, token)
+
+    def cached_metrics(self, connector) -> dict:
+        return self.cache.lookup(connector.host, STATIC_METRIC_TTLS) if self.cache else {}
+
+    def update_cache(self, connector, system_info, cached) -> None:
+        if self.cache:
+            fetched = {key: system_info[key] for key in STATIC_METRIC_TTLS if key in system_info and key not in cached}
+            self.cache.store(connector.host, fetched)
 
+    def execute_steps(self, connector, commands):
+        outputs = (yield from self.run_batched(connector, commands)) if self.batched else {}
+
+        for key, command in commands.items():
+            if key not in outputs:
+                # Anything missing from the JSON payload is retried on its own
+                with timed(connector.host, "metric", key, 1 if self.batched else 0):
+                    outputs[key] = yield lambda command=command: connector.run_command(command)
+        return outputs
+
+    def execute(self, connector, commands) -> dict:
+        return run_steps(self.execute_steps(connector, commands))
+
+    def collect_steps(self, connector):
+        cached = self.cached_metrics(connector)
+        commands = self.build_commands(skip=cached, host=connector.host)
+        outputs = yield from self.execute_steps(connector, commands)
+
+        if self.incremental:
+            outputs[EVENT_METRIC] = advance_cursor(self.cursors, connector.host, EVENT_METRIC, outputs[EVENT_METRIC])
+        system_info = self.build_system_info(outputs, cached)
+        self.update_cache(connector, system_info, cached)
+        return system_info
 
     def collect(self, connector):
-        system_info = {}
+        with timed(connector.host, "collect", type(self).__name__):
+            return run_steps(self.collect_steps(connector))
 
-        for key, command in self.collection_commands.items():
-            result = connector.run_command(command).strip()
-            system_info[key] = result.splitlines() if '\n' in result else result
+    async def collect_async(self, connector):
+        with timed(connector.host, "collect", type(self).__name__):
+            return await run_steps_async(self.collect_steps(connector))
 
-        if self.services:
-            all_services = connector.run_command(
-                "Get-Service | Select-Object -ExpandProperty Name", "Collecting Service Information"
-            ).splitlines()
+    def collect_volatile(self, connector):
+        commands = {key: command for key, command in self.build_commands().items() if key in VOLATILE_METRICS}
+        return self.build_system_info(self.execute(connector, commands), only=VOLATILE_METRICS)
 
-            matched = set()
-            for pattern in self.services:
-                matched.update(fnmatch.filter(all_services, pattern))
+    def build_system_info(self, outputs, cached=None, only=None):
+        system_info = {}
+        cached = cached or {}
 
-            status_results = {}
-            for service in matched:
-                status = connector.run_command(
-                    f"(Get-Service -Name '{service}').Status"
-                ).strip()
-                status_results[service] = status
+        for key in self.collection_commands:
+            if only is not None and key not in only:
+                continue
+            if key in cached:
+                system_info[key] = cached[key]
+                continue
+            result = outputs[key].strip()
+            parsed = self.parsers[key](result) if key in self.parsers and not is_error(result) else None
+            if parsed is not None:
+                system_info[key] = parsed
+            else:
+                system_info[key] = result.splitlines() if '\n' in result else result
 
-            system_info["Services"] = status_results if status_results else "No matching services found"
+        if self.services and "Services" in outputs:
+            available_services = {}
+            for line in outputs["Services"].splitlines():
+                if "\t" in line:
+                    name, status = line.split("\t", 1)
+                    available_services[name.strip()] = parse_service_state(status.strip())
 
+            matcher = service_matcher(tuple(self.services))
+            status_results = {
+                service: status for service, status in available_services.items() if matcher.matches(service)
+            }
+
+            system_info["Services"] = status_results if status_results else "No matching services found"
 
         return system_info
@@ -0,0 +1,129 @@
+import json
+import secrets
+from typing import NamedTuple
+
+
+class BatchResult(NamedTuple):
+    stdout: str
+    stderr: str
+    exit_status: int
+
+    @property
+    def output(self) -> str:
+        # Mirrors the connector's run_command contract so collectors can treat both paths the same,
+        # stderr is only an error when the command printed nothing else
+        if self.stderr and not self.stdout:
+            return f"Error Collecting : {self.stderr}"
+        return self.stdout
+
+
+def send_batch(connector, script: str):
+    # Returns the coroutine unchanged for async connectors, so callers await it the same way they await run_command
+    if getattr(connector, "compress", False) is True:
+        return connector.run_compressed(script)
+    return connector.run_command(script)
+
+
+def _marker(token: str, index: int, part: str) -> str:
+    return f"__SYSCHECK_{token}_{index}_{part}__"
+
+
+def build_shell_batch(commands: dict) -> tuple:
+    token = secrets.token_hex(8)
+    lines = [
+        "{",
+        "__sc_err=$(mktemp) || __sc_err=/tmp/.syscheck_err.$$",
+    ]
+    for index, command in enumerate(commands.values()):
+        lines.extend([
+            f"printf '%s\\n' '{_marker(token, index, 'BEGIN')}'",
+            "{",
+            command,
+            "} 2>\"$__sc_err\"",
+            "__sc_rc=$?",
+            f"printf '\\n%s %s\\n' '{_marker(token, index, 'STDERR')}' \"$__sc_rc\"",
+            "cat \"$__sc_err\"",
+            f"printf '\\n%s\\n' '{_marker(token, index, 'END')}'",
+        ])
+    lines.extend([
+        "rm -f \"$__sc_err\"",
+        "} 2>/dev/null",
+    ])
+    return "\n".join(lines), token
+
+
+def parse_shell_batch(output: str, commands: dict, token: str) -> dict:
+    keys = list(commands)
+    results = {}
+    index = None
+    section = None
+    exit_status = 0
+    stdout_lines = []
+    stderr_lines = []
+
+    for line in output.splitlines():
+        if line.startswith(f"__SYSCHECK_{token}_"):
+            if index is None and line == _marker(token, len(results), "BEGIN"):
+                index = len(results)
+                section = "stdout"
+                stdout_lines, stderr_lines = [], []
+                continue
+            if index is not None and line.startswith(_marker(token, index, "STDERR")):
+                section = "stderr"
+                status = line.rsplit(" ", 1)[-1]
+                exit_status = int(status) if status.isdigit() else -1
+                continue
+            if index is not None and line == _marker(token, index, "END"):
+                results[keys[index]] = BatchResult(
+                    "\n".join(stdout_lines).strip(),
+                    "\n".join(stderr_lines).strip(),
+                    exit_status,
+                )
+                index = None
+                section = None
+                continue
+
+        if section == "stdout":
+            stdout_lines.append(line)
+        elif section == "stderr":
+            stderr_lines.append(line)
+
+    return results
+
+
+def _ps_quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_powershell_batch(commands: dict) -> str:
+    lines = ["$__sc = [ordered]@{}"]
+    for key, command in commands.items():
+        name = _ps_quote(key)
+        lines.extend([
+            "try {",
+            f"    $__sc[{name}] = (& {{ {command} }} | Out-String).Trim()",
+            "} catch {",
+            f"    $__sc[{name}] = \"Error Collecting : $($_.Exception.Message)\"",
+            "}",
+        ])
+    lines.append("$__sc | ConvertTo-Json -Compress")
+    return "\n".join(lines)
+
+
+def parse_powershell_batch(output: str, commands: dict) -> dict:
+    try:
+        payload = json.loads(output)
+    except ValueError:
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+
+    results = {}
+    for key in commands:
+        if key not in payload:
+            continue
+        value = payload[key]
+        value = "" if value is None else str(value).strip()
+        # An empty result is reported the same way WinRMConnection.run_command reports it
+        results[key] = value if value else "Error Collecting"
+    return results
@@ -0,0 +1,42 @@
+import shlex
+from typing import Optional
+
+from syscheck.collectors.parsers import is_error
+
+CURSOR_PREFIX = "-- cursor: "
+
+
+def build_journal_command(cursor: Optional[str], max_events: int) -> str:
+    command = f"journalctl -p 3 -n {max_events} --no-pager --show-cursor"
+    if cursor:
+        command += f" --after-cursor={shlex.quote(cursor)}"
+    return command
+
+
+def build_eventlog_command(cursor: Optional[str], max_events: int) -> str:
+    record_id = int(cursor) if cursor and cursor.isdigit() else 0
+    # -Oldest takes the first N events after the cursor, so a backlog larger than N is read over several runs
+    return (
+        f"$events = @(Get-WinEvent -LogName System -Oldest -MaxEvents {max_events} -ErrorAction SilentlyContinue "
+        f"-FilterXPath '*[System[(Level=1 or Level=2) and (EventRecordID > {record_id})]]'); "
+        "$events | Sort-Object RecordId | ForEach-Object { \"$($_.TimeCreated) [$($_.Id)] $($_.Message)\" }; "
+        f"if ($events.Count) {{ \"{CURSOR_PREFIX}$(($events | Measure-Object -Property RecordId -Maximum).Maximum)\" }} "
+        "else { '-- No entries --' }"
+    )
+
+
+def split_cursor(output: str) -> tuple:
+    lines = output.strip().splitlines()
+    cursor = None
+    if lines and lines[-1].startswith(CURSOR_PREFIX):
+        cursor = lines.pop()[len(CURSOR_PREFIX):].strip()
+    return "\n".join(lines), cursor
+
+
+def advance_cursor(cursors, host: str, metric: str, output: str) -> str:
+    if is_error(output):
+        return output
+    events, cursor = split_cursor(output)
+    if cursor and cursors is not None:
+        cursors.set(host, metric, cursor)
+    return events or "No new errors since last run"
@@ -0,0 +1,38 @@
+from syscheck.blobs import blob_ref
+from syscheck.collectors.parsers import is_error
+
+# Sections that are near identical across hosts built from one image
+FINGERPRINT_METRICS = ["OS Version", "Kernel", "Services"]
+
+
+def build_hash_command(command: str) -> str:
+    # $( ) drops trailing newlines the same way the connectors strip output, so the digest matches the fetched text
+    return f"__sc_out=$( {{\n{command}\n}} 2>/dev/null ); printf '%s' \"$__sc_out\" | sha256sum | cut -c1-64"
+
+
+def hash_commands(commands: dict) -> dict:
+    return {key: build_hash_command(command) for key, command in commands.items()}
+
+
+def resolve_fingerprints(blobs, commands: dict, outputs: dict) -> tuple:
+    # Replaces each remote digest in outputs with the stored text, returning the commands whose digest is new
+    fingerprints = {}
+    missing = {}
+    for key, command in commands.items():
+        digest = outputs.get(key, "").strip()
+        text = blobs.get(digest)
+        if text is None:
+            missing[key] = command
+            continue
+        outputs[key] = text
+        fingerprints[key] = blob_ref(digest)
+    return fingerprints, missing
+
+
+def store_fetched(blobs, fetched: dict, outputs: dict) -> dict:
+    fingerprints = {}
+    for key, text in fetched.items():
+        outputs[key] = text
+        if not is_error(text.strip()):
+            fingerprints[key] = blob_ref(blobs.put(text.strip()))
+    return fingerprints
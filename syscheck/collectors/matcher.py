@@ -0,0 +1,24 @@
+import fnmatch
+import os
+import re
+from functools import lru_cache
+
+
+class ServiceMatcher:
+    # Every pattern joined into one compiled regex, a name is tested once instead of once per pattern
+    __slots__ = ("patterns", "regex")
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        # fnmatch.fnmatch normcases both sides, so the patterns are normcased here and names in matches()
+        self.regex = re.compile("|".join(f"(?:{fnmatch.translate(os.path.normcase(pattern))})" for pattern in self.patterns)) \
+            if self.patterns else None
+
+    def matches(self, name: str) -> bool:
+        return self.regex is not None and self.regex.match(os.path.normcase(name)) is not None
+
+
+@lru_cache(maxsize=64)
+def service_matcher(patterns: tuple) -> ServiceMatcher:
+    # Collectors for every host in a run share the patterns, so the regex is compiled once per run
+    return ServiceMatcher(patterns)
@@ -0,0 +1,67 @@
+import re
+from typing import Optional
+
+from syscheck.models import DiskUsage, LoadAverage, MemoryUsage, Percent, ServiceState
+
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Metrics with one number worth tracking over time, by watch mode and the history store
+TRACKED_METRICS = ["CPU Usage", "Memory Usage", "Swap Usage", "Load Average"]
+
+
+def is_error(output: str) -> bool:
+    return output.upper().startswith(("ERROR COLLECTING", "ERROR_COLLECTING"))
+
+
+def extract_number(value) -> Optional[float]:
+    if isinstance(value, LoadAverage):
+        return value.one
+    if hasattr(value, "percent"):
+        return value.percent
+    if not isinstance(value, str) or is_error(value):
+        return None
+    match = NUMBER_PATTERN.search(value)
+    return float(match.group()) if match else None
+
+
+def parse_percent(output: str) -> Optional[Percent]:
+    match = NUMBER_PATTERN.search(output)
+    return Percent(float(match.group())) if match else None
+
+
+def parse_memory(output: str) -> Optional[MemoryUsage]:
+    # One "total used" pair of byte counts per line, Windows reports one line per page file
+    total = used = 0
+    try:
+        for line in output.splitlines():
+            line_total, line_used = line.split()
+            total += int(line_total)
+            used += int(line_used)
+    except ValueError:
+        return None
+    return MemoryUsage(total, used)
+
+
+def parse_linux_disks(output: str) -> Optional[list]:
+    # df -B1 --output=source,size,used,avail,pcent,target
+    disks = []
+    for line in output.splitlines()[1:]:
+        columns = line.split(None, 5)
+        if len(columns) == 6 and all(column.isdigit() for column in columns[1:4]):
+            disks.append(DiskUsage(columns[5], int(columns[1]), int(columns[2]), int(columns[3])))
+    return disks or None
+
+
+def parse_windows_disks(output: str) -> Optional[list]:
+    # "<name> <used> <free>" per drive, in bytes
+    disks = []
+    for line in output.splitlines():
+        columns = line.split()
+        if len(columns) == 3 and columns[1].isdigit() and columns[2].isdigit():
+            used, free = int(columns[1]), int(columns[2])
+            disks.append(DiskUsage(f"{columns[0]}:", used + free, used, free))
+    return disks or None
+
+
+def parse_service_state(state: str) -> ServiceState:
+    return ServiceState(state)
@@ -0,0 +1,156 @@
+import json
+from typing import Optional
+
+from syscheck.collectors.parsers import is_error
+from syscheck.collectors.procfs import cpu_percent, format_uptime
+from syscheck.models import DiskUsage, MemoryUsage, Percent
+
+# Metrics the probe reads itself, anything else it is asked for is run as a shell command on the target
+PROBE_METRICS = ["Hostname", "Uptime", "OS Version", "Kernel", "CPU Usage", "Memory Usage", "Swap Usage", "Last Update", "Disk Usage"]
+
+HEREDOC_DELIMITER = "__SYSCHECK_PROBE_EOF__"
+NO_PYTHON = "__SYSCHECK_NO_PYTHON__"
+
+# Runs on the target with whatever python3 it has (3.6 on RHEL 7), so it sticks to the standard library and avoids
+# newer syntax. Values are sent raw and turned into models locally with the same helpers the other modes use.
+PROBE_SOURCE = r'''
+import json, os, re, socket, subprocess, sys, time
+
+CONFIG = json.loads(__CONFIG__)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def cpu_sample():
+    return read("/proc/stat").split("\n", 1)[0].split()[1:]
+
+
+def memory(prefix):
+    values = {}
+    for line in read("/proc/meminfo").splitlines():
+        key, _, rest = line.partition(":")
+        if rest.split():
+            values[key] = int(rest.split()[0]) * 1024
+    total = values.get(prefix + "Total", 0)
+    free = values.get("MemAvailable", values.get("MemFree", 0)) if prefix == "Mem" else values.get("SwapFree", 0)
+    return [total, total - free]
+
+
+def os_version():
+    for line in read("/etc/os-release").splitlines():
+        if line.startswith("PRETTY_NAME="):
+            return line.split("=", 1)[1]
+    return ""
+
+
+def last_update():
+    stat = os.stat(CONFIG["package_log"])
+    local = time.localtime(stat.st_mtime)
+    return "%s.%09d %s" % (time.strftime("%Y-%m-%d %H:%M:%S", local), stat.st_mtime_ns % 1000000000, time.strftime("%z", local))
+
+
+def disks():
+    # Same filesystems df lists: skip pseudo filesystems without blocks and repeated mounts of one device
+    rows, seen = [], set()
+    for line in read("/proc/mounts").splitlines():
+        fields = line.split()
+        if len(fields) < 2:
+            continue
+        mount = re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), fields[1])
+        try:
+            device, stat = os.stat(mount).st_dev, os.statvfs(mount)
+        except OSError:
+            continue
+        if not stat.f_blocks or device in seen:
+            continue
+        seen.add(device)
+        rows.append([mount, stat.f_blocks * stat.f_frsize, (stat.f_blocks - stat.f_bfree) * stat.f_frsize, stat.f_bavail * stat.f_frsize])
+    return rows
+
+
+NATIVE = {
+    "Hostname": socket.gethostname,
+    "Uptime": lambda: float(read("/proc/uptime").split()[0]),
+    "OS Version": os_version,
+    "Kernel": lambda: os.uname()[2],
+    "Memory Usage": lambda: memory("Mem"),
+    "Swap Usage": lambda: memory("Swap"),
+    "Last Update": last_update,
+    "Disk Usage": disks,
+}
+
+started = time.time()
+first_cpu = cpu_sample() if "CPU Usage" in CONFIG["metrics"] else None
+processes = dict(
+    (key, subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE))
+    for key, command in CONFIG["commands"].items()
+)
+
+metrics = {}
+for key in CONFIG["metrics"]:
+    if key in NATIVE:
+        try:
+            metrics[key] = NATIVE[key]()
+        except Exception as e:
+            metrics[key] = "Error Collecting : %s" % e
+
+if first_cpu is not None:
+    time.sleep(max(0.0, CONFIG["cpu_interval"] - (time.time() - started)))
+    metrics["CPU Usage"] = [first_cpu, cpu_sample()]
+
+commands = {}
+for key, process in processes.items():
+    stdout, stderr = process.communicate()
+    stdout, stderr = stdout.decode(errors="replace").strip(), stderr.decode(errors="replace").strip()
+    commands[key] = "Error Collecting : %s" % stderr if stderr and not stdout else stdout
+
+sys.stdout.write(json.dumps({"metrics": metrics, "commands": commands}, separators=(",", ":")))
+'''
+
+CONVERTERS = {
+    "Uptime": format_uptime,
+    "CPU Usage": lambda samples: Percent(round(cpu_percent(*samples), 1)),
+    "Memory Usage": lambda values: MemoryUsage(*values),
+    "Swap Usage": lambda values: MemoryUsage(*values),
+    "Disk Usage": lambda rows: [DiskUsage(*row) for row in rows] or "Error Collecting : no mounted filesystems",
+}
+
+
+def build_probe_command(commands: dict, package_log: str, cpu_interval: float) -> str:
+    config = {
+        "metrics": [key for key in commands if key in PROBE_METRICS],
+        "commands": {key: command for key, command in commands.items() if key not in PROBE_METRICS},
+        "package_log": package_log,
+        "cpu_interval": cpu_interval,
+    }
+    source = PROBE_SOURCE.replace("__CONFIG__", repr(json.dumps(config)))
+    # The script travels inside the command on the existing session, so nothing is written to the target
+    return (
+        f"if command -v python3 >/dev/null 2>&1; then python3 - <<'{HEREDOC_DELIMITER}'\n"
+        f"{source}\n{HEREDOC_DELIMITER}\n"
+        f"else echo {NO_PYTHON}; fi"
+    )
+
+
+def parse_probe_output(output: str) -> Optional[dict]:
+    # None when the probe did not run, the caller then falls back to running the commands one by one
+    try:
+        payload = json.loads(output)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("metrics"), dict):
+        return None
+
+    outputs = dict(payload.get("commands", {}))
+    for key, value in payload["metrics"].items():
+        if (isinstance(value, str) and is_error(value)) or key not in CONVERTERS:
+            outputs[key] = value
+            continue
+        try:
+            outputs[key] = CONVERTERS[key](value)
+        except (TypeError, ValueError, IndexError) as e:
+            outputs[key] = f"Error Collecting : unreadable probe value ({e})"
+    return outputs
@@ -0,0 +1,65 @@
+from syscheck.models import LoadAverage, MemoryUsage, Percent
+
+PROC_METRICS = ["Uptime", "Load Average", "CPU Usage", "Memory Usage", "Swap Usage"]
+
+
+def build_proc_command(cpu_interval: float) -> str:
+    return f"cat /proc/uptime /proc/loadavg /proc/meminfo /proc/stat && sleep {cpu_interval:g} && head -n 1 /proc/stat"
+
+
+def format_uptime(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    parts = []
+    for name, size in (("week", 7 * 24 * 60), ("day", 24 * 60), ("hour", 60), ("minute", 1)):
+        count, minutes = divmod(minutes, size)
+        if count:
+            parts.append(f"{count} {name}{'s' if count != 1 else ''}")
+    return "up " + (", ".join(parts) if parts else "0 minutes")
+
+
+def cpu_percent(first: list, second: list) -> float:
+    # user nice system idle iowait irq softirq steal; guest time is already counted in user
+    first = [int(value) for value in first[:8]]
+    second = [int(value) for value in second[:8]]
+    total = sum(second) - sum(first)
+    idle = (second[3] + second[4]) - (first[3] + first[4])
+    return 0.0 if total <= 0 else (total - idle) / total * 100
+
+
+def parse_proc_snapshot(output: str) -> dict:
+    lines = output.splitlines()
+    if output.startswith("Error Collecting") or len(lines) < 2:
+        return {metric: output for metric in PROC_METRICS}
+
+    meminfo = {}
+    cpu_samples = []
+    try:
+        for line in lines[2:]:
+            if line.startswith("cpu "):
+                cpu_samples.append(line.split()[1:])
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0]) * 1024
+
+        metrics = {
+            "Uptime": format_uptime(float(lines[0].split()[0])),
+            "Load Average": LoadAverage(*(float(value) for value in lines[1].split()[:3])),
+        }
+    except (ValueError, IndexError) as e:
+        return {metric: f"Error Collecting : unreadable /proc snapshot ({e})" for metric in PROC_METRICS}
+
+    if len(cpu_samples) >= 2:
+        metrics["CPU Usage"] = Percent(round(cpu_percent(cpu_samples[0], cpu_samples[-1]), 1))
+    else:
+        metrics["CPU Usage"] = "Error Collecting : /proc/stat was not sampled twice"
+
+    mem_total = meminfo.get("MemTotal", 0)
+    if mem_total:
+        metrics["Memory Usage"] = MemoryUsage(mem_total, mem_total - meminfo.get("MemAvailable", meminfo.get("MemFree", 0)))
+    else:
+        metrics["Memory Usage"] = "Error Collecting : MemTotal missing from /proc/meminfo"
+
+    swap_total = meminfo.get("SwapTotal", 0)
+    metrics["Swap Usage"] = MemoryUsage(swap_total, swap_total - meminfo.get("SwapFree", 0))
+
+    return metrics
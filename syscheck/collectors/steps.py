@@ -0,0 +1,27 @@
+# Collection steps are generators written once for the blocking and asyncio paths. They yield zero-argument
+# callables making one remote call and are sent its output, async connectors return a coroutine that is awaited.
+def run_steps(steps):
+    result, error = None, None
+    while True:
+        try:
+            call = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            result, error = call(), None
+        except BaseException as e:
+            # Raised inside the generator so its timing spans and cleanup see the failure
+            result, error = None, e
+
+
+async def run_steps_async(steps):
+    result, error = None, None
+    while True:
+        try:
+            call = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            result, error = await call(), None
+        except BaseException as e:
+            result, error = None, e
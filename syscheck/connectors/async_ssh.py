@@ -0,0 +1,98 @@
+import asyncio
+import asyncssh
+from typing import Optional
+
+from syscheck.connectors.compression import decompress_chunks, gzip_shell_command
+from syscheck.timings import timed
+
+
+class AsyncSSHConnection:
+    def __init__(self, host: str, user: str, password: Optional[str] = None, key_path: Optional[str] = None,
+                 connect_timeout: float = 5, command_timeout: Optional[float] = 60, compress: bool = False):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.key_path = key_path
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        self.compress = compress
+        self.client = None
+
+    async def connect(self) -> bool:
+        try:
+            options = {"compression_algs": ["zlib@openssh.com", "zlib"]} if self.compress else {}
+            with timed(self.host, "connect", "ssh"):
+                if self.key_path:
+                    self.client = await asyncssh.connect(
+                        self.host, username=self.user, client_keys=[self.key_path], known_hosts=None, connect_timeout=self.connect_timeout,
+                        **options
+                    )
+                else:
+                    self.client = await asyncssh.connect(
+                        self.host, username=self.user, password=self.password, known_hosts=None, connect_timeout=self.connect_timeout,
+                        **options
+                    )
+
+            return True
+
+        except Exception as e:
+            raise ConnectionError(f"Failed to establish connection to {self.host}: {e}")
+
+    async def run_command(self, command: str) -> str:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+
+        try:
+            with timed(self.host, "command", command) as span:
+                span.bytes_out = len(command)
+                result = await self.client.run(command, check=False, timeout=self.command_timeout)
+                span.bytes_in = len(result.stdout or "") + len(result.stderr or "")
+            output = (result.stdout or "").strip()
+            error = (result.stderr or "").strip()
+
+            if error and not output:
+                return f"Error Collecting : {error}"
+            else:
+                return output
+
+        except Exception as e:
+            return f"Error Collecting : {e}"
+
+    async def run_compressed(self, command: str) -> str:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+
+        try:
+            remote_command = gzip_shell_command(command)
+            with timed(self.host, "command", command) as span:
+                span.bytes_out = len(remote_command)
+                result = await self.client.run(remote_command, check=False, timeout=self.command_timeout, encoding=None)
+                span.bytes_in = len(result.stdout or b"") + len(result.stderr or b"")
+            output = decompress_chunks(result.stdout or b"").decode(errors="replace").strip()
+            error = (result.stderr or b"").decode(errors="replace").strip()
+
+            if error and not output:
+                return f"Error Collecting : {error}"
+            else:
+                return output
+
+        except Exception as e:
+            return f"Error Collecting : {e}"
+
+    async def run_commands(self, commands: dict, max_channels: int = 4) -> dict:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+
+        semaphore = asyncio.Semaphore(max(1, max_channels))
+
+        async def run_one(command):
+            async with semaphore:
+                return await self.run_command(command)
+
+        outputs = await asyncio.gather(*(run_one(command) for command in commands.values()))
+        return dict(zip(commands, outputs))
+
+    async def close(self):
+        if self.client:
+            self.client.close()
+            await self.client.wait_closed()
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Optional
+
+from syscheck.connectors.winrm import WinRMConnection
+
+
+class AsyncWinRMConnection:
+    # pywinrm has no asyncio transport, so each blocking WS-Management call is handed to a worker thread. Fleet runs pass
+    # an executor sized to their concurrency, the loop's default one is shared and far smaller than --workers.
+    def __init__(self, host: str, user: str, password: Optional[str] = None, domain: Optional[str] = None,
+                 connect_timeout: float = 5, command_timeout: Optional[float] = 60, compress: bool = False, executor=None):
+        self.host = host
+        self.executor = executor
+        self.user = user
+        self.password = password
+        self.domain = domain
+        self.compress = compress
+        self.connection = WinRMConnection(host=host, user=user, password=password, domain=domain,
+                                          connect_timeout=connect_timeout, command_timeout=command_timeout, compress=compress)
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def connect(self) -> bool:
+        return await self._call(self.connection.connect)
+
+    async def run_command(self, command: str, log = "") -> str:
+        if not self.connection.client:
+            raise RuntimeError("WinRM client not connected")
+
+        return await self._call(self.connection.run_command, command, log)
+
+    async def run_compressed(self, command: str) -> str:
+        if not self.connection.client:
+            raise RuntimeError("WinRM client not connected")
+
+        return await self._call(self.connection.run_compressed, command)
+
+    async def close(self):
+        self.connection.close()
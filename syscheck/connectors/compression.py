@@ -0,0 +1,71 @@
+import zlib
+
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_SIZE = 32768
+
+
+def gzip_shell_command(command: str) -> str:
+    # stderr is left alone so errors read the same as uncompressed runs, targets without gzip fall back to cat
+    return f"{{\n{command}\n}} | {{ command -v gzip >/dev/null 2>&1 && gzip -c || cat; }}"
+
+
+def gzip_powershell_command(command: str) -> str:
+    return "\n".join([
+        f"$__sc_text = (& {{ {command} }} | Out-String)",
+        "$__sc_bytes = [Text.Encoding]::UTF8.GetBytes($__sc_text)",
+        "$__sc_stream = New-Object IO.MemoryStream",
+        "$__sc_gzip = New-Object IO.Compression.GZipStream($__sc_stream, [IO.Compression.CompressionMode]::Compress)",
+        "$__sc_gzip.Write($__sc_bytes, 0, $__sc_bytes.Length)",
+        "$__sc_gzip.Close()",
+        "[Convert]::ToBase64String($__sc_stream.ToArray())",
+    ])
+
+
+class GzipStreamDecoder:
+    # Output is decompressed chunk by chunk as it arrives, plain output from a target without gzip passes through
+    def __init__(self):
+        self.decompressor = None
+        self.plain = None
+        self.pending = b""
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def feed(self, data: bytes, limit: int = 0) -> bytes:
+        self.bytes_in += len(data)
+        if self.plain is None:
+            self.pending += data
+            if len(self.pending) < len(GZIP_MAGIC):
+                return b""
+            data, self.pending = self.pending, b""
+            self.plain = not data.startswith(GZIP_MAGIC)
+            if not self.plain:
+                self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if self.plain:
+            output = data
+        else:
+            # limit bounds what one chunk can expand to, the rest waits in unconsumed_tail
+            output = self.decompressor.decompress(self.decompressor.unconsumed_tail + data, limit)
+        self.bytes_out += len(output)
+        return output
+
+    def flush(self, limit: int = 0) -> bytes:
+        if self.plain is None:
+            output, self.pending = self.pending, b""
+        elif self.plain:
+            output = b""
+        else:
+            output = self.decompressor.decompress(self.decompressor.unconsumed_tail, limit)
+            if not self.decompressor.unconsumed_tail:
+                output += self.decompressor.flush()
+        self.bytes_out += len(output)
+        return output
+
+
+def decompress_chunks(data: bytes) -> bytes:
+    decoder = GzipStreamDecoder()
+    output = bytearray()
+    for start in range(0, len(data), CHUNK_SIZE):
+        output.extend(decoder.feed(data[start:start + CHUNK_SIZE]))
+    output.extend(decoder.flush())
+    return bytes(output)
@@ -1,47 +1,181 @@
+import codecs
+import select
+import time
 import paramiko
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, NamedTuple, Optional
+
+from syscheck.connectors.compression import GzipStreamDecoder, gzip_shell_command
+from syscheck.timings import timed
+
+CHUNK_SIZE = 32768
+DEFAULT_MAX_OUTPUT = 8 * 1024 * 1024
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_COMMAND_TIMEOUT = 60
+
+
+class CommandResult(NamedTuple):
+    stdout: str
+    stderr: str
+    exit_status: int
 
 
 class SSHConnection:
-    def __init__(self, host: str, user: str, password: Optional[str] = None, key_path: Optional[str] = None):
+    def __init__(self, host: str, user: str, password: Optional[str] = None, key_path: Optional[str] = None,
+                 max_output: int = DEFAULT_MAX_OUTPUT, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 command_timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT, compress: bool = False):
         self.host = host
         self.user = user
         self.password = password
         self.key_path = key_path
+        self.max_output = max_output
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        self.compress = compress
         self.client = None
 
     def connect(self) -> bool:
         try:
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            with timed(self.host, "connect", "ssh"):
+                self.client = paramiko.SSHClient()
+                self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
-            if self.key_path:
-                private_key = paramiko.RSAKey.from_private_key_file(self.key_path)
-                self.client.connect(self.host, username=self.user, pkey=private_key, timeout=5)
-            else:
-                self.client.connect(self.host, username=self.user, password=self.password, timeout=5)
+                # The banner and auth phases get the same budget, a host that accepts TCP but never answers SSH fails as fast as a dead one
+                timeouts = {"timeout": self.connect_timeout, "banner_timeout": self.connect_timeout, "auth_timeout": self.connect_timeout}
+                if self.compress:
+                    # zlib on the transport covers every channel, including commands that are not batched
+                    timeouts["compress"] = True
+                if self.key_path:
+                    private_key = paramiko.RSAKey.from_private_key_file(self.key_path)
+                    self.client.connect(self.host, username=self.user, pkey=private_key, **timeouts)
+                else:
+                    self.client.connect(self.host, username=self.user, password=self.password, **timeouts)
 
             return True
         
         except Exception as e:
             raise ConnectionError (f"Failed to establish connection to {self.host}: {e}")
 
-    def run_command(self, command: str) -> str:
+    def _stream(self, command: str) -> Iterator[tuple]:
+        stdin, stdout, stderr = self.client.exec_command(command, timeout=self.command_timeout)
+        channel = stdout.channel
+        deadline = time.monotonic() + self.command_timeout if self.command_timeout else None
+
+        def check_deadline():
+            if deadline and time.monotonic() > deadline:
+                channel.close()
+                raise TimeoutError(f"Command timed out after {self.command_timeout:g} seconds")
+
+        # Both streams are drained as data arrives so a full stderr window can never stall stdout or vice versa
+        while True:
+            received = False
+            if channel.recv_ready():
+                yield "stdout", channel.recv(CHUNK_SIZE)
+                received = True
+            if channel.recv_stderr_ready():
+                yield "stderr", channel.recv_stderr(CHUNK_SIZE)
+                received = True
+            if received:
+                continue
+            # The exit status can arrive ahead of the last output, only EOF means both streams are complete
+            if channel.eof_received or channel.closed:
+                break
+            check_deadline()
+            select.select([channel], [], [], 0.1)
+
+        # A server that closes without sending an exit status leaves it at -1
+        while not channel.exit_status_ready():
+            check_deadline()
+            channel.status_event.wait(0.1)
+        yield "exit", channel.recv_exit_status()
+
+    def execute(self, command: str, compressed: bool = False) -> CommandResult:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+
+        buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        exit_status = -1
+        decoder = GzipStreamDecoder() if compressed else None
+        remote_command = gzip_shell_command(command) if compressed else command
+        with timed(self.host, "command", command) as span:
+            span.bytes_out = len(remote_command)
+            for stream, data in self._stream(remote_command):
+                if stream == "exit":
+                    exit_status = data
+                    continue
+                span.bytes_in += len(data)
+                buffer = buffers[stream]
+                room = self.max_output - len(buffer)
+                if room > 0 and decoder and stream == "stdout":
+                    buffer.extend(decoder.feed(data, room)[:room])
+                elif room > 0:
+                    buffer.extend(data[:room])
+
+            room = self.max_output - len(buffers["stdout"])
+            if decoder and room > 0:
+                buffers["stdout"].extend(decoder.flush(room)[:room])
+
+        return CommandResult(
+            buffers["stdout"].decode(errors="replace").strip(),
+            buffers["stderr"].decode(errors="replace").strip(),
+            exit_status,
+        )
+
+    def iter_lines(self, command: str) -> Iterator[str]:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        for stream, data in self._stream(command):
+            if stream != "stdout":
+                continue
+            pending += decoder.decode(data)
+            *lines, pending = pending.split("\n")
+            yield from lines
+
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def run_command(self, command: str, compressed: bool = False) -> str:
         if not self.client:
             raise RuntimeError("SSH client not connected")
 
         try:
-            stdin, stdout, stderr = self.client.exec_command(command)
-            error = stderr.read().decode().strip()
-   
-            if error:
-                return f"Error Collecting : {error}"
+            result = self.execute(command, compressed)
+
+            if result.stderr and not result.stdout:
+                return f"Error Collecting : {result.stderr}"
             else:
-                return stdout.read().decode().strip()
+                return result.stdout
         
         except Exception as e:
             return f"Error Collecting : {e}"
 
+    def run_compressed(self, command: str) -> str:
+        # Output is gzipped on the target and inflated here as it streams in, bytes_in on the span is what crossed the wire
+        return self.run_command(command, compressed=True)
+
+    def run_commands(self, commands: dict, max_channels: int = 4) -> dict:
+        if not self.client:
+            raise RuntimeError("SSH client not connected")
+        if not commands:
+            return {}
+
+        # Each command gets its own channel on the shared transport, so slow commands overlap with fast ones
+        outputs = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_channels, len(commands)))) as executor:
+            futures = {executor.submit(self.run_command, command): key for key, command in commands.items()}
+            for future in as_completed(futures):
+                outputs[futures[future]] = future.result()
+
+        return {key: outputs[key] for key in commands}
+
+    def is_active(self) -> bool:
+        transport = self.client.get_transport() if self.client else None
+        return bool(transport and transport.is_active())
+
     def close(self):
         if self.client:
             self.client.close()
@@ -1,13 +1,44 @@
+import base64
+import time
 import winrm
+from winrm.exceptions import WinRMOperationTimeoutError
 from typing import Optional
 
+from syscheck.connectors.compression import decompress_chunks, gzip_powershell_command
+from syscheck.timings import timed
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_COMMAND_TIMEOUT = 60
+
+# run_ps sends the whole script base64 encoded on a cmd.exe command line, which cmd.exe caps at 8191 characters
+CMD_LINE_LIMIT = 8191
+# Fixed size bootstrap that reads the real script from stdin and runs it as one block
+STDIN_BOOTSTRAP = "& ([scriptblock]::Create([Console]::In.ReadToEnd()))"
+
+
+def encode_powershell(script: str) -> str:
+    return base64.b64encode(script.encode("utf_16_le")).decode("ascii")
+
+
+def fits_command_line(script: str) -> bool:
+    return len(f"powershell -encodedcommand {encode_powershell(script)}") <= CMD_LINE_LIMIT
+
+
+STDIN_COMMAND_LINE = f"powershell -NoProfile -NonInteractive -encodedcommand {encode_powershell(STDIN_BOOTSTRAP)}"
+
 
 class WinRMConnection:
-    def __init__(self, host: str, user: str, password: Optional[str] = None, domain: Optional[str] = None):
+    def __init__(self, host: str, user: str, password: Optional[str] = None, domain: Optional[str] = None,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, command_timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT,
+                 compress: bool = False):
         self.host = host
         self.user = user
         self.password = password
         self.domain = domain
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        # WS-Management has no transport compression, so only run_compressed output shrinks
+        self.compress = compress
         self.client = None
 
     def connect(self) -> bool:
@@ -15,25 +46,86 @@ class WinRMConnection:
             username = f"{self.domain}\\{self.user}" if self.domain else self.user
             transport = 'kerberos' if self.domain else 'ntlm'
 
-            self.client = winrm.Session(
-                f"http://{self.host}:5985/wsman",
-                auth=(username, self.password),
-                transport=transport
-            )
+            with timed(self.host, "connect", "winrm"):
+                # pywinrm requires the HTTP read timeout to outlast the WS-Management operation timeout
+                operation_timeout = int(self.command_timeout or DEFAULT_COMMAND_TIMEOUT)
+                read_timeout = operation_timeout + int(self.connect_timeout) + 1
+                self.client = winrm.Session(
+                    f"http://{self.host}:5985/wsman",
+                    auth=(username, self.password),
+                    transport=transport,
+                    operation_timeout_sec=operation_timeout,
+                    read_timeout_sec=read_timeout,
+                )
+                protocol = self.client.protocol
 
-            # Test connection
-            self.client.run_cmd('whoami')
+                # Test connection, bounded by the connect deadline rather than the command timeouts
+                probe_timeout = max(1, int(self.connect_timeout))
+                protocol.operation_timeout_sec = probe_timeout
+                protocol.transport.read_timeout_sec = (self.connect_timeout, probe_timeout + 1)
+                try:
+                    self.run_shell("whoami", timeout=self.connect_timeout)
+                finally:
+                    # requests takes (connect, read), so opening the TCP connection stays bounded for commands too
+                    protocol.operation_timeout_sec = operation_timeout
+                    protocol.transport.read_timeout_sec = (self.connect_timeout, read_timeout)
             return True
         
         except Exception as e:
             raise ConnectionError(f"Failed to connect to {self.host} via WinRM: {e}")
         
+    def receive_output(self, shell_id: str, command_id: str, timeout: Optional[float]) -> tuple:
+        # get_command_output retries WS-Management operation timeouts forever, this loop gives up at the deadline
+        protocol = self.client.protocol
+        deadline = time.monotonic() + timeout if timeout else None
+        stdout, stderr = [], []
+        while True:
+            try:
+                out, err, status_code, done = protocol.get_command_output_raw(shell_id, command_id)
+                stdout.append(out)
+                stderr.append(err)
+                if done:
+                    return b"".join(stdout), b"".join(stderr), status_code
+            except WinRMOperationTimeoutError:
+                pass
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Command timed out after {timeout:g} seconds")
+
+    def run_shell(self, command_line: str, stdin: Optional[bytes] = None, timeout: Optional[float] = None):
+        protocol = self.client.protocol
+        shell_id = protocol.open_shell()
+        try:
+            command_id = protocol.run_command(shell_id, command_line)
+            try:
+                if stdin is not None:
+                    protocol.send_command_input(shell_id, command_id, stdin, end=True)
+                return winrm.Response(self.receive_output(shell_id, command_id, timeout))
+            finally:
+                # Also stops a command abandoned at the deadline
+                protocol.cleanup_command(shell_id, command_id)
+        finally:
+            protocol.close_shell(shell_id)
+
+    def run_ps(self, script: str):
+        if fits_command_line(script):
+            result = self.run_shell(f"powershell -encodedcommand {encode_powershell(script)}", timeout=self.command_timeout)
+        else:
+            # Batched scripts outgrow the command line, so the script itself travels as stdin
+            result = self.run_shell(STDIN_COMMAND_LINE, stdin=script.encode(), timeout=self.command_timeout)
+
+        if result.std_err:
+            result.std_err = self.client._clean_error_msg(result.std_err)
+        return result
+
     def run_command(self, command: str, log = "") -> str:
         if not self.client:
             raise RuntimeError("WinRM client not connected")
         
         try:
-            result = self.client.run_ps(command)
+            with timed(self.host, "command", command) as span:
+                span.bytes_out = len(command)
+                result = self.run_ps(command)
+                span.bytes_in = len(result.std_out) + len(result.std_err)
             stdout = result.std_out.decode().strip()
 
             return stdout if stdout else "Error Collecting"
@@ -41,5 +133,25 @@ class WinRMConnection:
         except Exception:
             return "ERROR_COLLECTING"
 
+    def run_compressed(self, command: str) -> str:
+        if not self.client:
+            raise RuntimeError("WinRM client not connected")
+
+        try:
+            script = gzip_powershell_command(command)
+            with timed(self.host, "command", command) as span:
+                span.bytes_out = len(script)
+                result = self.run_ps(script)
+                span.bytes_in = len(result.std_out) + len(result.std_err)
+            stdout = decompress_chunks(base64.b64decode(result.std_out.strip())).decode(errors="replace").strip()
+
+            return stdout if stdout else "Error Collecting"
+
+        except Exception:
+            return "ERROR_COLLECTING"
+
+    def is_active(self) -> bool:
+        return self.client is not None
+
     def close(self):
         self.client = None
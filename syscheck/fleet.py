@@ -0,0 +1,200 @@
+import asyncio
+import time
+import threading
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+from queue import SimpleQueue
+from typing import NamedTuple, Optional
+
+
+class FleetResult(NamedTuple):
+    host: str
+    results: Optional[dict]
+    error: Optional[str]
+    elapsed: float
+
+
+def load_inventory(inventory_path: str) -> list:
+    path = Path(inventory_path).expanduser()
+    if not path.exists():
+        raise FileNotFoundError(f"Inventory file not found at {path}")
+
+    targets = []
+    with path.open() as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            fields = line.split()
+            target = {"host": fields[0]}
+            for field in fields[1:]:
+                if "=" not in field:
+                    raise ValueError(f"Invalid inventory entry on line {line_number}: '{field}' (expected key=value)")
+                key, value = field.split("=", 1)
+                target[key.strip()] = value.strip()
+
+            if "services" in target:
+                target["services"] = [s.strip() for s in target["services"].split(",")]
+            targets.append(target)
+
+    if not targets:
+        raise ValueError(f"No hosts found in inventory {path}")
+    return targets
+
+
+class DaemonExecutor(Executor):
+    # ThreadPoolExecutor joins its workers at exit, these are daemon threads so a call abandoned past a deadline does not
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, max_workers)
+        self.work = SimpleQueue()
+        self.threads = []
+        self.running = {}
+        self.released = set()
+        self.lock = threading.Lock()
+
+    def _spawn(self) -> None:
+        # Caller holds the lock
+        if len(self.threads) < self.max_workers:
+            thread = threading.Thread(target=self._worker, daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        self.work.put((future, fn, args, kwargs))
+        with self.lock:
+            self._spawn()
+        return future
+
+    def release(self, future: Future) -> None:
+        # The thread stuck on an abandoned call no longer counts toward max_workers, a new one picks up queued work
+        with self.lock:
+            thread = self.running.pop(future, None)
+            if thread is None or thread not in self.threads:
+                return
+            self.threads.remove(thread)
+            self.released.add(thread)
+            self._spawn()
+
+    def _worker(self):
+        current = threading.current_thread()
+        while True:
+            item = self.work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            with self.lock:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self.running[future] = current
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            with self.lock:
+                self.running.pop(future, None)
+                if current in self.released:
+                    # A replacement already took this slot
+                    self.released.discard(current)
+                    return
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.lock:
+            threads = list(self.threads)
+        for _ in threads:
+            self.work.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+def run_fleet(jobs: list, workers: int = 10, host_timeout: Optional[float] = None, on_result=None, stop_when=None,
+              on_abandon=None) -> list:
+    started = {}
+    lock = threading.Lock()
+
+    def run_job(index, job):
+        with lock:
+            started[index] = time.time()
+        return job()
+
+    executor = DaemonExecutor(workers)
+    pending = {executor.submit(run_job, index, job): (index, host) for index, (host, job) in enumerate(jobs)}
+    finished = []
+
+    def report(result):
+        finished.append(result)
+        if on_result:
+            on_result(result)
+        return bool(stop_when and stop_when(result))
+
+    def abandon(host):
+        # The worker cannot be interrupted, closing its connection is what unblocks a command waiting on it
+        if on_abandon:
+            on_abandon(host)
+
+    stopped = False
+    try:
+        while pending and not stopped:
+            done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            now = time.time()
+
+            for future in done:
+                index, host = pending.pop(future)
+                with lock:
+                    elapsed = now - started.get(index, now)
+                try:
+                    result = FleetResult(host, future.result(), None, elapsed)
+                except Exception as e:
+                    result = FleetResult(host, None, str(e), elapsed)
+                stopped = report(result) or stopped
+
+            if host_timeout and not stopped:
+                for future, (index, host) in list(pending.items()):
+                    with lock:
+                        start = started.get(index)
+                    if start is not None and now - start > host_timeout:
+                        del pending[future]
+                        executor.release(future)
+                        abandon(host)
+                        stopped = report(FleetResult(host, None, f"Timed out after {host_timeout:g} seconds", now - start)) or stopped
+    finally:
+        # Hosts not yet started are cancelled when stop_when fires, running ones are abandoned like timed out hosts
+        for future, (_, host) in pending.items():
+            if not future.cancel():
+                abandon(host)
+        executor.shutdown(wait=False)
+
+    return finished
+
+
+async def run_fleet_async(jobs: list, concurrency: int = 100, host_timeout: Optional[float] = None, on_result=None,
+                          stop_when=None) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_job(host, job):
+        async with semaphore:
+            start = time.time()
+            try:
+                results = await asyncio.wait_for(job(), timeout=host_timeout)
+                return FleetResult(host, results, None, time.time() - start)
+            except asyncio.TimeoutError:
+                return FleetResult(host, None, f"Timed out after {host_timeout:g} seconds", time.time() - start)
+            except Exception as e:
+                return FleetResult(host, None, str(e), time.time() - start)
+
+    tasks = [asyncio.ensure_future(run_job(host, job)) for host, job in jobs]
+    finished = []
+    for next_result in asyncio.as_completed(tasks):
+        result = await next_result
+        finished.append(result)
+        if on_result:
+            on_result(result)
+        if stop_when and stop_when(result):
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            break
+
+    return finished
@@ -1,3 +1,6 @@
+from syscheck.models import DiskUsage
+
+
 def to_terminal(results) -> None:
     GREEN = "\033[92m"
     RESET = "\033[0m"
@@ -9,6 +12,8 @@ def to_terminal(results) -> None:
                 print(f"{GREEN} - {sub_key}{RESET}: {sub_value}")
         elif isinstance(value, list):
             print(f"{GREEN}{key.capitalize()}{RESET}:")
+            if value and isinstance(value[0], DiskUsage):
+                print(f"    {GREEN}{'Mount':<20} {'Size':>7} {'Used':>7} {'Avail':>7} {'Use%':>7}{RESET}")
             for line in value:
                 print(f"    {line}")
         else:
@@ -1,91 +1,142 @@
-import webbrowser
-import tempfile
-import os
+import sys
 from html import escape
+from typing import Optional
 
-def to_html(results: dict, host: str) -> None:
-    html_lines = [
-        "<html>",
-        "<head>",
-        f"<title>System Info: {escape(host)}</title>",
-        "<style>",
-        "body {",
-        "  background: linear-gradient(to bottom, #1e1e1e, #000000);",
-        "  color: #eeeeee;",
-        "  font-family: 'Segoe UI', sans-serif;",
-        "  padding: 40px;",
-        "  line-height: 1.6;",
-        "  text-align: center;",
-        "}",
-        "h1 {",
-        "  color: #00FF00;",
-        "  margin-bottom: 20px;",
-        "  text-align: center;",
-        "}",
-        ".content-box {",
-        "  display: inline-block;",      
-        "  text-align: left;",            
-        "  background-color: #111;",     
-        "  padding: 20px 30px;",         
-        "  border-radius: 10px;",        
-        "  box-shadow: 0 0 10px #000;",  
-        "  max-width: max-content;",     
-        "  margin: auto;",               
-        "}",
-        "ul { list-style-type: none; padding-left: 0; }",
-        "li { margin-bottom: 10px; }",
-        "li > ul {",
-        "  margin-top: 5px;",
-        "  padding-left: 20px;",
-        "  border-left: 2px solid #333;",
-        "}",
-        "strong { color: #00FF00; }",
-        "code {",
-        "  background-color: #222;",
-        "  padding: 2px 4px;",
-        "  border-radius: 4px;",
-        "  font-family: monospace;",
-        "}",
-        "</style>",
-        "</head>",
-        "<body>",
-        f"<h1>System Info: {escape(host)}</h1>",
-        "<div class='content-box'>",
-        "<ul>"
-    ]
+SUMMARY_COLUMNS = ["OS Version", "Uptime", "CPU Usage", "Memory Usage"]
 
+PAGE_HEAD = """<html>
+<head>
+<meta charset='utf-8'>
+<title>{title}</title>
+<style>
+body {{
+  background: linear-gradient(to bottom, #1e1e1e, #000000);
+  color: #eeeeee;
+  font-family: 'Segoe UI', sans-serif;
+  padding: 40px;
+  line-height: 1.6;
+}}
+h1 {{ color: #00FF00; margin-bottom: 20px; text-align: center; }}
+input {{ background-color: #111; color: #eeeeee; border: 1px solid #333; border-radius: 4px; padding: 6px 10px; margin-bottom: 10px; width: 300px; }}
+table {{ border-collapse: collapse; width: 100%; background-color: #111; box-shadow: 0 0 10px #000; }}
+th {{ color: #00FF00; cursor: pointer; text-align: left; padding: 8px; border-bottom: 2px solid #333; user-select: none; }}
+td {{ padding: 6px 8px; border-bottom: 1px solid #222; vertical-align: top; }}
+td.failed {{ color: #FF5555; }}
+details > summary {{ cursor: pointer; }}
+ul {{ list-style-type: none; padding-left: 0; }}
+li {{ margin-bottom: 10px; }}
+li > ul {{ margin-top: 5px; padding-left: 20px; border-left: 2px solid #333; }}
+strong {{ color: #00FF00; }}
+code {{ background-color: #222; padding: 2px 4px; border-radius: 4px; font-family: monospace; }}
+pre {{ background-color: #222; padding: 10px; border-radius: 5px; text-align: left; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<input id='filter' placeholder='Filter hosts...' oninput='filterHosts(this.value)'>
+<table id='hosts'>
+<thead><tr>{headers}</tr></thead>
+"""
+
+# Each host is its own <tbody> so the summary row and its details sort and filter together
+PAGE_TAIL = """</table>
+<script>
+function filterHosts(text) {
+  text = text.toLowerCase();
+  document.querySelectorAll('#hosts tbody').forEach(function (body) {
+    body.style.display = body.textContent.toLowerCase().indexOf(text) === -1 ? 'none' : '';
+  });
+}
+function sortHosts(column) {
+  var table = document.getElementById('hosts');
+  var ascending = table.dataset.sortColumn != column || table.dataset.sortOrder != 'asc';
+  var bodies = Array.prototype.slice.call(table.tBodies);
+  bodies.sort(function (a, b) {
+    var x = a.rows[0].cells[column].textContent, y = b.rows[0].cells[column].textContent;
+    var nx = parseFloat(x), ny = parseFloat(y);
+    var result = (isNaN(nx) || isNaN(ny)) ? x.localeCompare(y) : nx - ny;
+    return ascending ? result : -result;
+  });
+  bodies.forEach(function (body) { table.appendChild(body); });
+  table.dataset.sortColumn = column;
+  table.dataset.sortOrder = ascending ? 'asc' : 'desc';
+}
+</script>
+</body>
+</html>
+"""
+
+
+def write_details(results: dict, stream) -> None:
+    stream.write("<ul>\n")
     for key, value in results.items():
-        html_lines.append(f"<li><strong>{escape(str(key))}</strong>:")
+        stream.write(f"<li><strong>{escape(str(key))}</strong>:")
         if isinstance(value, dict):
-            html_lines.append("<ul>")
+            stream.write("<ul>\n")
             for sub_key, sub_value in value.items():
-                html_lines.append(
-                    f"<li><strong>{escape(str(sub_key))}</strong>: <code>{escape(str(sub_value))}</code></li>"
-                )
-            html_lines.append("</ul>")
-
+                stream.write(f"<li><strong>{escape(str(sub_key))}</strong>: <code>{escape(str(sub_value))}</code></li>\n")
+            stream.write("</ul>")
         elif isinstance(value, list):
-            html_lines.append("<pre style='background-color: #222; padding: 10px; border-radius: 5px; text-align: left;'>")
+            stream.write("<pre>")
             for item in value:
-                html_lines.append(escape(str(item)))
-            html_lines.append("</pre>")
+                stream.write(escape(str(item)) + "\n")
+            stream.write("</pre>")
+        else:
+            stream.write(f" <code>{escape(str(value))}</code>")
+        stream.write("</li>\n")
+    stream.write("</ul>\n")
+
 
+class HtmlReport:
+    def __init__(self, stream, title: str):
+        self.stream = stream
+        self.hosts = 0
+        columns = ["Host", "Status"] + SUMMARY_COLUMNS + ["Elapsed"]
+        headers = "".join(f"<th onclick='sortHosts({index})'>{escape(name)}</th>" for index, name in enumerate(columns))
+        self.stream.write(PAGE_HEAD.format(title=escape(title), headers=headers))
+
+    def add_host(self, host: str, results: Optional[dict], error: Optional[str] = None, elapsed: Optional[float] = None) -> None:
+        self.hosts += 1
+        write = self.stream.write
+        write(f"<tbody id='host-{self.hosts}'><tr>")
+        write(f"<td><a href='#host-{self.hosts}'>{escape(host)}</a></td>")
+        if results is None:
+            write(f"<td class='failed'>FAILED</td><td class='failed' colspan='{len(SUMMARY_COLUMNS)}'>{escape(str(error))}</td>")
         else:
-            html_lines.append(f" <code>{escape(str(value))}</code>")
-        html_lines.append("</li>")
+            write("<td>OK</td>")
+            for column in SUMMARY_COLUMNS:
+                value = results.get(column, "")
+                write(f"<td>{escape('' if isinstance(value, (list, dict)) else str(value))}</td>")
+        write(f"<td>{'' if elapsed is None else f'{elapsed:.2f}s'}</td></tr>\n")
+
+        if results is not None:
+            # A lone host is shown expanded, large reports start collapsed
+            opened = " open" if self.hosts == 1 else ""
+            write(f"<tr><td colspan='{len(SUMMARY_COLUMNS) + 3}'><details{opened}><summary>Details</summary>\n")
+            write_details(results, self.stream)
+            write("</details></td></tr>\n")
+        write("</tbody>\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.write(PAGE_TAIL)
+        self.stream.flush()
+
+
+def open_report(path: Optional[str], title: str) -> HtmlReport:
+    stream = sys.stdout if path in (None, "-") else open(path, "w", encoding="utf-8")
+    return HtmlReport(stream, title)
 
-    html_lines.extend([
-        "</ul>",
-        "</div>",
-        "</body>",
-        "</html>"
-    ])
 
-    html_content = "\n".join(html_lines)
+def close_report(report: HtmlReport) -> None:
+    report.close()
+    if report.stream is not sys.stdout:
+        report.stream.close()
 
-    # Save to a temporary file and open it
-    with tempfile.NamedTemporaryFile('w', delete=False, suffix='.html') as f:
-        f.write(html_content)
-        file_path = f.name
 
-    webbrowser.open(f"file://{os.path.abspath(file_path)}")
+def to_html(results: dict, host: str, path: Optional[str] = None) -> None:
+    report = open_report(path, f"System Info: {host}")
+    try:
+        report.add_host(host, results)
+    finally:
+        close_report(report)
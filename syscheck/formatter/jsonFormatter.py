@@ -1,4 +1,6 @@
 import json
 
+from syscheck.models import to_serializable
+
 def to_json(results: dict) -> None:
-    print(json.dumps(results, indent=4))
\ No newline at end of file
+    print(json.dumps(results, indent=4, default=to_serializable))
\ No newline at end of file
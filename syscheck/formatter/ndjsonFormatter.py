@@ -0,0 +1,50 @@
+import json
+import sys
+import time
+
+from syscheck.models import to_serializable
+
+
+def dump_compact(value) -> str:
+    return json.dumps(value, separators=(",", ":"), default=to_serializable)
+
+
+def write_value(value, stream) -> None:
+    # Lists such as journal lines are written item by item instead of being encoded as one string
+    if isinstance(value, list):
+        stream.write("[")
+        for index, item in enumerate(value):
+            if index:
+                stream.write(",")
+            stream.write(dump_compact(item))
+        stream.write("]")
+    else:
+        stream.write(dump_compact(value))
+
+
+def write_record(fields: dict, stream, value_key=None, value=None) -> None:
+    stream.write(dump_compact(fields)[:-1])
+    if value_key is not None:
+        stream.write(f",{dump_compact(value_key)}:")
+        write_value(value, stream)
+    stream.write("}\n")
+
+
+def to_ndjson(results: dict, host: str = None, per_metric: bool = False, stream=None, **fields) -> None:
+    stream = stream or sys.stdout
+    header = {"host": host, "time": round(time.time(), 3), **fields}
+
+    if results is None:
+        write_record(header, stream)
+    elif per_metric:
+        for metric, value in results.items():
+            write_record({**header, "metric": metric}, stream, "value", value)
+    else:
+        stream.write(dump_compact(header)[:-1] + ',"results":{')
+        for index, (metric, value) in enumerate(results.items()):
+            if index:
+                stream.write(",")
+            stream.write(f"{dump_compact(metric)}:")
+            write_value(value, stream)
+        stream.write("}}\n")
+    stream.flush()
@@ -0,0 +1,126 @@
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from syscheck.models import DiskUsage
+from syscheck.collectors.parsers import TRACKED_METRICS, extract_number
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS metrics (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS snapshots (id INTEGER PRIMARY KEY, host_id INTEGER NOT NULL, ts REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS samples (
+    snapshot_id INTEGER NOT NULL,
+    metric_id INTEGER NOT NULL,
+    value TEXT,
+    number REAL,
+    PRIMARY KEY (snapshot_id, metric_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshots_host_ts ON snapshots (host_id, ts);
+CREATE INDEX IF NOT EXISTS samples_metric ON samples (metric_id, snapshot_id);
+"""
+
+def flatten_results(results: dict) -> list:
+    rows = []
+    # Fingerprinted sections are stored as their sha256: blob reference instead of a copy per host
+    fingerprints = results.get("Fingerprints", {})
+    for metric, value in results.items():
+        if metric == "Fingerprints":
+            continue
+        if metric in fingerprints:
+            rows.append((metric, fingerprints[metric], None))
+        if isinstance(value, dict):
+            rows.extend((f"{metric}.{name}", str(state), None) for name, state in value.items())
+        elif metric in fingerprints:
+            continue
+        elif isinstance(value, list):
+            # Each mount becomes its own metric so disk thresholds are a plain numeric comparison
+            rows.extend((f"{metric}[{disk.mount}]", str(disk), round(disk.percent, 2)) for disk in value if isinstance(disk, DiskUsage))
+            rows.append((metric, "\n".join(str(line) for line in value), None))
+        else:
+            number = extract_number(value) if metric in TRACKED_METRICS else None
+            rows.append((metric, str(value), number))
+    return rows
+
+
+class HistoryStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        # Snapshots are appended one per host, WAL keeps each commit from forcing a full sync
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.ids = {"hosts": {}, "metrics": {}}
+
+    def _id(self, table: str, name: str) -> int:
+        cached = self.ids[table].get(name)
+        if cached is None:
+            self.db.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            cached = self.db.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+            self.ids[table][name] = cached
+        return cached
+
+    def _metric_ids(self, pattern: str) -> list:
+        # Metric names accept shell-style wildcards, e.g. 'Disk Usage*'
+        return [row[0] for row in self.db.execute("SELECT id FROM metrics WHERE name GLOB ?", (pattern,))]
+
+    def record(self, host: str, results: dict, ts: Optional[float] = None) -> None:
+        with self.db:
+            cursor = self.db.execute("INSERT INTO snapshots (host_id, ts) VALUES (?, ?)", (self._id("hosts", host), ts or time.time()))
+            snapshot_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT OR REPLACE INTO samples (snapshot_id, metric_id, value, number) VALUES (?, ?, ?, ?)",
+                [(snapshot_id, self._id("metrics", metric), value, number) for metric, value, number in flatten_results(results)],
+            )
+
+    def series(self, host: str, metric: str, since: float) -> list:
+        metric_ids = self._metric_ids(metric)
+        if not metric_ids:
+            return []
+        return self.db.execute(
+            f"SELECT s.ts, m.name, v.value, v.number FROM snapshots s "
+            f"JOIN hosts h ON h.id = s.host_id "
+            f"JOIN samples v ON v.snapshot_id = s.id "
+            f"JOIN metrics m ON m.id = v.metric_id "
+            f"WHERE h.name = ? AND s.ts >= ? AND v.metric_id IN ({','.join('?' * len(metric_ids))}) "
+            f"ORDER BY s.ts",
+            (host, since, *metric_ids),
+        ).fetchall()
+
+    def recent(self, host: str, metric: str, limit: int) -> list:
+        metric_ids = self._metric_ids(metric)
+        if not metric_ids or limit < 1:
+            return []
+        # (metric, number) from the host's last `limit` snapshots, oldest first
+        return self.db.execute(
+            f"SELECT m.name, v.number FROM "
+            f"(SELECT s.id, s.ts FROM snapshots s JOIN hosts h ON h.id = s.host_id WHERE h.name = ? ORDER BY s.ts DESC LIMIT ?) latest "
+            f"JOIN samples v ON v.snapshot_id = latest.id "
+            f"JOIN metrics m ON m.id = v.metric_id "
+            f"WHERE v.metric_id IN ({','.join('?' * len(metric_ids))}) "
+            f"ORDER BY latest.ts",
+            (host, limit, *metric_ids),
+        ).fetchall()
+
+    def latest_above(self, metric: str, threshold: float) -> list:
+        metric_ids = self._metric_ids(metric)
+        if not metric_ids:
+            return []
+        # Only each host's most recent snapshot is compared against the threshold
+        return self.db.execute(
+            f"SELECT h.name, m.name, v.number, s.ts FROM "
+            f"(SELECT MAX(id) AS id FROM snapshots GROUP BY host_id) latest "
+            f"JOIN snapshots s ON s.id = latest.id "
+            f"JOIN hosts h ON h.id = s.host_id "
+            f"JOIN samples v ON v.snapshot_id = s.id "
+            f"JOIN metrics m ON m.id = v.metric_id "
+            f"WHERE v.metric_id IN ({','.join('?' * len(metric_ids))}) AND v.number > ? "
+            f"ORDER BY v.number DESC",
+            (*metric_ids, threshold),
+        ).fetchall()
+
+    def close(self) -> None:
+        self.db.close()
@@ -2,18 +2,16 @@ import argparse
 import os
 import time
 import getpass
+import sys
 from pathlib import Path
+from typing import Optional
 
 import syscheck
-from syscheck.connectors.ssh import SSHConnection
-from syscheck.connectors.winrm import WinRMConnection
+from syscheck import timings
+from syscheck.registry import ASYNC_CONNECTORS, COLLECTORS, CONNECTORS, FORMATTERS, load
 
-from syscheck.collectors.LinuxCollector import LinuxCollector
-from syscheck.collectors.WindowsCollector import WindowsCollector
-
-from syscheck.formatter.TerminalFormatter import to_terminal
-from syscheck.formatter.htmlFormatter import to_html
-from syscheck.formatter.jsonFormatter import to_json
+# Connectors, collectors, formatters and the fleet, agent, history and watch modules are imported where they are
+# first used, so --help, --version, profile commands and single-OS runs only load what they need
 
 
 def parse_args() -> object:
@@ -25,19 +23,110 @@ def parse_args() -> object:
     parser.add_argument("-s", "--services", nargs="*", help="Service name(s) to check, supports wildcards (e.g. '*sql*' or 'nginx mysql')")
     parser.add_argument('--version', action='version', version=f"SysCheck-Lite {syscheck.__version__}")
     parser.add_argument("-d", "--domain", help="Target Domain for Authentication with Username")
-    parser.add_argument("-O", "--output", choices=["terminal", "html", "json"], type=str.lower, help="How to display the results.")
+    parser.add_argument("-O", "--output", choices=["terminal", "html", "json", "ndjson"], type=str.lower, help="How to display the results.")
     parser.add_argument("-p", "--password", help="Password used to authenticate with the target host")
     parser.add_argument("-P", "--profile", help="Load a saved profile with connection settings. CLI Input will take priority over the values in the profile")
     parser.add_argument("-C", "--createprofile", help="Save arguments into profile for use later.")
+    parser.add_argument("--agent", action="store_true", default=None, help="Run the local agent that keeps authenticated sessions warm between runs")
+    parser.add_argument("--agent-stop", action="store_true", default=None, help="Stop a running local agent")
+    parser.add_argument("--agent-max-sessions", type=int, help="Maximum sessions the agent keeps open (default 32)")
+    parser.add_argument("--agent-idle", type=float, help="Seconds before the agent closes an idle session (default 600)")
+    parser.add_argument("--no-agent", action="store_true", default=None, help="Connect directly even if a local agent is running")
+    parser.add_argument("--fingerprint", action="store_true", default=None, help="Fetch OS version, kernel and the service list only when their hash is new to the local blob store (Linux)")
+    parser.add_argument("-r", "--refresh", action="store_true", default=None, help="Ignore cached static facts (hostname, OS version, kernel, ...) and fetch everything again")
+    parser.add_argument("-I", "--incremental", action="store_true", default=None, help="Only fetch journal/event log errors logged since the previous run against the host")
+    parser.add_argument("--max-events", type=int, help="Maximum number of new journal/event log errors fetched per run in incremental mode (default 100)")
+    parser.add_argument("--html-file", help="With --output html, write the report to this path instead of stdout")
+    parser.add_argument("--per-metric", action="store_true", default=None, help="With --output ndjson, write one record per metric instead of one per host")
+    parser.add_argument("--watch", type=float, metavar="INTERVAL", help="Keep the connection open and re-sample volatile metrics every INTERVAL seconds")
+    parser.add_argument("-b", "--batch", action="store_true", default=None, help="Run all collection commands in a single remote round-trip")
+    parser.add_argument("--compress", action="store_true", default=None, help="Compress SSH traffic and gzip batched output on the target, for slow links")
+    parser.add_argument("-m", "--mode", choices=["commands", "proc", "probe"], type=str.lower, help="Linux collection mode, 'proc' reads CPU, memory, swap, load and uptime from /proc in one command, 'probe' runs a Python probe on the target that returns every metric in one JSON payload (falls back to commands without python3)")
+    parser.add_argument("--cpu-interval", type=float, help="Seconds between the two /proc/stat samples used for CPU usage in proc mode (default 0.5)")
+    parser.add_argument("-c", "--channels", type=int, help="Run up to this many Linux commands at once over separate SSH channels (default 1)")
+    parser.add_argument("--record", action="store_true", default=None, help="Append the collected results to the local history database")
+    parser.add_argument("--history-db", help="Path of the history database (default in the SysCheck state directory)")
+    parser.add_argument("--history", metavar="METRIC", help="Show the recorded values of METRIC for --host, wildcards allowed (e.g. 'Disk Usage*')")
+    parser.add_argument("--since", type=float, help="Hours of history shown by --history (default 24)")
+    parser.add_argument("--above", nargs=2, metavar=("METRIC", "THRESHOLD"), help="List hosts whose most recent recorded METRIC is above THRESHOLD")
+    parser.add_argument("--profile-timings", action="store_true", default=None, help="Print connect and per-command timings, slowest first, after the run")
+    parser.add_argument("--timings-file", help="Export the recorded timings to this file")
+    parser.add_argument("--timings-format", choices=["json", "chrome"], type=str.lower, help="Format of --timings-file, 'chrome' loads in chrome://tracing or Perfetto (default json)")
+    parser.add_argument("-i", "--inventory", help="Inventory file of hosts to scan concurrently, one 'host key=value ...' entry per line")
+    parser.add_argument("-w", "--workers", type=int, help="Maximum number of hosts scanned at once in fleet mode (default 10)")
+    parser.add_argument("--host-timeout", type=float, help="Overall seconds allowed per host before it is abandoned (fleet default 120, no limit for a single host)")
+    parser.add_argument("--connect-timeout", type=float, help="Seconds allowed to connect and authenticate to a host (default 5)")
+    parser.add_argument("--command-timeout", type=float, help="Seconds before a single remote command is abandoned (default 60)")
+    parser.add_argument("--no-precheck", action="store_true", default=None, help="In fleet mode, skip the TCP reachability check on port 22/5985 before connecting")
+    parser.add_argument("--precheck-timeout", type=float, help="Seconds to wait for the TCP reachability check (default 2)")
+    parser.add_argument("--rules", help="Threshold rules file (e.g. 'disk.pcent > 90'), exit with Nagios codes 0 OK, 1 WARNING, 2 CRITICAL, 3 UNKNOWN")
+    parser.add_argument("--fail-fast", action="store_true", default=None, help="With --rules, stop the sweep (or --watch) as soon as a critical rule fails")
+    parser.add_argument("--async", dest="use_async", action="store_true", default=None, help="Drive fleet mode from a single asyncio event loop instead of a thread pool")
     return parser.parse_args()
 
 
 def get_profile_dir() -> Path:
+    return get_state_dir("profiles")
+
+
+def get_state_dir(name: str) -> Path:
+    # Profiles, cache, cursors, blobs, history and the agent socket all live under one per-user location
     if os.name == "nt":
         local_appdata = os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
-        return Path(local_appdata) / "SysCheck" / "profiles"
+        return Path(local_appdata) / "SysCheck" / name
     else:
-        return Path.home() / ".syscheck_profiles"
+        return Path.home() / f".syscheck_{name}"
+
+
+def get_agent_socket() -> Path:
+    return get_state_dir("agent") / "agent.sock"
+
+
+def open_cache(args) -> object:
+    from syscheck.cache import ResultCache
+    return ResultCache(get_state_dir("cache") / "results.json", refresh=bool(args.refresh))
+
+
+def open_cursors() -> object:
+    from syscheck.cache import ResultCache
+    return ResultCache(get_state_dir("cache") / "cursors.json")
+
+
+def open_blobs(args) -> object:
+    if not args.fingerprint:
+        return None
+    from syscheck.blobs import BlobStore
+    return BlobStore(get_state_dir("blobs"))
+
+
+def open_rules(args) -> object:
+    if not args.rules:
+        return None
+    from syscheck.rules import RuleEngine, load_rules
+    return RuleEngine(load_rules(args.rules))
+
+
+def is_critical(outcomes: list) -> bool:
+    from syscheck.rules import CRITICAL
+    return any(outcome.status == CRITICAL for outcome in outcomes)
+
+
+def report_rules(outcomes: list, stream=None) -> int:
+    from syscheck.rules import OK, STATUS_NAMES, overall_status, summary_line
+
+    stream = stream or sys.stdout
+    for outcome in outcomes:
+        if outcome.status != OK:
+            print(f"  [{STATUS_NAMES[outcome.status]}] {outcome.host} {outcome.target} = {outcome.value} ({outcome.rule})", file=stream)
+    print(summary_line(outcomes), file=stream)
+    return overall_status(outcomes)
+
+
+# One-shot commands and modes, a profile holds connection and collection settings only
+PROFILE_SKIP_KEYS = [
+    "createprofile", "profile", "password", "agent", "agent_stop", "history", "above", "watch", "inventory", "record",
+    "refresh",
+]
 
 
 def load_profile_file(profile_name: str) -> dict:
@@ -55,9 +144,13 @@ def load_profile_file(profile_name: str) -> dict:
             if "=" not in line:
                 continue
             key, value = line.split("=", 1)
+            # Profiles saved by older versions may still carry command flags
+            if key.strip() in PROFILE_SKIP_KEYS:
+                continue
             profile_data[key.strip()] = value.strip()
 
-    profile_data["Services"] = [s.strip() for s in profile_data['Services'].split(',')]
+    if "services" in profile_data:
+        profile_data["services"] = [s.strip() for s in profile_data["services"].split(',')]
    
     return profile_data
 
@@ -70,7 +163,7 @@ def create_profile_file(profile_name: str, args) -> None:
     with profile_path.open("w") as f:
         f.write("# SysCheck-Lite Profile\n")
         for key in vars(args):
-            if key in ["createprofile", "profile", "password"]:  
+            if key in PROFILE_SKIP_KEYS:
                 continue
             value = getattr(args, key)
             if value is None:
@@ -82,7 +175,36 @@ def create_profile_file(profile_name: str, args) -> None:
     print(f"\n\033[92mProfile '{profile_name}' saved to {profile_path}\033[0m")
 
 
-def create_connector(args) -> object:
+def open_history(args) -> object:
+    from syscheck.history import HistoryStore
+    return HistoryStore(Path(args.history_db).expanduser() if args.history_db else get_state_dir("history") / "history.db")
+
+
+def run_history_query(args) -> None:
+    history = open_history(args)
+    try:
+        if args.history:
+            if not args.host:
+                raise ValueError("--history requires --host")
+            rows = history.series(args.host, args.history, time.time() - float(args.since or 24) * 3600)
+            for ts, metric, value, number in rows:
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}  {metric:<30} {value}")
+        else:
+            metric, threshold = args.above
+            try:
+                threshold = float(threshold.rstrip("%"))
+            except ValueError:
+                raise ValueError(f"Invalid threshold '{threshold}'")
+            rows = history.latest_above(metric, threshold)
+            for host, metric, number, ts in rows:
+                print(f"{host:<30} {metric:<30} {number:>8.2f}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}")
+        if not rows:
+            print("No matching history found")
+    finally:
+        history.close()
+
+
+def resolve_credentials(args, password=None) -> tuple:
     ssh_key_path = None
     if args.key:
         ssh_key_path = os.path.expandvars(os.path.expanduser(args.key))
@@ -93,37 +215,119 @@ def create_connector(args) -> object:
     if args.os not in ["rhel", "rocky", "debian", "ubuntu", "windows"]:
         raise ValueError(f"Unsupported OS: {args.os}")
 
-    password = None
-    if not ssh_key_path:
+    if not ssh_key_path and password is None:
         password = getpass.getpass("Enter Password: ")
+
+    return ssh_key_path, password
+
+
+def connection_timeouts(args) -> dict:
+    return {
+        "connect_timeout": float(getattr(args, "connect_timeout", None) or 5),
+        "command_timeout": float(getattr(args, "command_timeout", None) or 60),
+    }
+
+
+def connection_options(args) -> dict:
+    return {**connection_timeouts(args), "compress": bool(getattr(args, "compress", None))}
+
+
+def create_connector(args, password=None) -> object:
+    ssh_key_path, password = resolve_credentials(args, password)
+    if args.os not in CONNECTORS:
+        raise ValueError(f"Unsupported OS: {args.os}")
         
-    if args.os in ["rhel", "rocky", "debian", "ubuntu"]:
-        connector = SSHConnection(
+    if args.os in ["windows",]:
+        connector = load(CONNECTORS, args.os)(
             host=args.host,
             user=args.user,
             password=password,
-            key_path=ssh_key_path,
+            domain=args.domain,
+            **connection_options(args),
         )
-    elif args.os in ["windows",]:
-        connector = WinRMConnection(
+    else:
+        connector = load(CONNECTORS, args.os)(
             host=args.host,
             user=args.user,
             password=password,
-            domain=args.domain
+            key_path=ssh_key_path,
+            **connection_options(args),
         )
-    else:
-       raise ValueError(f"Unsupported OS: {args.os}")
 
     return connector
 
 
-def create_collector(args) -> object:
-    if args.os in ["rhel", "rocky", "debian", "ubuntu"]:
-        return LinuxCollector(services=args.services, distro=args.os)
-    elif args.os in ["windows"]:
-        return WindowsCollector(services=args.services)
-    
-    raise ValueError(f"No collector implemented for OS: {args.os}")
+def open_connector(args, password=None) -> object:
+    from syscheck.agent import AgentConnection, agent_available
+
+    socket_path = get_agent_socket()
+    if args.no_agent or not agent_available(socket_path):
+        return create_connector(args, password)
+
+    ssh_key_path = None
+    if args.key:
+        ssh_key_path, _ = resolve_credentials(args, password or "")
+    target = {"os": args.os, "host": args.host, "user": args.user, "key": ssh_key_path, "domain": args.domain,
+              **connection_options(args)}
+    return AgentConnection(socket_path, target, password=password, prompt_password=lambda: getpass.getpass("Enter Password: "))
+
+
+def run_agent(args) -> None:
+    from syscheck.agent import serve
+
+    def factory(target, password):
+        return create_connector(argparse.Namespace(**target), password)
+
+    print(f"\033[92mSysCheck agent listening on {get_agent_socket()}\033[0m")
+    serve(
+        get_agent_socket(),
+        factory,
+        max_sessions=int(args.agent_max_sessions or 32),
+        idle_timeout=float(args.agent_idle or 600),
+    )
+
+
+def create_async_connector(args, password=None, executor=None) -> object:
+    if args.os not in ASYNC_CONNECTORS:
+        raise ValueError(f"Unsupported OS: {args.os}")
+    try:
+        connector_class = load(ASYNC_CONNECTORS, args.os)
+    except ImportError as e:
+        raise ValueError(f"Async mode requires optional dependencies, install with 'pip install syscheck-lite[async]' ({e})")
+
+    ssh_key_path, password = resolve_credentials(args, password)
+    if args.os in ["windows"]:
+        return connector_class(host=args.host, user=args.user, password=password, domain=args.domain, executor=executor,
+                               **connection_options(args))
+    return connector_class(host=args.host, user=args.user, password=password, key_path=ssh_key_path, **connection_options(args))
+
+
+def create_collector(args, cache=None, cursors=None, blobs=None) -> object:
+    if args.os not in COLLECTORS:
+        raise ValueError(f"No collector implemented for OS: {args.os}")
+
+    if args.os in ["windows"]:
+        return load(COLLECTORS, args.os)(
+            services=args.services,
+            batched=bool(args.batch),
+            cache=cache,
+            incremental=bool(args.incremental),
+            max_events=int(args.max_events or 100),
+            cursors=cursors,
+        )
+    return load(COLLECTORS, args.os)(
+            services=args.services,
+            distro=args.os,
+            batched=bool(args.batch),
+            channels=int(args.channels or 1),
+            mode=args.mode or "commands",
+            cpu_interval=float(args.cpu_interval or 0.5),
+            cache=cache,
+            incremental=bool(args.incremental),
+            max_events=int(args.max_events or 100),
+            cursors=cursors,
+            blobs=blobs,
+        )
 
 
 def gather_info(collector, connector) -> dict:
@@ -135,6 +339,191 @@ def gather_info(collector, connector) -> dict:
         raise ConnectionError("Failed to connect to target")
 
 
+def gather_with_deadline(collector, connector, deadline=None) -> dict:
+    if not deadline:
+        return gather_info(collector, connector)
+
+    from syscheck.fleet import run_fleet
+
+    # The fleet runner already enforces an overall per-host deadline, a single host is a fleet of one
+    result = run_fleet([(connector.host, lambda: gather_info(collector, connector))], workers=1, host_timeout=float(deadline),
+                       on_abandon=lambda host: connector.close())[0]
+    if result.error:
+        raise ConnectionError(f"{connector.host}: {result.error}")
+    return result.results
+
+
+def build_target_args(args, target: dict) -> argparse.Namespace:
+    target_args = argparse.Namespace(**vars(args))
+    target_args.profile = target.get("profile")
+
+    if target_args.profile:
+        for key, value in load_profile_file(target_args.profile).items():
+            setattr(target_args, key, value)
+    for key, value in target.items():
+        setattr(target_args, key, value)
+
+    if not target_args.os or not target_args.user:
+        raise ValueError(f"Inventory entry for {target['host']} is missing os or user")
+    target_args.os = target_args.os.lower()
+    if target_args.os != "windows":
+        target_args.domain = None
+    return target_args
+
+
+def run_inventory(args) -> None:
+    from syscheck.fleet import DaemonExecutor, load_inventory, run_fleet, run_fleet_async
+
+    targets = [build_target_args(args, target) for target in load_inventory(args.inventory)]
+    cache = open_cache(args)
+    cursors = open_cursors()
+    blobs = open_blobs(args)
+    engine = open_rules(args)
+    history = open_history(args) if args.record else None
+    host_outcomes = {}
+
+    password = None
+    if any(not target.key for target in targets):
+        password = args.password or getpass.getpass("Enter Password: ")
+
+    connectors = {}
+
+    def make_job(target):
+        def job():
+            connector = connectors[target.host] = open_connector(target, password)
+            try:
+                return gather_info(create_collector(target, cache, cursors, blobs), connector)
+            finally:
+                connector.close()
+        return job
+
+    if args.output == "html":
+        from syscheck.formatter.htmlFormatter import open_report, close_report
+    report = open_report(args.html_file, f"SysCheck Fleet Report: {Path(args.inventory).name}") if args.output == "html" else None
+    # JSON output is one document keyed by host in inventory order, written once the fleet finishes
+    documents = {target.host: None for target in targets} if args.output == "json" else None
+
+    def stream_result(result):
+        if engine and result.results is not None:
+            if history:
+                # Earlier samples must be read before this run is recorded
+                engine.prime(result.host, history)
+            host_outcomes[result.host] = engine.evaluate(result.host, result.results)
+        elif engine:
+            host_outcomes[result.host] = engine.evaluate_failure(result.host, result.error)
+        if history and result.results is not None:
+            history.record(result.host, result.results)
+        if report:
+            # Every host is appended to the one report as it finishes
+            report.add_host(result.host, result.results, result.error, result.elapsed)
+        elif documents is not None:
+            documents[result.host] = result.results if result.results is not None else {"error": result.error}
+        elif args.output == "ndjson":
+            # Every host becomes one line as soon as it finishes, failures included
+            load(FORMATTERS, "ndjson")(result.results, result.host, per_metric=bool(args.per_metric),
+                      elapsed=round(result.elapsed, 3), error=result.error)
+        elif result.results is not None:
+            print(f"\n\033[92m===== {result.host} ({result.elapsed:.2f}s) =====\033[0m")
+            display_results(result.results, argparse.Namespace(output=args.output, host=result.host, per_metric=args.per_metric))
+        else:
+            print(f"\n\033[91m[!] {result.host}: {result.error}\033[0m")
+
+    # Blocking WinRM calls from the async path run here, one thread per host the fleet may have in flight
+    winrm_executor = DaemonExecutor(int(args.workers or 100)) if args.use_async else None
+
+    def make_async_job(target):
+        async def job():
+            connector = create_async_connector(target, password, winrm_executor)
+            return await gather_info_async(create_collector(target, cache, cursors, blobs), connector)
+        return job
+
+    def stop_when(result):
+        return bool(args.fail_fast) and is_critical(host_outcomes.get(result.host, []))
+
+    skipped = [] if args.no_precheck else precheck_targets(targets, float(args.precheck_timeout or 2))
+    for result in skipped:
+        stream_result(result)
+    unreachable = {result.host for result in skipped}
+    targets = [target for target in targets if target.host not in unreachable]
+
+    try:
+        if args.use_async:
+            import asyncio
+            finished = asyncio.run(run_fleet_async(
+                [(target.host, make_async_job(target)) for target in targets],
+                concurrency=int(args.workers or 100),
+                host_timeout=float(args.host_timeout or 120),
+                on_result=stream_result,
+                stop_when=stop_when,
+            ))
+        else:
+            finished = run_fleet(
+                [(target.host, make_job(target)) for target in targets],
+                workers=int(args.workers or 10),
+                host_timeout=float(args.host_timeout or 120),
+                on_result=stream_result,
+                stop_when=stop_when,
+                on_abandon=lambda host: connectors[host].close() if host in connectors else None,
+            )
+    finally:
+        if winrm_executor:
+            winrm_executor.shutdown(wait=False)
+        if report:
+            close_report(report)
+        if history:
+            history.close()
+    cache.save()
+    cursors.save()
+    finished = skipped + finished
+    if documents is not None:
+        # Hosts never checked after --fail-fast are left out
+        load(FORMATTERS, "json")({host: document for host, document in documents.items() if document is not None})
+
+    # Keep stdout machine readable when writing records
+    streaming = args.output in ("json", "ndjson") or (report and report.stream is sys.stdout)
+    summary_stream = sys.stderr if streaming else sys.stdout
+    failed = [result for result in finished if result.error]
+    print(f"\n\033[92mFleet Summary: {len(finished) - len(failed)} succeeded, {len(failed)} failed ({len(skipped)} unreachable)\033[0m", file=summary_stream)
+    for result in sorted(finished, key=lambda r: r.elapsed, reverse=True):
+        status = f"\033[91mFAILED\033[0m {result.error}" if result.error else "\033[92mOK\033[0m"
+        print(f"  {result.host:<30} {result.elapsed:>7.2f}s  {status}", file=summary_stream)
+
+    if engine:
+        not_checked = len(targets) + len(skipped) - len(finished)
+        if not_checked > 0:
+            print(f"\033[93mStopped early, {not_checked} hosts not checked (--fail-fast)\033[0m", file=summary_stream)
+        return report_rules([outcome for outcomes in host_outcomes.values() for outcome in outcomes], summary_stream)
+    return None
+
+
+def precheck_targets(targets: list, timeout: float) -> list:
+    from syscheck.fleet import FleetResult
+    from syscheck.reachability import adaptive_timeout, check_reachable, port_for
+
+    started = time.time()
+    reachability = check_reachable([(target.host, port_for(target.os)) for target in targets], timeout=timeout)
+    elapsed = time.time() - started
+
+    skipped = []
+    for target in targets:
+        result = reachability[(target.host, port_for(target.os))]
+        if result.error:
+            skipped.append(FleetResult(target.host, None, result.error, elapsed))
+        else:
+            # Nearby hosts get a tighter connect deadline, so a host that stops mid-handshake fails fast
+            target.connect_timeout = adaptive_timeout(result.rtt, connection_timeouts(target)["connect_timeout"])
+    return skipped
+
+
+async def gather_info_async(collector, connector) -> dict:
+    try:
+        if await connector.connect():
+            return await collector.collect_async(connector)
+        raise ConnectionError("Failed to connect to target")
+    finally:
+        await connector.close()
+
+
 def validate_required_args(args) -> object:
     
     if not args.os:
@@ -157,51 +546,141 @@ def validate_required_args(args) -> object:
     
 
 def display_results(results, args) -> None:
-    if args.output == "html":
-        to_html(results, args.host)
-    elif args.output == "json":
-        to_json(results)
+    output = args.output if args.output in FORMATTERS else "terminal"
+    formatter = load(FORMATTERS, output)
+    if output == "html":
+        formatter(results, args.host, getattr(args, "html_file", None))
+    elif output == "ndjson":
+        formatter(results, args.host, per_metric=bool(getattr(args, "per_metric", False)))
     else:
-        to_terminal(results)
+        formatter(results)
 
 
-def main() -> None:
-    args = parse_args()
-    print(f"\033[92m============================================================================\nSysCheck-Lite Version {syscheck.__version__}\n============================================================================\033[0m")
+def message_stream(args) -> object:
+    # Banners and status messages go to stderr whenever stdout carries records or an HTML report
+    if args.output in ("json", "ndjson") or (args.output == "html" and getattr(args, "html_file", None) in (None, "-")):
+        return sys.stderr
+    return sys.stdout
+
+
+def main(args=None) -> Optional[int]:
+    args = args or parse_args()
     if args.profile:
         profile_data = load_profile_file(args.profile)
         for key, value in profile_data.items():
             if getattr(args, key, None) is None:
                 setattr(args, key, value)
+    print(f"\033[92m============================================================================\nSysCheck-Lite Version {syscheck.__version__}\n============================================================================\033[0m", file=message_stream(args))
+    recorder = timings.enable() if args.profile_timings or args.timings_file else None
+    try:
+        return run(args)
+    except (ValueError, ConnectionError, FileNotFoundError) as e:
+        if not args.rules:
+            raise
+        # A check that could not run is UNKNOWN to a scheduler, not a warning
+        from syscheck.rules import UNKNOWN
+        print(f"\n\033[91m[!] {e}\033[0m", file=message_stream(args))
+        return UNKNOWN
+    finally:
+        if recorder:
+            timings.disable()
+            report_timings(recorder, args)
+
+
+def report_timings(recorder, args) -> None:
+    if args.profile_timings:
+        # Keep stdout machine readable when it carries structured output
+        recorder.print_breakdown(file=sys.stderr if args.output in ("json", "ndjson", "html") else sys.stdout)
+    if args.timings_file:
+        recorder.export(args.timings_file, args.timings_format or "json")
+
+
+def run(args) -> Optional[int]:
     if args.createprofile:
         create_profile_file(args.createprofile, args)
         return
+    if args.agent:
+        run_agent(args)
+        return
+    if args.agent_stop:
+        from syscheck.agent import agent_available, send_request
+        if not agent_available(get_agent_socket()):
+            raise ConnectionError("No SysCheck agent is running")
+        send_request(get_agent_socket(), {"op": "stop"})
+        return
+    if args.history or args.above:
+        run_history_query(args)
+        return
+    if args.inventory:
+        return run_inventory(args)
     args = validate_required_args(args)
-    connector = create_connector(args)
-    collector = create_collector(args)
-    results = gather_info(collector, connector)
+    engine = open_rules(args)
+    connector = open_connector(args)
+    cache = open_cache(args)
+    cursors = open_cursors()
+    collector = create_collector(args, cache, cursors, open_blobs(args))
+    # Rule results go to stderr when stdout carries structured output
+    rules_stream = sys.stderr if args.output in ("json", "ndjson", "html") else sys.stdout
+    if args.watch:
+        from syscheck.watch import watch
+        if not connector.connect():
+            raise ConnectionError("Failed to connect to target")
+        outcomes = []
+
+        def stop_when(results):
+            # Every tick is a sample, so 'for N samples' rules need N breaching ticks in a row
+            outcomes[:] = engine.evaluate(args.host, results)
+            return bool(args.fail_fast) and is_critical(outcomes)
+
+        try:
+            watch(collector, connector, float(args.watch), output=args.output, host=args.host, stop_when=stop_when if engine else None)
+        finally:
+            connector.close()
+        return report_rules(outcomes, rules_stream) if engine else None
+    try:
+        results = gather_with_deadline(collector, connector, args.host_timeout)
+    finally:
+        connector.close()
+    cache.save()
+    cursors.save()
+    outcomes = []
+    if args.record:
+        history = open_history(args)
+        try:
+            if engine:
+                engine.prime(args.host, history)
+            outcomes = engine.evaluate(args.host, results) if engine else []
+            history.record(args.host, results)
+        finally:
+            history.close()
+    elif engine:
+        outcomes = engine.evaluate(args.host, results)
     display_results(results, args)
+    return report_rules(outcomes, rules_stream) if engine else None
 
 
 def cli_entry_point():
+    args = parse_args()
     try:
         start_time = time.time()
-        main()
+        status = main(args)
         end_time = time.time()
         elapsed = end_time - start_time
-        print(f"\033[92m\n============================================================================\nCollection Complete: Total Time {elapsed:.2f} Seconds\n============================================================================\033[0m")
+        print(f"\033[92m\n============================================================================\nCollection Complete: Total Time {elapsed:.2f} Seconds\n============================================================================\033[0m", file=message_stream(args))
+        if status is not None:
+            exit(status)
 
     except KeyboardInterrupt:
-        print("\n\033[93mProgram exited by user (Ctrl+C).\033[0m")
+        print("\n\033[93mProgram exited by user (Ctrl+C).\033[0m", file=message_stream(args))
         exit(0)
     except ValueError as e:
-        print(f"\n\033[91m[!] {e}\033[0m")
+        print(f"\n\033[91m[!] {e}\033[0m", file=message_stream(args))
         exit(1)
     except ConnectionError as e:
-        print(f"\n\033[91m[!] {e}\033[0m")
+        print(f"\n\033[91m[!] {e}\033[0m", file=message_stream(args))
         exit(1)
     except FileNotFoundError as e:
-        print(f"\n\033[91m[!] {e}\033[0m")
+        print(f"\n\033[91m[!] {e}\033[0m", file=message_stream(args))
         exit(1)
 
 
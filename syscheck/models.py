@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from enum import Enum
+
+UNITS = ["B", "K", "M", "G", "T", "P"]
+
+
+def human_size(size: int) -> str:
+    value = float(size)
+    for unit in UNITS:
+        if value < 1024 or unit == UNITS[-1]:
+            break
+        value /= 1024
+    return f"{value:.0f}{unit}" if unit == "B" or value >= 10 else f"{value:.1f}{unit}"
+
+
+class ServiceState(str, Enum):
+    # systemd ACTIVE column
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    FAILED = "failed"
+    ACTIVATING = "activating"
+    DEACTIVATING = "deactivating"
+    RELOADING = "reloading"
+    # Get-Service Status
+    RUNNING = "Running"
+    STOPPED = "Stopped"
+    START_PENDING = "StartPending"
+    STOP_PENDING = "StopPending"
+    CONTINUE_PENDING = "ContinuePending"
+    PAUSE_PENDING = "PausePending"
+    PAUSED = "Paused"
+    UNKNOWN = "unknown"
+
+    @classmethod
+    def _missing_(cls, value):
+        return cls.UNKNOWN
+
+    def __str__(self) -> str:
+        return self.value
+
+    @property
+    def is_running(self) -> bool:
+        return self in (ServiceState.ACTIVE, ServiceState.RELOADING, ServiceState.RUNNING)
+
+
+@dataclass
+class Percent:
+    __slots__ = ("value",)
+    value: float
+
+    @property
+    def percent(self) -> float:
+        return self.value
+
+    def __str__(self) -> str:
+        return f"{self.value:.2f}% used"
+
+    def as_dict(self) -> dict:
+        return {"percent": round(self.value, 2)}
+
+
+@dataclass
+class MemoryUsage:
+    __slots__ = ("total", "used")
+    total: int
+    used: int
+
+    @property
+    def percent(self) -> float:
+        return self.used / self.total * 100 if self.total else 0.0
+
+    def __str__(self) -> str:
+        if not self.total:
+            return "not configured"
+        return f"{self.percent:.2f}% used ({human_size(self.used)} of {human_size(self.total)})"
+
+    def as_dict(self) -> dict:
+        return {"total": self.total, "used": self.used, "percent": round(self.percent, 2)}
+
+
+@dataclass
+class DiskUsage:
+    __slots__ = ("mount", "size", "used", "avail")
+    mount: str
+    size: int
+    used: int
+    avail: int
+
+    @property
+    def percent(self) -> float:
+        # Same rounding as df: used against what is usable, which excludes reserved blocks
+        usable = self.used + self.avail
+        return self.used / usable * 100 if usable else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.mount:<20} {human_size(self.size):>7} {human_size(self.used):>7} {human_size(self.avail):>7} {self.percent:>6.1f}%"
+
+    def as_dict(self) -> dict:
+        return {"mount": self.mount, "size": self.size, "used": self.used, "avail": self.avail, "percent": round(self.percent, 2)}
+
+
+@dataclass
+class LoadAverage:
+    __slots__ = ("one", "five", "fifteen")
+    one: float
+    five: float
+    fifteen: float
+
+    @property
+    def percent(self) -> float:
+        return self.one
+
+    def __str__(self) -> str:
+        return f"{self.one:.2f} {self.five:.2f} {self.fifteen:.2f}"
+
+    def as_dict(self) -> dict:
+        return {"one": self.one, "five": self.five, "fifteen": self.fifteen}
+
+
+def to_serializable(value):
+    if hasattr(value, "as_dict"):
+        return value.as_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from typing import NamedTuple, Optional
+
+SSH_PORT = 22
+WINRM_PORT = 5985
+
+# Connect deadline handed to reachable hosts: a floor for authentication plus a multiple of the measured handshake
+ADAPTIVE_FLOOR = 2.0
+ADAPTIVE_RTT_FACTOR = 20
+
+
+class Reachability(NamedTuple):
+    host: str
+    port: int
+    rtt: Optional[float]
+    error: Optional[str]
+
+
+def port_for(os_name: str) -> int:
+    return WINRM_PORT if os_name == "windows" else SSH_PORT
+
+
+async def probe(host: str, port: int, timeout: float) -> Reachability:
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except asyncio.TimeoutError:
+        return Reachability(host, port, None, f"Unreachable: no answer on port {port} within {timeout:g} seconds")
+    except OSError as e:
+        return Reachability(host, port, None, f"Unreachable on port {port}: {e.strerror or e}")
+
+    rtt = time.perf_counter() - start
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return Reachability(host, port, rtt, None)
+
+
+async def probe_all(targets: list, timeout: float, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(host, port):
+        async with semaphore:
+            return await probe(host, port, timeout)
+
+    return await asyncio.gather(*(bounded(host, port) for host, port in targets))
+
+
+def check_reachable(targets: list, timeout: float = 2.0, concurrency: int = 500) -> dict:
+    # Every (host, port) pair is probed from one event loop, so the whole sweep costs about one timeout
+    unique = list(dict.fromkeys(targets))
+    results = asyncio.run(probe_all(unique, timeout, concurrency)) if unique else []
+    return {(result.host, result.port): result for result in results}
+
+
+def adaptive_timeout(rtt: float, ceiling: float) -> float:
+    return min(ceiling, ADAPTIVE_FLOOR + rtt * ADAPTIVE_RTT_FACTOR)
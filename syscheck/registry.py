@@ -0,0 +1,31 @@
+import importlib
+
+LINUX_DISTROS = ["rhel", "rocky", "debian", "ubuntu"]
+
+# Implementations are named by module path so paramiko, pywinrm and the formatters are only imported once chosen
+CONNECTORS = {
+    **{distro: ("syscheck.connectors.ssh", "SSHConnection") for distro in LINUX_DISTROS},
+    "windows": ("syscheck.connectors.winrm", "WinRMConnection"),
+}
+
+ASYNC_CONNECTORS = {
+    **{distro: ("syscheck.connectors.async_ssh", "AsyncSSHConnection") for distro in LINUX_DISTROS},
+    "windows": ("syscheck.connectors.async_winrm", "AsyncWinRMConnection"),
+}
+
+COLLECTORS = {
+    **{distro: ("syscheck.collectors.LinuxCollector", "LinuxCollector") for distro in LINUX_DISTROS},
+    "windows": ("syscheck.collectors.WindowsCollector", "WindowsCollector"),
+}
+
+FORMATTERS = {
+    "terminal": ("syscheck.formatter.TerminalFormatter", "to_terminal"),
+    "html": ("syscheck.formatter.htmlFormatter", "to_html"),
+    "json": ("syscheck.formatter.jsonFormatter", "to_json"),
+    "ndjson": ("syscheck.formatter.ndjsonFormatter", "to_ndjson"),
+}
+
+
+def load(registry: dict, key: str):
+    module_name, attribute = registry[key]
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,209 @@
+import fnmatch
+import operator
+import re
+from collections import deque
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from syscheck.collectors.parsers import extract_number, is_error
+from syscheck.models import DiskUsage
+
+# Nagios plugin exit codes
+OK = 0
+WARNING = 1
+CRITICAL = 2
+UNKNOWN = 3
+
+STATUS_NAMES = {OK: "OK", WARNING: "WARNING", CRITICAL: "CRITICAL", UNKNOWN: "UNKNOWN"}
+# Worst first, a critical breach outranks a metric that could not be read
+STATUS_PRIORITY = [CRITICAL, WARNING, UNKNOWN, OK]
+
+SUBJECTS = {
+    "cpu": "CPU Usage",
+    "memory": "Memory Usage",
+    "mem": "Memory Usage",
+    "swap": "Swap Usage",
+    "load": "Load Average",
+    "disk": "Disk Usage",
+}
+DISK_FIELDS = {
+    "pcent": lambda disk: disk.percent,
+    "used": lambda disk: disk.used,
+    "avail": lambda disk: disk.avail,
+    "size": lambda disk: disk.size,
+}
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq, "!=": operator.ne}
+
+RULE_PATTERN = re.compile(
+    r"""^(?:(?P<severity>critical|warning)\s*:\s*)?
+    (?:
+        service\s+(?P<service>\S+)\s*(?P<service_op>==|!=)\s*(?P<state>\S+)
+      | (?P<subject>"[^"]+"|[A-Za-z]+)(?:\[(?P<mount>[^\]]+)\])?(?:\.(?P<field>\w+))?
+        \s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<value>-?\d+(?:\.\d+)?)
+    )
+    (?:\s+for\s+(?P<samples>\d+)\s+samples?)?$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+class Rule(NamedTuple):
+    text: str
+    severity: int
+    metric: str
+    op: str
+    value: object
+    samples: int = 1
+    field: Optional[str] = None
+    mount: Optional[str] = None
+    service: Optional[str] = None
+
+
+class RuleResult(NamedTuple):
+    host: str
+    rule: str
+    target: str
+    value: str
+    status: int
+
+
+def parse_rule(text: str) -> Rule:
+    match = RULE_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid rule '{text}'")
+
+    severity = WARNING if (match.group("severity") or "").lower() == "warning" else CRITICAL
+    samples = int(match.group("samples") or 1)
+    if samples < 1:
+        raise ValueError(f"Invalid rule '{text}': needs at least 1 sample")
+
+    if match.group("service"):
+        return Rule(text, severity, "Services", match.group("service_op"), match.group("state"), samples,
+                    service=match.group("service"))
+
+    subject = match.group("subject")
+    metric = subject.strip('"') if subject.startswith('"') else SUBJECTS.get(subject.lower())
+    if metric is None:
+        raise ValueError(f"Invalid rule '{text}': unknown metric '{subject}' (use one of {', '.join(SUBJECTS)} or a quoted metric name)")
+
+    field = None
+    if metric == "Disk Usage":
+        field = (match.group("field") or "pcent").lower()
+        if field not in DISK_FIELDS:
+            raise ValueError(f"Invalid rule '{text}': unknown disk field '{field}' (use one of {', '.join(DISK_FIELDS)})")
+    elif match.group("field") or match.group("mount"):
+        raise ValueError(f"Invalid rule '{text}': only disk rules take a mount or field")
+
+    return Rule(text, severity, metric, match.group("op"), float(match.group("value")), samples, field, match.group("mount"))
+
+
+def load_rules(rules_path: str) -> list:
+    path = Path(rules_path).expanduser()
+    if not path.exists():
+        raise FileNotFoundError(f"Rules file not found at {path}")
+
+    rules = []
+    with path.open() as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                rules.append(parse_rule(line))
+            except ValueError as e:
+                raise ValueError(f"{e} on line {line_number} of {path}")
+
+    if not rules:
+        raise ValueError(f"No rules found in {path}")
+    return rules
+
+
+def rule_targets(rule: Rule, results: dict) -> list:
+    # (target name, value) pairs a rule applies to, target names match the metric names in the history store
+    value = results.get(rule.metric)
+    if rule.service:
+        if isinstance(value, str) and is_error(value):
+            return [(f"Services.{rule.service}", None)]
+        services = value if isinstance(value, dict) else {}
+        matched = [(f"Services.{name}", str(state)) for name, state in services.items() if fnmatch.fnmatch(name, rule.service)]
+        return matched or [(f"Services.{rule.service}", "not found")]
+
+    if rule.metric == "Disk Usage":
+        disks = [disk for disk in value if isinstance(disk, DiskUsage)] if isinstance(value, list) else []
+        if rule.mount:
+            disks = [disk for disk in disks if disk.mount == rule.mount]
+        if not disks:
+            return [(f"Disk Usage[{rule.mount or '*'}]", None)]
+        return [(f"Disk Usage[{disk.mount}]", DISK_FIELDS[rule.field](disk)) for disk in disks]
+
+    return [(rule.metric, extract_number(value) if value is not None else None)]
+
+
+def breaches(rule: Rule, value) -> bool:
+    if rule.service:
+        return OPERATORS[rule.op](value.lower(), rule.value.lower())
+    return OPERATORS[rule.op](value, rule.value)
+
+
+def glob_escape(text: str) -> str:
+    # History metric names are matched with SQLite GLOB, where [ * ? are special
+    return re.sub(r"([\[*?])", r"[\1]", text)
+
+
+def format_value(value) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+class RuleEngine:
+    def __init__(self, rules: list):
+        self.rules = rules
+        # Recent outcomes per (host, rule, target) for rules that need several samples in a row
+        self.windows = {}
+
+    def _window(self, host: str, index: int, target: str) -> deque:
+        key = (host, index, target)
+        if key not in self.windows:
+            self.windows[key] = deque(maxlen=self.rules[index].samples)
+        return self.windows[key]
+
+    def prime(self, host: str, history) -> None:
+        # Seeds multi-sample rules with the host's recorded samples, so one-shot runs can still require N in a row
+        for index, rule in enumerate(self.rules):
+            # Only the numeric value of each metric is recorded, for disks that is the percentage
+            if rule.samples < 2 or rule.service or rule.field not in (None, "pcent"):
+                continue
+            pattern = f"{glob_escape('Disk Usage[')}{glob_escape(rule.mount) if rule.mount else '*'}]" \
+                if rule.metric == "Disk Usage" else glob_escape(rule.metric)
+            for target, number in history.recent(host, pattern, rule.samples - 1):
+                if number is not None:
+                    self._window(host, index, target).append(breaches(rule, number))
+
+    def evaluate(self, host: str, results: dict) -> list:
+        outcomes = []
+        for index, rule in enumerate(self.rules):
+            for target, value in rule_targets(rule, results):
+                if value is None:
+                    outcomes.append(RuleResult(host, rule.text, target, "not collected", UNKNOWN))
+                    continue
+                window = self._window(host, index, target)
+                window.append(breaches(rule, value))
+                failed = len(window) == rule.samples and all(window)
+                outcomes.append(RuleResult(host, rule.text, target, format_value(value), rule.severity if failed else OK))
+        return outcomes
+
+    def evaluate_failure(self, host: str, error: str) -> list:
+        return [RuleResult(host, rule.text, rule.metric, error, UNKNOWN) for rule in self.rules]
+
+
+def overall_status(outcomes: list) -> int:
+    statuses = {outcome.status for outcome in outcomes}
+    return next((status for status in STATUS_PRIORITY if status in statuses), OK)
+
+
+def summary_line(outcomes: list) -> str:
+    status = overall_status(outcomes)
+    failed = [outcome for outcome in outcomes if outcome.status != OK]
+    if not failed:
+        return f"SYSCHECK OK - {len(outcomes)} checks passed"
+    details = "; ".join(f"{outcome.host} {outcome.target} {outcome.value} ({outcome.rule})" for outcome in failed[:5])
+    more = f" and {len(failed) - 5} more" if len(failed) > 5 else ""
+    return f"SYSCHECK {STATUS_NAMES[status]} - {len(failed)} of {len(outcomes)} checks failed: {details}{more}"
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+_recorder = None
+
+
+class Span:
+    __slots__ = ("recorder", "host", "category", "name", "start", "duration", "bytes_in", "bytes_out", "retries", "thread")
+
+    def __init__(self, recorder, host: str, category: str, name: str, retries: int = 0):
+        self.recorder = recorder
+        self.host = host
+        self.category = category
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = retries
+        self.thread = threading.get_ident()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration = time.perf_counter() - self.start
+        self.recorder.add(self)
+        return False
+
+    def as_dict(self) -> dict:
+        return {
+            "host": self.host,
+            "category": self.category,
+            "name": self.name,
+            "duration": round(self.duration, 6),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+        }
+
+
+class _NullSpan:
+    __slots__ = ()
+    bytes_in = bytes_out = retries = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class TimingRecorder:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.spans = []
+
+    def add(self, span: Span) -> None:
+        with self.lock:
+            self.spans.append(span)
+
+    def breakdown(self) -> list:
+        with self.lock:
+            return sorted(self.spans, key=lambda span: span.duration, reverse=True)
+
+    def to_json(self) -> dict:
+        spans = self.breakdown()
+        totals = {}
+        for span in spans:
+            total = totals.setdefault(span.category, {"count": 0, "duration": 0.0, "bytes_in": 0, "bytes_out": 0, "retries": 0})
+            total["count"] += 1
+            total["duration"] = round(total["duration"] + span.duration, 6)
+            total["bytes_in"] += span.bytes_in
+            total["bytes_out"] += span.bytes_out
+            total["retries"] += span.retries
+        return {"totals": totals, "spans": [span.as_dict() for span in spans]}
+
+    def to_chrome_trace(self) -> dict:
+        # Complete ("X") events in microseconds, one track per host and thread, loadable in chrome://tracing or Perfetto
+        with self.lock:
+            spans = list(self.spans)
+        hosts = {host: index for index, host in enumerate(dict.fromkeys(span.host for span in spans), 1)}
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": host}}
+            for host, pid in hosts.items()
+        ]
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": hosts[span.host],
+                "tid": span.thread,
+                "args": {"bytes_in": span.bytes_in, "bytes_out": span.bytes_out, "retries": span.retries},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str, format: str = "json") -> None:
+        document = self.to_chrome_trace() if format == "chrome" else self.to_json()
+        with open(os.path.expanduser(path), "w") as f:
+            json.dump(document, f)
+
+    def print_breakdown(self, limit: Optional[int] = None, file=None) -> None:
+        GREEN = "\033[92m"
+        RESET = "\033[0m"
+        spans = self.breakdown()
+        print(f"\n{GREEN}Timing Breakdown (slowest first){RESET}", file=file)
+        print(f"{GREEN}{'Seconds':>9}  {'Category':<9} {'Host':<20} {'Bytes In':>10} {'Retries':>7}  Name{RESET}", file=file)
+        for span in spans[:limit]:
+            name = span.name if len(span.name) <= 60 else span.name[:57] + "..."
+            print(f"{span.duration:>9.3f}  {span.category:<9} {span.host:<20} {span.bytes_in:>10} {span.retries:>7}  {name}", file=file)
+
+
+def enable() -> TimingRecorder:
+    global _recorder
+    _recorder = TimingRecorder()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def timed(host: str, category: str, name: str, retries: int = 0):
+    # Without a recorder every call site shares one no-op span, so instrumentation costs a single check
+    if _recorder is None:
+        return NULL_SPAN
+    return Span(_recorder, str(host), category, " ".join(name.split())[:200], retries)
@@ -0,0 +1,76 @@
+import sys
+import time
+from typing import Optional
+
+from syscheck.collectors.parsers import TRACKED_METRICS, extract_number
+from syscheck.formatter.TerminalFormatter import to_terminal
+from syscheck.formatter.ndjsonFormatter import to_ndjson
+
+
+class MetricStats:
+    def __init__(self):
+        self.stats = {}
+
+    def update(self, results: dict) -> None:
+        for metric in TRACKED_METRICS:
+            number = extract_number(results.get(metric))
+            if number is None:
+                continue
+            if metric not in self.stats:
+                self.stats[metric] = {"min": number, "max": number, "total": 0.0, "samples": 0, "last": number}
+            entry = self.stats[metric]
+            entry["min"] = min(entry["min"], number)
+            entry["max"] = max(entry["max"], number)
+            entry["total"] += number
+            entry["samples"] += 1
+            entry["last"] = number
+
+    def summary(self) -> dict:
+        return {
+            metric: {
+                "last": entry["last"],
+                "min": entry["min"],
+                "max": entry["max"],
+                "avg": round(entry["total"] / entry["samples"], 2),
+                "samples": entry["samples"],
+            }
+            for metric, entry in self.stats.items()
+        }
+
+
+def render_terminal(results: dict, stats: dict, host: str, tick: int, elapsed: float) -> None:
+    GREEN = "\033[92m"
+    RESET = "\033[0m"
+    # Move the cursor home and clear the screen so each tick redraws in place
+    sys.stdout.write("\033[H\033[J")
+    print(f"{GREEN}Watching {host} - sample {tick} ({elapsed:.2f}s) - Ctrl+C to stop{RESET}")
+    to_terminal(results)
+    if stats:
+        print(f"\n{GREEN}{'Metric':<16}{'Last':>10}{'Min':>10}{'Max':>10}{'Avg':>10}{RESET}")
+        for metric, entry in stats.items():
+            print(f"{metric:<16}{entry['last']:>10.2f}{entry['min']:>10.2f}{entry['max']:>10.2f}{entry['avg']:>10.2f}")
+    sys.stdout.flush()
+
+
+def watch(collector, connector, interval: float, output: str = "terminal", host: Optional[str] = None, ticks: Optional[int] = None,
+          stop_when=None) -> dict:
+    stats = MetricStats()
+    tick = 0
+    while ticks is None or tick < ticks:
+        started = time.time()
+        results = collector.collect_volatile(connector)
+        elapsed = time.time() - started
+        stats.update(results)
+        tick += 1
+
+        if output in ("json", "ndjson"):
+            to_ndjson(results, host, sample=tick, stats=stats.summary())
+        else:
+            render_terminal(results, stats.summary(), host, tick, elapsed)
+
+        if stop_when and stop_when(results):
+            break
+        if ticks is None or tick < ticks:
+            time.sleep(max(0.0, interval - (time.time() - started)))
+
+    return stats.summary()
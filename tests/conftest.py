@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    # Keeps profiles, the result cache, cursors, blobs and history of every test out of the real home directory
+    monkeypatch.setattr("syscheck.main.get_state_dir", lambda name: tmp_path / "state" / name)
+    return tmp_path / "state"
+
+
+class FakeChannel:
+    def __init__(self, stdout=b"", stderr=b"", exit_status=0, chunk_size=4):
+        self.stdout = bytearray(stdout)
+        self.stderr = bytearray(stderr)
+        self.exit_status = exit_status
+        self.chunk_size = chunk_size
+        self.eof_received = True
+        self.closed = False
+        self.reads = []
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv(self, nbytes):
+        data = bytes(self.stdout[:min(nbytes, self.chunk_size)])
+        del self.stdout[:len(data)]
+        self.reads.append("stdout")
+        return data
+
+    def recv_stderr(self, nbytes):
+        data = bytes(self.stderr[:min(nbytes, self.chunk_size)])
+        del self.stderr[:len(data)]
+        self.reads.append("stderr")
+        return data
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+
+def make_exec_result(stdout=b"", stderr=b"", exit_status=0):
+    channel = FakeChannel(stdout, stderr, exit_status)
+    mock_stdout = MagicMock()
+    mock_stdout.channel = channel
+    return MagicMock(), mock_stdout, MagicMock()
+
+
+@pytest.fixture
+def mock_sshclient():
+    with patch("paramiko.SSHClient") as mock:
+        yield mock
+
+
+@pytest.fixture
+def exec_result():
+    return make_exec_result
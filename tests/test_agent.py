@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from syscheck.agent import AgentServer, AgentConnection, SessionPool, NeedPassword, agent_available, send_request
+
+
+def make_connector(target, password):
+    connector = MagicMock()
+    connector.is_active.return_value = True
+    connector.run_command.side_effect = lambda command: f"{target['host']}:{command}"
+    return connector
+
+
+@pytest.fixture
+def agent(tmp_path):
+    factory = MagicMock(side_effect=make_connector)
+    pool = SessionPool(factory, max_sessions=2, idle_timeout=60)
+    socket_path = tmp_path / "agent.sock"
+    server = AgentServer(socket_path, pool)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path, pool, factory
+    server.shutdown()
+    server.server_close()
+
+
+def test_agent_reuses_warm_session(agent):
+    socket_path, pool, factory = agent
+    target = {"os": "rhel", "host": "web01", "user": "root", "key": "/keys/web", "domain": None}
+
+    assert agent_available(socket_path)
+
+    for _ in range(2):
+        connection = AgentConnection(socket_path, target)
+        assert connection.connect() is True
+        assert connection.run_command("hostname") == "web01:hostname"
+        connection.close()
+
+    factory.assert_called_once()
+    assert send_request(socket_path, {"op": "ping"})["sessions"] == 1
+
+
+def test_agent_prompts_for_password_only_when_session_is_cold(agent):
+    socket_path, pool, factory = agent
+    target = {"os": "windows", "host": "win01", "user": "svc", "key": None, "domain": "ACME"}
+    prompt = MagicMock(return_value="secret")
+
+    AgentConnection(socket_path, target, prompt_password=prompt).connect()
+    AgentConnection(socket_path, target, prompt_password=prompt).connect()
+
+    prompt.assert_called_once()
+    factory.assert_called_once_with(target, "secret")
+
+
+def test_agent_connection_reports_missing_password(agent):
+    socket_path, _, _ = agent
+    target = {"os": "rhel", "host": "web02", "user": "root", "key": None, "domain": None}
+
+    with pytest.raises(ConnectionError):
+        AgentConnection(socket_path, target).connect()
+
+
+def test_session_pool_caps_and_evicts_idle_sessions():
+    pool = SessionPool(make_connector, max_sessions=2, idle_timeout=0.01)
+    targets = [{"os": "rhel", "host": f"web0{i}", "user": "root", "key": "/k"} for i in range(3)]
+
+    for target in targets:
+        pool.run(target)
+    assert len(pool.sessions) == 2
+
+    time.sleep(0.05)
+    assert pool.evict_idle() == 2
+    assert pool.sessions == {}
+
+    with pytest.raises(NeedPassword):
+        pool.run({"os": "rhel", "host": "web09", "user": "root", "key": None})
+
+
+def test_agent_available_without_socket(tmp_path):
+    assert agent_available(tmp_path / "missing.sock") is False
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from syscheck.connectors.async_ssh import AsyncSSHConnection
+from syscheck.connectors.async_winrm import AsyncWinRMConnection
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.probe import NO_PYTHON
+from syscheck.collectors.steps import run_steps_async
+from syscheck.fleet import DaemonExecutor, run_fleet_async
+
+
+@pytest.fixture
+def mock_asyncssh_connect():
+    with patch("asyncssh.connect", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def test_async_ssh_connect_with_key(mock_asyncssh_connect):
+    ssh = AsyncSSHConnection(host="1.2.3.4", user="testuser", key_path="/fake/key")
+
+    assert asyncio.run(ssh.connect()) is True
+    mock_asyncssh_connect.assert_awaited_once_with(
+        "1.2.3.4", username="testuser", client_keys=["/fake/key"], known_hosts=None, connect_timeout=5
+    )
+
+
+def test_async_ssh_connect_raises_connection_error(mock_asyncssh_connect):
+    mock_asyncssh_connect.side_effect = OSError("Connection refused")
+    ssh = AsyncSSHConnection(host="1.2.3.4", user="testuser", password="secret")
+
+    with pytest.raises(ConnectionError) as excinfo:
+        asyncio.run(ssh.connect())
+
+    assert "Failed to establish connection" in str(excinfo.value)
+
+
+def test_async_ssh_run_command():
+    ssh = AsyncSSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = MagicMock()
+    ssh.client.run = AsyncMock(side_effect=[
+        MagicMock(stdout="command output\n", stderr=""),
+        MagicMock(stdout="", stderr="some error"),
+    ])
+
+    assert asyncio.run(ssh.run_command("ls")) == "command output"
+    assert asyncio.run(ssh.run_command("ls")) == "Error Collecting : some error"
+
+
+def test_async_ssh_run_command_raises_if_not_connected():
+    ssh = AsyncSSHConnection(host="1.2.3.4", user="testuser", password="secret")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ssh.run_command("ls"))
+
+
+def test_async_winrm_delegates_to_blocking_session():
+    conn = AsyncWinRMConnection(host="1.2.3.4", user="testuser", password="secret")
+    conn.connection.client = MagicMock()
+    conn.connection.client.protocol.get_command_output_raw.return_value = (b"WIN01\n", b"", 0, True)
+
+    assert asyncio.run(conn.run_command("hostname")) == "WIN01"
+
+    asyncio.run(conn.close())
+    assert conn.connection.client is None
+
+
+def test_linux_collector_collect_async_batched():
+    collector = LinuxCollector(distro="rhel", batched=True)
+    collector.collection_commands = {"Hostname": "hostname"}
+    connector = MagicMock()
+    connector.run_command = AsyncMock(return_value="Error Collecting")
+
+    system_info = asyncio.run(collector.collect_async(connector))
+
+    # the unparsable batch output falls back to one call per command
+    assert connector.run_command.await_count == 3
+    assert system_info["Hostname"] == "Error Collecting"
+
+
+def test_run_fleet_async_bounds_and_times_out():
+    async def ok():
+        return {"Hostname": "ok"}
+
+    async def hung():
+        await asyncio.sleep(5)
+
+    streamed = []
+    finished = asyncio.run(run_fleet_async([("hung", hung), ("ok", ok)], concurrency=2, host_timeout=0.1, on_result=streamed.append))
+
+    assert [r.host for r in streamed] == ["ok", "hung"]
+    assert finished[1].error.startswith("Timed out")
+
+
+@pytest.mark.parametrize("probe_output", [NO_PYTHON, "{\"metrics\": {}, \"commands\": {}}"])
+def test_probe_fallback_matches_between_blocking_and_async(probe_output):
+    def respond(command):
+        return probe_output if "python3" in command else "value"
+
+    blocking = LinuxCollector(distro="rhel", mode="probe", batched=True)
+    blocking_connector = MagicMock(host="web01", compress=False)
+    blocking_connector.run_command.side_effect = respond
+
+    async_collector = LinuxCollector(distro="rhel", mode="probe", batched=True)
+    async_connector = MagicMock(host="web01", compress=False)
+    async_connector.run_command = AsyncMock(side_effect=respond)
+
+    commands = blocking.build_commands()
+    assert blocking.execute(blocking_connector, commands) == asyncio.run(run_steps_async(async_collector.execute_steps(async_connector, commands)))
+    assert blocking_connector.run_command.call_count == async_connector.run_command.await_count
+
+
+def test_async_winrm_runs_on_given_executor():
+    executor = DaemonExecutor(2)
+    conn = AsyncWinRMConnection(host="1.2.3.4", user="testuser", password="secret", executor=executor)
+    conn.connection.client = MagicMock()
+    conn.connection.client.protocol.get_command_output_raw.return_value = (b"WIN01\n", b"", 0, True)
+
+    with patch.object(executor, "submit", wraps=executor.submit) as submit:
+        assert asyncio.run(conn.run_command("hostname")) == "WIN01"
+
+    assert submit.call_count == 1
+    assert all(thread.daemon for thread in executor.threads)
@@ -0,0 +1,106 @@
+import json
+import subprocess
+import pytest
+from unittest.mock import MagicMock
+from syscheck.collectors.batch import build_shell_batch, parse_shell_batch, build_powershell_batch, parse_powershell_batch
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+
+
+def run_locally(script: str) -> str:
+    return subprocess.run(["sh", "-c", script], capture_output=True, text=True).stdout.strip()
+
+
+def test_shell_batch_round_trip():
+    commands = {
+        "Hostname": "echo test-rocky",
+        "Multi": "printf 'a\\nb\\n'",
+        "Broken": "echo partial; echo 'bad thing' >&2",
+        "Status": "sh -c 'exit 3'",
+    }
+
+    script, token = build_shell_batch(commands)
+    results = parse_shell_batch(run_locally(script), commands, token)
+
+    assert results["Hostname"].output == "test-rocky"
+    assert results["Multi"].output == "a\nb"
+    assert results["Broken"].stdout == "partial"
+    # Same rule as run_command, stderr alongside output is only a warning
+    assert results["Broken"].output == "partial"
+    assert results["Status"].exit_status == 3
+    assert results["Status"].output == ""
+
+
+def test_parse_shell_batch_skips_missing_sections():
+    commands = {"First": "echo one", "Second": "echo two"}
+    script, token = build_shell_batch(commands)
+    output = run_locally(script)
+
+    truncated = output.split(f"__SYSCHECK_{token}_1_BEGIN__")[0]
+    results = parse_shell_batch(truncated, commands, token)
+
+    assert list(results) == ["First"]
+
+
+def test_shell_batch_keeps_stdout_when_stderr_has_warnings():
+    commands = {
+        "Journal": "echo '-- No entries --'; echo 'Hint: You are currently not seeing messages from other users' >&2",
+        "Broken": "echo 'command not found' >&2",
+    }
+    script, token = build_shell_batch(commands)
+
+    results = parse_shell_batch(run_locally(script), commands, token)
+
+    assert results["Journal"].output == "-- No entries --"
+    assert results["Broken"].output == "Error Collecting : command not found"
+
+
+def test_linux_collector_batched_uses_single_round_trip():
+    collector = LinuxCollector(services=None, distro="rhel", batched=True)
+    collector.collection_commands = {"Hostname": "echo test-rocky", "Kernel": "echo 5.14.0"}
+    collector.service_list_command = "echo 'sshd.service loaded active running OpenSSH'"
+
+    connector = MagicMock()
+    connector.run_command.side_effect = run_locally
+
+    system_info = collector.collect(connector)
+
+    assert connector.run_command.call_args_list[0][0][0].startswith("{")
+    assert system_info["Hostname"] == "test-rocky"
+    assert system_info["Kernel"] == "5.14.0"
+    assert system_info["Services"] == {"sshd": "active"}
+    assert connector.run_command.call_count == 1
+
+
+def test_build_powershell_batch_quotes_keys():
+    script = build_powershell_batch({"Owner's Name": "hostname"})
+
+    assert "$__sc['Owner''s Name'] = (& { hostname } | Out-String).Trim()" in script
+    assert script.endswith("$__sc | ConvertTo-Json -Compress")
+
+
+def test_parse_powershell_batch():
+    commands = {"Hostname": "hostname", "TimeZone": "(Get-TimeZone).Id", "Build": "x"}
+    output = json.dumps({"Hostname": "WIN01", "TimeZone": ""})
+
+    results = parse_powershell_batch(output, commands)
+
+    assert results == {"Hostname": "WIN01", "TimeZone": "Error Collecting"}
+    assert parse_powershell_batch("Error Collecting", commands) == {}
+
+
+def test_windows_collector_batched_uses_single_run_ps():
+    collector = WindowsCollector(services=None, batched=True)
+    payload = {key: f"{key} value" for key in collector.collection_commands}
+    payload["Last 10 System Errors"] = "first\nsecond"
+    payload["Services"] = "MSSQLSERVER\tRunning\nSpooler\tStopped"
+
+    connector = MagicMock()
+    connector.run_command.return_value = json.dumps(payload)
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Hostname"] == "Hostname value"
+    assert system_info["Last 10 System Errors"] == ["first", "second"]
+    assert system_info["Services"] == {"MSSQLSERVER": "Running"}
+    assert connector.run_command.call_count == 1
@@ -0,0 +1,58 @@
+from benchmarks.__main__ import compare, main, percentile
+from benchmarks.backends import FakeSSHConnection, FakeWinRMConnection
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+from syscheck.models import Percent
+
+
+def connected(connection_class):
+    connector = connection_class("bench01", rtt=0, server_scale=0)
+    connector.connect()
+    return connector
+
+
+def test_fake_ssh_answers_shell_batch_in_one_command():
+    connector = connected(FakeSSHConnection)
+
+    results = LinuxCollector(distro="rhel", batched=True).collect(connector)
+
+    assert connector.commands_run == 1
+    assert results["Hostname"] == "web01.example.com"
+    assert results["CPU Usage"] == Percent(7.4)
+    assert results["Services"]["postgresql"] == "failed"
+
+
+def test_fake_winrm_answers_powershell_batch_in_one_command():
+    connector = connected(FakeWinRMConnection)
+
+    results = WindowsCollector(batched=True).collect(connector)
+
+    assert connector.commands_run == 1
+    assert results["OS Version"] == "Microsoft Windows Server 2022 Standard"
+    assert [disk.mount for disk in results["Disk Usage"]] == ["C:", "D:"]
+
+
+def test_percentile_nearest_rank():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 90) == 0.5
+    assert percentile([1.0], 99) == 1.0
+
+
+def test_baseline_comparison_flags_regressions(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"results": [{"name": "fleet/linux/10", "throughput": 100.0, "p90": 0.1}]}')
+
+    assert compare([{"name": "fleet/linux/10", "throughput": 90.0, "p90": 0.11}], str(baseline), 0.25) == []
+    regressions = compare([{"name": "fleet/linux/10", "throughput": 50.0, "p90": 0.2}], str(baseline), 0.25)
+    assert len(regressions) == 2
+
+
+def test_benchmark_runs_offline(tmp_path, capsys):
+    output = tmp_path / "results.json"
+
+    status = main(["--os", "linux", "--hosts", "1,5", "--iterations", "2", "--rtt", "0", "--server-scale", "0", "--json", str(output)])
+
+    assert status == 0
+    assert "fleet/linux/5" in capsys.readouterr().out
+    assert output.exists()
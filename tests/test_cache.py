@@ -0,0 +1,58 @@
+import time
+from unittest.mock import MagicMock
+from syscheck.cache import ResultCache
+from syscheck.collectors.LinuxCollector import LinuxCollector
+
+
+def test_cache_round_trip_and_ttl(tmp_path):
+    path = tmp_path / "cache" / "results.json"
+    cache = ResultCache(path)
+    cache.set("web01", "Kernel", "5.14.0")
+    cache.set("web01", "Hostname", "Error Collecting : timeout")
+    cache.save()
+
+    reloaded = ResultCache(path)
+    assert reloaded.get("web01", "Kernel", ttl=60) == "5.14.0"
+    assert reloaded.get("web01", "Hostname", ttl=60) is None
+    assert reloaded.get("web02", "Kernel", ttl=60) is None
+
+    reloaded.entries["web01"]["Kernel"]["time"] = time.time() - 120
+    assert reloaded.get("web01", "Kernel", ttl=60) is None
+
+
+def test_cache_refresh_bypasses_reads(tmp_path):
+    cache = ResultCache(tmp_path / "results.json")
+    cache.set("web01", "Kernel", "5.14.0")
+
+    cache.refresh = True
+    assert cache.get("web01", "Kernel", ttl=60) is None
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text("{not json")
+
+    assert ResultCache(path).entries == {}
+
+
+def test_collector_skips_cached_static_facts(tmp_path):
+    cache = ResultCache(tmp_path / "results.json")
+    collector = LinuxCollector(distro="rhel", cache=cache)
+    collector.services = []
+
+    connector = MagicMock()
+    connector.host = "web01"
+    connector.run_command.side_effect = lambda command: f"out:{command.split()[0]}"
+
+    first = collector.collect(connector)
+    first_calls = connector.run_command.call_count
+    connector.run_command.reset_mock()
+
+    second = collector.collect(connector)
+    commands = [call[0][0] for call in connector.run_command.call_args_list]
+
+    assert second == first
+    assert connector.run_command.call_count == first_calls - 5
+    assert "hostname" not in commands
+    assert "uname -r" not in commands
+    assert any(command.startswith("free") for command in commands)
@@ -0,0 +1,92 @@
+import base64
+import gzip
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.connectors.compression import GzipStreamDecoder, decompress_chunks, gzip_shell_command
+from syscheck.connectors.ssh import SSHConnection
+from syscheck.connectors.winrm import WinRMConnection
+
+TEXT = ("nginx.service loaded active running A high performance web server\n" * 200).encode()
+
+
+def test_decoder_streams_gzip_in_small_chunks():
+    compressed = gzip.compress(TEXT)
+    decoder = GzipStreamDecoder()
+
+    output = b"".join(decoder.feed(compressed[start:start + 7]) for start in range(0, len(compressed), 7))
+    output += decoder.flush()
+
+    assert output == TEXT
+    assert decoder.bytes_in == len(compressed) < len(TEXT) == decoder.bytes_out
+
+
+def test_decoder_passes_plain_output_through():
+    assert decompress_chunks(b"x") == b"x"
+    assert decompress_chunks(TEXT) == TEXT
+
+
+def test_decoder_limit_bounds_expansion():
+    decoder = GzipStreamDecoder()
+
+    assert len(decoder.feed(gzip.compress(TEXT), 100)) == 100
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs sh and gzip")
+def test_gzip_shell_command_round_trips():
+    output = subprocess.run(["sh", "-c", gzip_shell_command("printf 'a\\nb\\n'; echo oops >&2")], capture_output=True)
+
+    assert output.stdout.startswith(b"\x1f\x8b")
+    assert gzip.decompress(output.stdout) == b"a\nb\n"
+    assert output.stderr == b"oops\n"
+
+
+def test_ssh_connect_enables_transport_compression(mock_sshclient):
+    SSHConnection(host="1.2.3.4", user="testuser", password="secret", compress=True).connect()
+
+    assert mock_sshclient.return_value.connect.call_args.kwargs["compress"] is True
+
+
+def test_ssh_run_compressed_decompresses_and_counts_wire_bytes(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret", compress=True)
+    ssh.client = instance
+    instance.exec_command.return_value = exec_result(stdout=gzip.compress(TEXT))
+
+    assert ssh.run_compressed("systemctl list-units") == TEXT.decode().strip()
+    assert "gzip -c" in instance.exec_command.call_args[0][0]
+
+
+def test_ssh_run_compressed_respects_max_output(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret", max_output=50)
+    ssh.client = instance
+    instance.exec_command.return_value = exec_result(stdout=gzip.compress(TEXT))
+
+    assert len(ssh.execute("cat big", compressed=True).stdout) == 50
+
+
+def test_winrm_run_compressed_decodes_base64_gzip():
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret", compress=True)
+    conn.client = MagicMock()
+    response = MagicMock(std_out=base64.b64encode(gzip.compress(TEXT)) + b"\r\n", std_err=b"")
+
+    with patch.object(conn, "run_ps", return_value=response) as run_ps:
+        assert conn.run_compressed("Get-Service") == TEXT.decode().strip()
+    assert "GZipStream" in run_ps.call_args[0][0]
+
+
+def test_batched_collector_uses_run_compressed_when_enabled():
+    collector = LinuxCollector(distro="rhel", batched=True)
+    connector = MagicMock(host="web01", compress=True)
+    connector.run_compressed.return_value = ""
+    connector.run_command.return_value = "value"
+
+    collector.collect(connector)
+
+    connector.run_compressed.assert_called_once()
+    assert "__SYSCHECK_" in connector.run_compressed.call_args[0][0]
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+from syscheck.cache import ResultCache
+from syscheck.collectors.events import build_journal_command, build_eventlog_command, split_cursor
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+
+
+def test_build_journal_command_quotes_cursor():
+    assert build_journal_command(None, 50) == "journalctl -p 3 -n 50 --no-pager --show-cursor"
+    assert build_journal_command("s=ab;i=1f", 50).endswith("--after-cursor='s=ab;i=1f'")
+
+
+def test_build_eventlog_command_filters_by_record_id():
+    assert "EventRecordID > 0" in build_eventlog_command(None, 25)
+    assert "EventRecordID > 4711" in build_eventlog_command("4711", 25)
+    assert "-MaxEvents 25" in build_eventlog_command("4711", 25)
+
+
+def test_build_eventlog_command_reads_oldest_first():
+    # Without -Oldest, -MaxEvents returns the newest events and the cursor skips past anything older
+    assert "-Oldest -MaxEvents 25" in build_eventlog_command("4711", 25)
+
+
+def test_split_cursor():
+    events, cursor = split_cursor("Jun 14 kernel: oops\nJun 14 sshd: fail\n-- cursor: s=abc;i=2\n")
+
+    assert events == "Jun 14 kernel: oops\nJun 14 sshd: fail"
+    assert cursor == "s=abc;i=2"
+    assert split_cursor("-- No entries --") == ("-- No entries --", None)
+
+
+def test_linux_collector_resumes_from_saved_cursor(tmp_path):
+    cursors = ResultCache(tmp_path / "cursors.json")
+    collector = LinuxCollector(distro="rhel", incremental=True, max_events=20, cursors=cursors)
+    collector.services = []
+
+    journal = {"output": "Jun 14 kernel: oops\n-- cursor: s=abc;i=2"}
+    connector = MagicMock()
+    connector.host = "web01"
+    connector.run_command.side_effect = lambda command: journal["output"] if command.startswith("journalctl") else "value"
+
+    first = collector.collect(connector)
+    assert "Last 10 Journalctl Errors" not in first
+    assert first["New Journalctl Errors"] == "Jun 14 kernel: oops"
+    assert cursors.get("web01", "New Journalctl Errors", float("inf")) == "s=abc;i=2"
+
+    journal["output"] = "-- No entries --"
+    connector.run_command.reset_mock()
+    second = collector.collect(connector)
+
+    journal_command = [c[0][0] for c in connector.run_command.call_args_list if c[0][0].startswith("journalctl")][0]
+    assert "-n 20" in journal_command
+    assert "--after-cursor='s=abc;i=2'" in journal_command
+    assert second["New Journalctl Errors"] == "-- No entries --"
+    assert cursors.get("web01", "New Journalctl Errors", float("inf")) == "s=abc;i=2"
+
+
+def test_windows_collector_records_highest_record_id(tmp_path):
+    cursors = ResultCache(tmp_path / "cursors.json")
+    collector = WindowsCollector(incremental=True, cursors=cursors)
+    collector.services = []
+
+    connector = MagicMock()
+    connector.host = "win01"
+    connector.run_command.side_effect = lambda command: "06/14/2025 [7000] Service failed\n-- cursor: 912" if "Get-WinEvent" in command else "value"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["New System Errors"] == "06/14/2025 [7000] Service failed"
+    assert cursors.get("win01", "New System Errors", float("inf")) == "912"
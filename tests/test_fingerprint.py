@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+from syscheck.blobs import BlobStore, EMPTY_DIGEST, digest_of
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.history import flatten_results
+
+OUTPUTS = {
+    "/etc/os-release": '"Rocky Linux 9.4 (Blue Onyx)"',
+    "uname -r": "5.14.0-427.13.1.el9_4.x86_64",
+    "systemctl list-units": "sshd.service loaded active running OpenSSH server daemon",
+}
+
+
+def respond(command: str) -> str:
+    for pattern, output in OUTPUTS.items():
+        if pattern in command:
+            return digest_of(output) if "sha256sum" in command else output
+    return "value"
+
+
+def make_host(name: str):
+    connector = MagicMock(host=name)
+    connector.run_command.side_effect = respond
+    return connector
+
+
+def fetched(connector) -> list:
+    return [call[0][0] for call in connector.run_command.call_args_list if "sha256sum" not in call[0][0] and any(p in call[0][0] for p in OUTPUTS)]
+
+
+def test_blob_store_is_content_addressed(tmp_path):
+    store = BlobStore(tmp_path)
+
+    digest = store.put("line one\nline two")
+
+    assert digest == digest_of("line one\nline two")
+    assert store.get(digest) == "line one\nline two"
+    assert store.get(digest_of("unknown")) is None
+    assert store.get("Error Collecting : sha256sum: not found") is None
+    assert store.get(EMPTY_DIGEST) is None
+
+
+def test_only_the_first_host_downloads_shared_sections(tmp_path):
+    collector = LinuxCollector(distro="rhel", blobs=BlobStore(tmp_path))
+    collector.services = ["sshd"]
+    first, second = make_host("web01"), make_host("web02")
+
+    first_info = collector.collect(first)
+    second_info = collector.collect(second)
+
+    assert len(fetched(first)) == 3
+    assert fetched(second) == []
+    assert second_info["Kernel"] == "5.14.0-427.13.1.el9_4.x86_64"
+    assert str(second_info["Services"]["sshd"]) == "active"
+    assert second_info["Fingerprints"] == first_info["Fingerprints"]
+    assert second_info["Fingerprints"]["Kernel"] == f"sha256:{digest_of(OUTPUTS['uname -r'])}"
+
+
+def test_errors_are_not_stored_as_blobs(tmp_path):
+    collector = LinuxCollector(distro="rhel", blobs=BlobStore(tmp_path))
+    collector.services = []
+    connector = MagicMock(host="web01")
+    connector.run_command.side_effect = lambda command: "Error Collecting : permission denied"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Kernel"] == "Error Collecting : permission denied"
+    assert "Fingerprints" not in system_info
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_without_blob_store_nothing_is_hashed():
+    collector = LinuxCollector(distro="rhel")
+    connector = make_host("web01")
+
+    system_info = collector.collect(connector)
+
+    assert all("sha256sum" not in call[0][0] for call in connector.run_command.call_args_list)
+    assert "Fingerprints" not in system_info
+
+
+def test_history_stores_blob_references():
+    results = {"Kernel": "5.14", "Services": {"sshd": "active"}, "Fingerprints": {"Kernel": "sha256:abc", "Services": "sha256:def"}}
+
+    rows = flatten_results(results)
+
+    assert ("Kernel", "sha256:abc", None) in rows
+    assert ("Services", "sha256:def", None) in rows
+    assert ("Services.sshd", "active", None) in rows
+    assert not any(metric.startswith("Fingerprints") for metric, _, _ in rows)
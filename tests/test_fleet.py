@@ -0,0 +1,112 @@
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from syscheck.fleet import load_inventory, run_fleet
+from syscheck.main import run_inventory, parse_args
+
+
+def test_load_inventory(tmp_path):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("""
+# web tier
+web01 os=rhel user=root key=~/.ssh/id_rsa
+web02 os=ubuntu user=admin services=nginx*,php*
+
+win01 os=windows user=svc profile=windows
+    """.strip())
+
+    targets = load_inventory(str(inventory))
+
+    assert [t["host"] for t in targets] == ["web01", "web02", "win01"]
+    assert targets[0]["key"] == "~/.ssh/id_rsa"
+    assert targets[1]["services"] == ["nginx*", "php*"]
+    assert targets[2]["profile"] == "windows"
+
+
+def test_load_inventory_rejects_bad_fields(tmp_path):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("web01 rhel root\n")
+
+    with pytest.raises(ValueError):
+        load_inventory(str(inventory))
+
+
+def test_run_fleet_streams_results_and_isolates_failures():
+    def ok():
+        return {"Hostname": "ok"}
+
+    def broken():
+        raise ConnectionError("Failed to connect to target")
+
+    def slow():
+        time.sleep(0.05)
+        return {"Hostname": "slow"}
+
+    streamed = []
+    finished = run_fleet([("slow", slow), ("ok", ok), ("broken", broken)], workers=3, on_result=streamed.append)
+
+    assert [r.host for r in streamed] == [r.host for r in finished]
+    assert streamed[-1].host == "slow"
+    by_host = {r.host: r for r in finished}
+    assert by_host["ok"].results == {"Hostname": "ok"}
+    assert by_host["broken"].error == "Failed to connect to target"
+    assert all(r.elapsed >= 0 for r in finished)
+
+
+def test_run_fleet_abandons_hosts_past_timeout():
+    finished = run_fleet([("hung", lambda: time.sleep(2)), ("ok", lambda: {})], workers=2, host_timeout=0.1)
+
+    by_host = {r.host: r for r in finished}
+    assert by_host["hung"].error.startswith("Timed out")
+    assert by_host["ok"].error is None
+
+
+def test_run_fleet_replaces_workers_stuck_on_abandoned_hosts():
+    never = threading.Event()
+    try:
+        finished = run_fleet([("hung", never.wait), ("ok", lambda: {})], workers=1, host_timeout=0.3)
+    finally:
+        never.set()
+
+    by_host = {r.host: r for r in finished}
+    assert by_host["hung"].error.startswith("Timed out")
+    assert by_host["ok"].results == {}
+
+
+def test_run_fleet_closes_abandoned_hosts():
+    abandoned = []
+    run_fleet([("hung", lambda: time.sleep(2)), ("ok", lambda: {})], workers=2, host_timeout=0.1, on_abandon=abandoned.append)
+
+    assert abandoned == ["hung"]
+
+
+def test_abandoned_hosts_do_not_delay_exit():
+    code = (
+        "import time\n"
+        "from syscheck.fleet import run_fleet\n"
+        "print(run_fleet([('hung', lambda: time.sleep(4))], host_timeout=0.2)[0].error)"
+    )
+    start = time.time()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "Timed out after 0.2 seconds"
+    assert time.time() - start < 3
+
+
+def test_run_inventory_prompts_for_password_once(tmp_path, capfd, monkeypatch):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("web01 os=rhel user=root\nweb02 os=rhel user=root\n")
+    monkeypatch.setattr("sys.argv", ["syscheck", "-i", str(inventory), "-w", "2", "--no-precheck"])
+    args = parse_args()
+
+    with patch("syscheck.main.getpass.getpass", return_value="secret") as mock_getpass, \
+         patch("syscheck.main.gather_info", return_value={"Hostname": "web"}):
+        run_inventory(args)
+
+    mock_getpass.assert_called_once()
+    output = capfd.readouterr().out
+    assert "web01" in output and "web02" in output
+    assert "2 succeeded, 0 failed" in output
@@ -3,10 +3,11 @@ import re
 import json
 from syscheck.formatter.TerminalFormatter import to_terminal 
 from syscheck.formatter.jsonFormatter import to_json
-from syscheck.formatter.htmlFormatter import to_html
+from syscheck.formatter.htmlFormatter import to_html, open_report, close_report
 import os
 import tempfile
 from unittest.mock import patch
+from syscheck.main import cli_entry_point
 
 
 def strip_ansi_codes(text: str) -> str:
@@ -81,7 +82,7 @@ def test_to_json_output(capfd):
     assert lines[0] == "{"
     assert lines[1].startswith('    "Hostname":')
 
-def test_to_html_creates_file_and_opens_browser(tmp_path):
+def test_to_html_writes_file_without_opening_browser(tmp_path):
     results = {
         "Hostname": "test-rocky",
         "Uptime": "up 5 hours, 1 minute",
@@ -91,26 +92,56 @@ def test_to_html_creates_file_and_opens_browser(tmp_path):
         }
     }
     host = "test-rocky"
+    file_path = tmp_path / "report.html"
 
     with patch("webbrowser.open") as mock_open:
-        to_html(results, host)
+        to_html(results, host, str(file_path))
 
-        mock_open.assert_called_once()
-        
-        file_url = mock_open.call_args[0][0]
-        assert file_url.startswith("file://")
+        mock_open.assert_not_called()
 
-        file_path = file_url[len("file://"):]
+    html_content = file_path.read_text(encoding="utf-8")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
+    assert "<html>" in html_content
+    assert f"System Info: {host}" in html_content
+    assert "<strong>Hostname</strong>" in html_content
+    assert "<strong>Uptime</strong>" in html_content
+    assert "<strong>Services</strong>" in html_content
+    assert "sshd" in html_content
+    assert "firewalld" in html_content
+    assert html_content.rstrip().endswith("</html>")
 
-        assert "<html>" in html_content
-        assert f"System Info: {host}" in html_content
-        assert "<strong>Hostname</strong>" in html_content
-        assert "<strong>Uptime</strong>" in html_content
-        assert "<strong>Services</strong>" in html_content
-        assert "sshd" in html_content
-        assert "firewalld" in html_content
 
-        os.remove(file_path)
\ No newline at end of file
+def test_to_html_defaults_to_stdout(capsys):
+    to_html({"Hostname": "<script>"}, "web01")
+
+    captured = capsys.readouterr()
+    assert "System Info: web01" in captured.out
+    assert "&lt;script&gt;" in captured.out
+
+
+def test_html_on_stdout_is_not_wrapped_in_banner(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["syscheck", "-H", "web01", "-u", "root", "-o", "rhel", "-O", "html"])
+
+    with patch("syscheck.main.run", side_effect=lambda args: to_html({"Hostname": "web01"}, "web01")):
+        cli_entry_point()
+
+    captured = capsys.readouterr()
+    assert captured.out.startswith("<html>")
+    assert captured.out.rstrip().endswith("</html>")
+    assert "Collection Complete" in captured.err
+
+
+def test_html_report_indexes_many_hosts(tmp_path):
+    file_path = tmp_path / "fleet.html"
+    report = open_report(str(file_path), "Fleet")
+    report.add_host("web01", {"Uptime": "up 1 hour", "CPU Usage": "12.5% used"}, elapsed=1.25)
+    report.add_host("web02", None, error="Timed out after 5 seconds", elapsed=5.0)
+    close_report(report)
+
+    html_content = file_path.read_text(encoding="utf-8")
+    assert html_content.count("<tbody") == 2
+    assert "<a href='#host-1'>web01</a>" in html_content
+    assert "12.5% used" in html_content
+    assert "Timed out after 5 seconds" in html_content
+    assert "sortHosts(0)" in html_content and "filterHosts" in html_content
+    assert report.stream.closed
@@ -0,0 +1,65 @@
+import time
+from syscheck.history import HistoryStore, flatten_results
+from syscheck.models import DiskUsage, MemoryUsage, Percent, ServiceState
+
+
+LINUX_RESULTS = {
+    "Hostname": "web01",
+    "CPU Usage": Percent(42.5),
+    "Uptime": "up 5 hours",
+    "Disk Usage": [DiskUsage("/", 50, 47, 3), DiskUsage("/data", 100, 10, 90)],
+    "Services": {"sshd": ServiceState.ACTIVE},
+}
+
+
+def test_flatten_results():
+    rows = {metric: (value, number) for metric, value, number in flatten_results(LINUX_RESULTS)}
+
+    assert rows["CPU Usage"] == ("42.50% used", 42.5)
+    assert rows["Uptime"] == ("up 5 hours", None)
+    assert rows["Disk Usage[/]"][1] == 94.0
+    assert rows["Disk Usage[/data]"][1] == 10.0
+    assert rows["Services.sshd"] == ("active", None)
+    assert rows["Disk Usage"][0].count("\n") == 1
+
+
+def test_flatten_memory_uses_percent():
+    rows = {metric: number for metric, _, number in flatten_results({"Memory Usage": MemoryUsage(200, 50)})}
+    assert rows["Memory Usage"] == 25.0
+
+
+def test_series_for_host(tmp_path):
+    history = HistoryStore(tmp_path / "history.db")
+    now = time.time()
+    history.record("web01", {"CPU Usage": Percent(10.0)}, ts=now - 48 * 3600)
+    history.record("web01", {"CPU Usage": Percent(20.0)}, ts=now - 3600)
+    history.record("web01", {"CPU Usage": Percent(30.0)}, ts=now)
+    history.record("web02", {"CPU Usage": Percent(99.0)}, ts=now)
+
+    rows = history.series("web01", "CPU Usage", now - 24 * 3600)
+
+    assert [number for _, _, _, number in rows] == [20.0, 30.0]
+    history.close()
+
+
+def test_latest_above_uses_most_recent_snapshot(tmp_path):
+    history = HistoryStore(tmp_path / "history.db")
+    history.record("web01", LINUX_RESULTS, ts=1)
+    history.record("web02", LINUX_RESULTS, ts=1)
+    history.record("web02", {"Disk Usage": [DiskUsage("/", 50, 5, 45)]}, ts=2)
+
+    rows = history.latest_above("Disk Usage*", 90)
+
+    assert [(host, metric, number) for host, metric, number, _ in rows] == [("web01", "Disk Usage[/]", 94.0)]
+    history.close()
+
+
+def test_history_persists_between_opens(tmp_path):
+    path = tmp_path / "history.db"
+    history = HistoryStore(path)
+    history.record("web01", {"Memory Usage": "50.00% used"}, ts=100)
+    history.close()
+
+    history = HistoryStore(path)
+    assert history.series("web01", "Memory Usage", 0)[0][3] == 50.0
+    history.close()
@@ -0,0 +1,27 @@
+import fnmatch
+
+import pytest
+
+from syscheck.collectors.matcher import ServiceMatcher, service_matcher
+
+PATTERNS = ["*ssh*", "nginx", "php?-fpm", "[!a-m]*db", "app[0-9].*", "*SQL*", "literal[*]star", "dots.in.name"]
+NAMES = [
+    "sshd", "openssh-server", "nginx", "nginx-debug", "php7-fpm", "php-fpm", "mariadb", "zdb", "adb",
+    "app1.web", "appx.web", "MSSQLSERVER", "mysql", "literal*star", "literalxstar", "dots.in.name", "dotsxinxname", "",
+]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_matches_exactly_like_fnmatch(name):
+    expected = any(fnmatch.fnmatch(name, pattern) for pattern in PATTERNS)
+
+    assert ServiceMatcher(PATTERNS).matches(name) is expected
+
+
+def test_empty_patterns_match_nothing():
+    assert ServiceMatcher([]).matches("sshd") is False
+
+
+def test_matcher_is_shared_for_the_same_patterns():
+    assert service_matcher(tuple(PATTERNS)) is service_matcher(tuple(PATTERNS))
+    assert service_matcher(tuple(PATTERNS)) is not service_matcher(("*ssh*",))
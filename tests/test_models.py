@@ -0,0 +1,98 @@
+import json
+from unittest.mock import MagicMock
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+from syscheck.collectors.parsers import extract_number, parse_linux_disks, parse_memory, parse_percent, parse_windows_disks
+from syscheck.formatter.jsonFormatter import to_json
+from syscheck.models import DiskUsage, MemoryUsage, Percent, ServiceState
+
+DF_OUTPUT = """Filesystem        1B-blocks        Used       Avail Use% Mounted on
+/dev/sda1       53660876800 47244640256  6416236544  89% /
+tmpfs            4096000000           0  4096000000   0% /mnt/my disk"""
+
+
+def test_parse_percent():
+    assert parse_percent("3.1% used") == Percent(3.1)
+    assert parse_percent("12.34") == Percent(12.34)
+    assert parse_percent("value") is None
+
+
+def test_parse_memory():
+    assert parse_memory("8000000000 2000000000") == MemoryUsage(8000000000, 2000000000)
+    assert parse_memory("1000 100\n3000 300").percent == 10.0
+    assert parse_memory("value") is None
+
+
+def test_parse_linux_disks():
+    disks = parse_linux_disks(DF_OUTPUT)
+
+    assert disks[0] == DiskUsage("/", 53660876800, 47244640256, 6416236544)
+    assert round(disks[0].percent) == 88
+    assert disks[1].mount == "/mnt/my disk"
+
+
+def test_parse_windows_disks():
+    assert parse_windows_disks("C 90 10\nD 0 500") == [DiskUsage("C:", 100, 90, 10), DiskUsage("D:", 500, 0, 500)]
+
+
+def test_models_use_slots():
+    assert not hasattr(Percent(1.0), "__dict__")
+    assert not hasattr(DiskUsage("/", 1, 1, 0), "__dict__")
+
+
+def test_service_state_enum():
+    assert ServiceState("active") is ServiceState.ACTIVE
+    assert ServiceState("Running").is_running
+    assert ServiceState("something-new") is ServiceState.UNKNOWN
+    assert ServiceState.FAILED == "failed"
+
+
+def test_linux_collector_returns_typed_results():
+    collector = LinuxCollector(distro="rhel")
+    outputs = {
+        "CPU Usage": "3.1% used",
+        "Memory Usage": "8000 2000",
+        "Swap Usage": "0 0",
+        "Disk Usage": DF_OUTPUT,
+        "Services": "sshd.service loaded active running OpenSSH server daemon",
+    }
+    connector = MagicMock()
+    connector.run_command.side_effect = lambda command: next(
+        (output for key, output in outputs.items() if command == collector.build_commands()[key]), "value")
+
+    system_info = collector.collect(connector)
+
+    assert system_info["CPU Usage"] == Percent(3.1)
+    assert system_info["Memory Usage"].percent == 25.0
+    assert str(system_info["Swap Usage"]) == "not configured"
+    assert [disk.mount for disk in system_info["Disk Usage"]] == ["/", "/mnt/my disk"]
+    assert system_info["Services"]["sshd"] is ServiceState.ACTIVE
+    assert system_info["Kernel"] == "value"
+
+
+def test_windows_collector_keeps_errors_as_text():
+    collector = WindowsCollector()
+    connector = MagicMock()
+    connector.run_command.return_value = "Error Collecting : access denied"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Memory Usage"] == "Error Collecting : access denied"
+    assert system_info["Disk Usage"] == "Error Collecting : access denied"
+
+
+def test_json_renders_models(capsys):
+    to_json({"Memory Usage": MemoryUsage(200, 50), "Services": {"sshd": ServiceState.ACTIVE}, "Disk Usage": [DiskUsage("/", 10, 4, 6)]})
+
+    parsed = json.loads(capsys.readouterr().out)
+    assert parsed["Memory Usage"] == {"total": 200, "used": 50, "percent": 25.0}
+    assert parsed["Services"] == {"sshd": "active"}
+    assert parsed["Disk Usage"][0]["percent"] == 40.0
+
+
+def test_extract_number():
+    assert extract_number("37.50% used") == 37.5
+    assert extract_number("12.34") == 12.34
+    assert extract_number("0.42 0.31 0.20") == 0.42
+    assert extract_number("Error Collecting : timeout") is None
+    assert extract_number(["a", "b"]) is None
@@ -0,0 +1,93 @@
+import io
+import json
+import pytest
+from unittest.mock import patch
+from syscheck.formatter.ndjsonFormatter import to_ndjson
+from syscheck.main import cli_entry_point, parse_args, run_inventory
+
+
+RESULTS = {
+    "Hostname": "web01",
+    "Services": {"sshd": "active"},
+    "Last 10 Journalctl Errors": ["Jan 01 kernel: \"oops\"", "Jan 02 sshd: failed"],
+}
+
+
+def test_one_compact_record_per_host():
+    stream = io.StringIO()
+    to_ndjson(RESULTS, "web01", stream=stream, elapsed=1.5)
+    to_ndjson(RESULTS, "web02", stream=stream, elapsed=2.0)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert " " not in lines[0].split('"results"')[0]
+    record = json.loads(lines[0])
+    assert record["host"] == "web01"
+    assert record["elapsed"] == 1.5
+    assert record["results"] == RESULTS
+
+
+def test_per_metric_records():
+    stream = io.StringIO()
+    to_ndjson(RESULTS, "web01", per_metric=True, stream=stream)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record["metric"] for record in records] == list(RESULTS)
+    assert records[2]["value"] == RESULTS["Last 10 Journalctl Errors"]
+    assert all(record["host"] == "web01" for record in records)
+
+
+def test_failed_host_record():
+    stream = io.StringIO()
+    to_ndjson(None, "web03", stream=stream, error="Timed out after 5 seconds")
+
+    record = json.loads(stream.getvalue())
+    assert record["error"] == "Timed out after 5 seconds"
+    assert "results" not in record
+
+
+def test_list_items_are_written_incrementally():
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    to_ndjson({"Lines": [f"line {i}" for i in range(50)]}, "web01", stream=Recorder())
+
+    assert '"line 49"' in writes
+    assert max(len(chunk) for chunk in writes) < 100
+
+
+@pytest.mark.parametrize("output", ["ndjson", "json"])
+def test_banner_and_footer_stay_off_stdout(monkeypatch, capsys, output):
+    monkeypatch.setattr("sys.argv", ["syscheck", "-H", "web01", "-u", "root", "-o", "rhel", "-O", output])
+
+    with patch("syscheck.main.run", side_effect=lambda args: to_ndjson(RESULTS, "web01")):
+        cli_entry_point()
+
+    captured = capsys.readouterr()
+    assert [json.loads(line)["host"] for line in captured.out.splitlines()] == ["web01"]
+    assert "SysCheck-Lite Version" in captured.err
+    assert "Collection Complete" in captured.err
+
+
+def test_fleet_json_is_one_document_on_stdout(tmp_path, monkeypatch, capsys):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("web01 os=rhel user=root\nweb02 os=rhel user=root\n")
+    monkeypatch.setattr("sys.argv", ["syscheck", "-i", str(inventory), "-O", "json", "-p", "secret", "--no-precheck"])
+    args = parse_args()
+
+    def gather_info(collector, connector):
+        if connector.host == "web02":
+            raise ConnectionError("refused")
+        return RESULTS
+
+    with patch("syscheck.main.gather_info", side_effect=gather_info):
+        run_inventory(args)
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {"web01": RESULTS, "web02": {"error": "refused"}}
+    assert "=====" not in captured.out
+    assert "Fleet Summary" in captured.err
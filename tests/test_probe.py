@@ -0,0 +1,120 @@
+import json
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from syscheck.cache import ResultCache
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.probe import NO_PYTHON, build_probe_command, parse_probe_output
+from syscheck.models import DiskUsage, MemoryUsage, Percent
+
+PAYLOAD = {
+    "metrics": {
+        "Hostname": "web01",
+        "Uptime": 18061.5,
+        "CPU Usage": [["1000", "0", "500", "8000", "500", "0", "0", "0"], ["1100", "0", "550", "8300", "550", "0", "0", "0"]],
+        "Memory Usage": [8192, 2048],
+        "Disk Usage": [["/", 100, 40, 60]],
+        "Last Update": "Error Collecting : [Errno 2] No such file or directory",
+    },
+    "commands": {"Services": "sshd.service loaded active running OpenSSH"},
+}
+
+
+def make_collector():
+    collector = LinuxCollector(distro="rhel", mode="probe")
+    collector.services = ["sshd"]
+    return collector
+
+
+def test_parse_probe_output_builds_models():
+    outputs = parse_probe_output(json.dumps(PAYLOAD))
+
+    assert outputs["Hostname"] == "web01"
+    assert outputs["Uptime"] == "up 5 hours, 1 minute"
+    assert outputs["CPU Usage"] == Percent(30.0)
+    assert outputs["Memory Usage"] == MemoryUsage(8192, 2048)
+    assert outputs["Disk Usage"] == [DiskUsage("/", 100, 40, 60)]
+    assert outputs["Last Update"].startswith("Error Collecting")
+    assert outputs["Services"].startswith("sshd.service")
+
+
+def test_parse_probe_output_rejects_non_payloads():
+    assert parse_probe_output(NO_PYTHON) is None
+    assert parse_probe_output("Error Collecting : timed out") is None
+    assert parse_probe_output("[1, 2]") is None
+
+
+def test_probe_mode_collects_in_one_command():
+    collector = make_collector()
+    connector = MagicMock(host="web01")
+    payload = {"metrics": PAYLOAD["metrics"], "commands": {key: "value" for key in collector.build_commands()}}
+    payload["commands"].update(PAYLOAD["commands"])
+    for key in payload["metrics"]:
+        payload["commands"].pop(key)
+    connector.run_command.return_value = json.dumps(payload)
+
+    system_info = collector.collect(connector)
+
+    assert connector.run_command.call_count == 1
+    assert "python3 - <<" in connector.run_command.call_args[0][0]
+    assert system_info["Memory Usage"] == MemoryUsage(8192, 2048)
+    assert str(system_info["Services"]["sshd"]) == "active"
+
+
+def test_probe_mode_retries_metrics_missing_from_payload():
+    collector = make_collector()
+    connector = MagicMock(host="web01")
+    connector.run_command.side_effect = lambda command: json.dumps(PAYLOAD) if "python3" in command else "value"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Memory Usage"] == MemoryUsage(8192, 2048)
+    assert system_info["TimeZone"] == "value"
+
+
+def test_probe_mode_falls_back_to_commands_without_python():
+    collector = make_collector()
+    connector = MagicMock(host="web01")
+    connector.run_command.side_effect = lambda command: NO_PYTHON if "python3" in command else "value"
+
+    system_info = collector.collect(connector)
+    calls = connector.run_command.call_count
+    collector.collect(connector)
+
+    assert system_info["Hostname"] == "value"
+    assert calls == len(collector.build_commands()) + 1
+    # The missing interpreter is remembered, so the second run goes straight to the commands
+    assert connector.run_command.call_count == calls * 2 - 1
+
+
+def test_missing_python_is_remembered_across_collectors_and_runs(tmp_path):
+    connector = MagicMock(host="web01")
+    connector.run_command.side_effect = lambda command: NO_PYTHON if "python3" in command else "value"
+
+    cache = ResultCache(tmp_path / "results.json")
+    LinuxCollector(distro="rhel", mode="probe", cache=cache).collect(connector)
+    cache.save()
+
+    # A fresh collector and cache, as for the next host in a fleet or the next run
+    connector.run_command.reset_mock()
+    LinuxCollector(distro="rhel", mode="probe", cache=ResultCache(tmp_path / "results.json")).collect(connector)
+
+    assert not any("python3" in call.args[0] for call in connector.run_command.call_args_list)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="probe reads /proc")
+def test_probe_script_runs_under_sh():
+    commands = {"Kernel": "uname -r", "Memory Usage": "free", "Disk Usage": "df", "CPU Usage": "top", "Echo": "echo hi"}
+    script = build_probe_command(commands, "/nonexistent/dnf.rpm.log", 0.05)
+
+    output = subprocess.run(["sh", "-c", script.replace("python3", sys.executable)], capture_output=True, text=True).stdout
+    outputs = parse_probe_output(output)
+
+    assert outputs["Echo"] == "hi"
+    assert outputs["Kernel"]
+    assert isinstance(outputs["Memory Usage"], MemoryUsage) and outputs["Memory Usage"].total > 0
+    assert any(disk.mount == "/" for disk in outputs["Disk Usage"])
+    assert isinstance(outputs["CPU Usage"], Percent)
@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+from syscheck.collectors.procfs import format_uptime, parse_proc_snapshot
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.models import LoadAverage, MemoryUsage, Percent
+
+SNAPSHOT = """18061.52 70512.33
+0.42 0.31 0.20 2/312 5123
+MemTotal:        8000000 kB
+MemFree:         1000000 kB
+MemAvailable:    6000000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+cpu  1000 0 500 8000 500 0 0 0 0 0
+cpu0 1000 0 500 8000 500 0 0 0 0 0
+intr 123456 0 0
+ctxt 987654
+cpu  1100 0 550 8300 550 0 0 0 0 0"""
+
+
+def test_format_uptime_matches_uptime_p():
+    assert format_uptime(18061) == "up 5 hours, 1 minute"
+    assert format_uptime(59) == "up 0 minutes"
+    assert format_uptime(8 * 86400 + 120) == "up 1 week, 1 day, 2 minutes"
+
+
+def test_parse_proc_snapshot():
+    metrics = parse_proc_snapshot(SNAPSHOT)
+
+    assert metrics["Uptime"] == "up 5 hours, 1 minute"
+    assert metrics["Load Average"] == LoadAverage(0.42, 0.31, 0.20)
+    # 150 busy jiffies out of 500 elapsed
+    assert metrics["CPU Usage"] == Percent(30.0)
+    assert metrics["Memory Usage"] == MemoryUsage(8000000 * 1024, 2000000 * 1024)
+    assert metrics["Memory Usage"].percent == 25.0
+    assert str(metrics["Swap Usage"]).startswith("25.00% used")
+
+
+def test_parse_proc_snapshot_without_swap():
+    snapshot = SNAPSHOT.replace("SwapTotal:       2000000 kB", "SwapTotal:             0 kB")
+
+    swap = parse_proc_snapshot(snapshot)["Swap Usage"]
+    assert swap.total == 0 and str(swap) == "not configured"
+
+
+def test_parse_proc_snapshot_propagates_errors():
+    metrics = parse_proc_snapshot("Error Collecting : permission denied")
+
+    assert metrics["CPU Usage"] == "Error Collecting : permission denied"
+    assert parse_proc_snapshot("garbage\nlines")["Uptime"].startswith("Error Collecting")
+
+
+def test_linux_collector_proc_mode_uses_one_snapshot_command():
+    collector = LinuxCollector(services=None, distro="rhel", mode="proc", cpu_interval=1)
+    collector.services = []
+
+    connector = MagicMock()
+    connector.run_command.side_effect = lambda command: SNAPSHOT if command == collector.proc_command else "value"
+
+    system_info = collector.collect(connector)
+
+    commands = [call[0][0] for call in connector.run_command.call_args_list]
+    assert not any("top" in command or "free" in command for command in commands)
+    assert "sleep 1 &&" in collector.proc_command
+    assert list(system_info)[:3] == ["Hostname", "Uptime", "Load Average"]
+    assert system_info["CPU Usage"] == Percent(30.0)
+    assert system_info["Kernel"] == "value"
@@ -1,7 +1,7 @@
 import pytest
 import argparse
 from pathlib import Path
-from syscheck.main import load_profile_file, create_profile_file
+from syscheck.main import load_profile_file, create_profile_file, parse_args
 
 @pytest.fixture
 def mock_profile_file(tmp_path) -> Path:
@@ -68,3 +68,25 @@ def test_create_and_load_profile(tmp_path, monkeypatch):
     assert loaded_data["user"] == "root"
     assert loaded_data["os"] == "ubuntu"
     assert loaded_data["services"] == ["httpd", "sshd"]
+
+def test_profile_skips_command_and_mode_flags(tmp_path, monkeypatch):
+    monkeypatch.setattr("syscheck.main.get_profile_dir", lambda: tmp_path)
+    monkeypatch.setattr("sys.argv", [
+        "syscheck", "-H", "acme.com", "-u", "root", "-o", "rhel", "-b", "--agent", "--record", "--watch", "5",
+        "--above", "CPU Usage", "90", "--history", "Disk*", "-i", "hosts.txt",
+    ])
+    create_profile_file("mixed", parse_args())
+
+    data = load_profile_file("mixed")
+
+    assert data["host"] == "acme.com"
+    assert data["batch"] == "True"
+    for key in ["agent", "record", "watch", "above", "history", "inventory"]:
+        assert key not in data
+
+
+def test_load_profile_ignores_command_flags_from_older_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr("syscheck.main.get_profile_dir", lambda: tmp_path)
+    (tmp_path / "old.profile").write_text("host=acme.com\nagent=True\nabove=CPU Usage,90\n")
+
+    assert load_profile_file("old") == {"host": "acme.com"}
@@ -0,0 +1,85 @@
+import socket
+from unittest.mock import MagicMock, patch
+from syscheck.connectors.ssh import SSHConnection
+from syscheck.main import parse_args, run_inventory
+from syscheck.reachability import Reachability, adaptive_timeout, check_reachable, port_for
+
+
+def test_check_reachable_reports_open_and_closed_ports():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    open_port = listener.getsockname()[1]
+
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+
+    try:
+        results = check_reachable([("127.0.0.1", open_port), ("127.0.0.1", closed_port)], timeout=1)
+    finally:
+        listener.close()
+
+    assert results[("127.0.0.1", open_port)].error is None
+    assert results[("127.0.0.1", open_port)].rtt >= 0
+    assert results[("127.0.0.1", closed_port)].error.startswith("Unreachable")
+
+
+def test_ports_and_adaptive_timeout():
+    assert port_for("windows") == 5985
+    assert port_for("rhel") == 22
+    assert adaptive_timeout(0.001, 5) == 2.02
+    assert adaptive_timeout(1.0, 5) == 5
+
+
+def test_ssh_command_deadline():
+    channel = MagicMock()
+    channel.recv_ready.return_value = False
+    channel.recv_stderr_ready.return_value = False
+    channel.exit_status_ready.return_value = False
+    channel.eof_received = False
+    channel.closed = False
+    stdout = MagicMock()
+    stdout.channel = channel
+
+    ssh = SSHConnection(host="1.2.3.4", user="root", password="secret", command_timeout=0.05)
+    ssh.client = MagicMock()
+    ssh.client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+
+    with patch("select.select"):
+        output = ssh.run_command("sleep 600")
+
+    assert output == "Error Collecting : Command timed out after 0.05 seconds"
+    channel.close.assert_called_once()
+    ssh.client.exec_command.assert_called_once_with("sleep 600", timeout=0.05)
+
+
+def test_run_inventory_skips_unreachable_hosts(tmp_path, capfd, monkeypatch):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("up01 os=rhel user=root key=/k\ndown01 os=windows user=admin key=/k\n")
+    monkeypatch.setattr("sys.argv", ["syscheck", "-i", str(inventory), "--connect-timeout", "10"])
+    args = parse_args()
+
+    def reachability(targets, timeout):
+        assert sorted(targets) == [("down01", 5985), ("up01", 22)]
+        return {
+            ("up01", 22): Reachability("up01", 22, 0.01, None),
+            ("down01", 5985): Reachability("down01", 5985, None, "Unreachable on port 5985: Connection refused"),
+        }
+
+    contacted = []
+
+    def gather(collector, connector):
+        contacted.append((connector.host, connector.connect_timeout))
+        return {"Hostname": connector.host}
+
+    with patch("syscheck.reachability.check_reachable", side_effect=reachability), \
+         patch("syscheck.main.resolve_credentials", return_value=("/k", None)), \
+         patch("syscheck.main.gather_info", side_effect=gather):
+        run_inventory(args)
+
+    assert contacted == [("up01", 2.2)]
+    output = capfd.readouterr().out
+    assert "1 succeeded, 1 failed (1 unreachable)" in output
+    assert "Connection refused" in output
@@ -0,0 +1,139 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from syscheck.fleet import run_fleet
+from syscheck.history import HistoryStore
+from syscheck.main import parse_args, run_inventory
+from syscheck.models import DiskUsage, LoadAverage, MemoryUsage, Percent, ServiceState
+from syscheck.rules import CRITICAL, OK, UNKNOWN, WARNING, RuleEngine, load_rules, overall_status, parse_rule
+
+RESULTS = {
+    "CPU Usage": Percent(91.5),
+    "Memory Usage": MemoryUsage(1000, 500),
+    "Load Average": LoadAverage(2.5, 1.0, 0.5),
+    "Disk Usage": [DiskUsage("/", 100, 95, 5), DiskUsage("/boot", 100, 10, 90)],
+    "Services": {"nginx": ServiceState.FAILED, "sshd": ServiceState.ACTIVE},
+}
+
+
+def statuses(outcomes) -> dict:
+    return {outcome.target: outcome.status for outcome in outcomes}
+
+
+def test_parse_rule_forms():
+    disk = parse_rule("disk.pcent > 90")
+    assert (disk.metric, disk.field, disk.op, disk.value, disk.severity) == ("Disk Usage", "pcent", ">", 90.0, CRITICAL)
+
+    mount = parse_rule("warning: disk[/var/log].avail < 1073741824")
+    assert (mount.mount, mount.field, mount.severity) == ("/var/log", "avail", WARNING)
+
+    service = parse_rule("service nginx != active")
+    assert (service.service, service.op, service.value) == ("nginx", "!=", "active")
+
+    assert parse_rule("cpu > 85 for 3 samples").samples == 3
+    assert parse_rule('"Swap Usage" >= 50').metric == "Swap Usage"
+
+
+@pytest.mark.parametrize("text", ["disk.pcent >> 90", "bogus > 1", "cpu.pcent > 1", "disk.inodes > 5", "service nginx > active"])
+def test_parse_rule_rejects_invalid_rules(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def test_load_rules_reports_line_numbers(tmp_path):
+    rules_file = tmp_path / "web.rules"
+    rules_file.write_text("# web tier\ndisk.pcent > 90\n\nmemory >> 80\n")
+
+    with pytest.raises(ValueError, match="line 4"):
+        load_rules(str(rules_file))
+
+
+def test_evaluate_disk_service_and_missing_metrics():
+    engine = RuleEngine([
+        parse_rule("disk.pcent > 90"),
+        parse_rule("service nginx != active"),
+        parse_rule("service sshd != active"),
+        parse_rule("service httpd* != active"),
+        parse_rule("warning: load > 2"),
+        parse_rule("swap > 50"),
+    ])
+
+    outcomes = statuses(engine.evaluate("web01", RESULTS))
+
+    assert outcomes["Disk Usage[/]"] == CRITICAL
+    assert outcomes["Disk Usage[/boot]"] == OK
+    assert outcomes["Services.nginx"] == CRITICAL
+    assert outcomes["Services.sshd"] == OK
+    # A service that is not there at all is not active either
+    assert outcomes["Services.httpd*"] == CRITICAL
+    assert outcomes["Load Average"] == WARNING
+    assert outcomes["Swap Usage"] == UNKNOWN
+
+
+def test_sample_rules_need_consecutive_breaches():
+    engine = RuleEngine([parse_rule("cpu > 85 for 3 samples")])
+
+    assert statuses(engine.evaluate("web01", RESULTS))["CPU Usage"] == OK
+    assert statuses(engine.evaluate("web01", RESULTS))["CPU Usage"] == OK
+    assert statuses(engine.evaluate("web01", RESULTS))["CPU Usage"] == CRITICAL
+    assert statuses(engine.evaluate("web01", {"CPU Usage": Percent(10.0)}))["CPU Usage"] == OK
+
+
+def test_sample_rules_are_primed_from_history(tmp_path):
+    history = HistoryStore(tmp_path / "history.db")
+    for offset, cpu in enumerate([70.0, 90.0, 95.0]):
+        history.record("web01", {"CPU Usage": Percent(cpu), "Disk Usage": [DiskUsage("/", 100, 95, 5)]}, ts=1000 + offset)
+    engine = RuleEngine([parse_rule("cpu > 85 for 3 samples"), parse_rule("disk.pcent > 90 for 2 samples")])
+
+    engine.prime("web01", history)
+    outcomes = statuses(engine.evaluate("web01", RESULTS))
+    history.close()
+
+    assert outcomes["CPU Usage"] == CRITICAL
+    assert outcomes["Disk Usage[/]"] == CRITICAL
+
+
+def test_overall_status_prefers_critical_over_unknown():
+    engine = RuleEngine([parse_rule("swap > 50"), parse_rule("warning: cpu > 50")])
+    outcomes = engine.evaluate("web01", RESULTS)
+
+    assert overall_status(outcomes) == WARNING
+    assert overall_status(engine.evaluate_failure("web02", "Timed out")) == UNKNOWN
+    assert overall_status([]) == OK
+
+
+def test_run_fleet_stops_when_asked():
+    jobs = [("bad", lambda: {"bad": True})] + [(f"slow{index}", lambda: time.sleep(0.2) or {}) for index in range(5)]
+
+    finished = run_fleet(jobs, workers=1, stop_when=lambda result: result.host == "bad")
+
+    assert [result.host for result in finished] == ["bad"]
+
+
+def test_run_inventory_returns_nagios_status_and_fails_fast(tmp_path, capfd, monkeypatch):
+    inventory = tmp_path / "hosts.txt"
+    inventory.write_text("web01 os=rhel user=root key=/k\nweb02 os=rhel user=root key=/k\nweb03 os=rhel user=root key=/k\n")
+    rules_file = tmp_path / "web.rules"
+    rules_file.write_text("disk.pcent > 90\n")
+    monkeypatch.setattr("sys.argv", ["syscheck", "-i", str(inventory), "-w", "1", "--no-precheck", "--rules", str(rules_file), "--fail-fast"])
+    args = parse_args()
+
+    calls = []
+
+    def gather(collector, connector):
+        # Later hosts are still running when the first one fails, so fail-fast has to abandon them
+        calls.append(connector)
+        if len(calls) > 1:
+            time.sleep(1)
+        return RESULTS
+
+    with patch("syscheck.main.resolve_credentials", return_value=("/k", None)), \
+         patch("syscheck.main.gather_info", side_effect=gather):
+        status = run_inventory(args)
+
+    output = capfd.readouterr().out
+    assert status == CRITICAL
+    assert "SYSCHECK CRITICAL" in output
+    assert "2 hosts not checked" in output
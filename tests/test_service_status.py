@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+from syscheck.collectors.LinuxCollector import LinuxCollector
+from syscheck.collectors.WindowsCollector import WindowsCollector
+
+
+def test_linux_services_resolved_from_single_listing():
+    collector = LinuxCollector(services=["cron*"], distro="debian")
+    listing = "\n".join([
+        "sshd.service      loaded active   running OpenSSH server daemon",
+        "cron.service      loaded active   running Regular background program processing daemon",
+        "nginx.service     loaded failed   failed  A high performance web server",
+        "dbus.service      loaded active   running D-Bus System Message Bus",
+    ])
+
+    connector = MagicMock()
+    connector.run_command.side_effect = lambda command: listing if command == collector.service_list_command else "value"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Services"] == {"sshd": "active", "cron": "active", "nginx": "failed"}
+    assert connector.run_command.call_count == len(collector.collection_commands) + 1
+
+
+def test_windows_services_resolved_from_single_listing():
+    collector = WindowsCollector(services=["Spool*"])
+    listing = "MSSQLSERVER\tRunning\nSpooler\tStopped\nW32Time\tRunning"
+
+    connector = MagicMock()
+    connector.run_command.side_effect = lambda command: listing if command == collector.service_list_command else "value"
+
+    system_info = collector.collect(connector)
+
+    assert system_info["Services"] == {"MSSQLSERVER": "Running", "Spooler": "Stopped"}
+    assert connector.run_command.call_count == len(collector.collection_commands) + 1
+
+
+def test_windows_no_matching_services():
+    collector = WindowsCollector()
+
+    connector = MagicMock()
+    connector.run_command.side_effect = lambda command: "W32Time\tRunning" if command == collector.service_list_command else "value"
+
+    assert collector.collect(connector)["Services"] == "No matching services found"
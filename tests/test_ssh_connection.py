@@ -1,14 +1,8 @@
 import pytest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, call
 from syscheck.connectors.ssh import SSHConnection
 
 
-@pytest.fixture
-def mock_sshclient():
-    with patch("paramiko.SSHClient") as mock:
-        yield mock
-
-
 def test_connect_with_password_success(mock_sshclient):
     instance = mock_sshclient.return_value
     ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
@@ -17,7 +11,7 @@ def test_connect_with_password_success(mock_sshclient):
 
     assert result is True
     instance.set_missing_host_key_policy.assert_called_once()
-    instance.connect.assert_called_once_with("1.2.3.4", username="testuser", password="secret", timeout=5)
+    instance.connect.assert_called_once_with("1.2.3.4", username="testuser", password="secret", timeout=5, banner_timeout=5, auth_timeout=5)
 
 
 def test_connect_with_key_success(mock_sshclient):
@@ -30,7 +24,7 @@ def test_connect_with_key_success(mock_sshclient):
 
         assert result is True
         instance.set_missing_host_key_policy.assert_called_once()
-        instance.connect.assert_called_once_with("1.2.3.4", username="testuser", pkey="fake_key", timeout=5)
+        instance.connect.assert_called_once_with("1.2.3.4", username="testuser", pkey="fake_key", timeout=5, banner_timeout=5, auth_timeout=5)
         mock_key.assert_called_once_with("/fake/key")
 
 
@@ -46,42 +40,96 @@ def test_connect_raises_connection_error(mock_sshclient):
     assert "Failed to establish connection" in str(excinfo.value)
 
 
-def test_run_command_success(mock_sshclient):
+def test_run_command_success(mock_sshclient, exec_result):
     instance = mock_sshclient.return_value
     ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
     ssh.client = instance
 
-    mock_stdin = MagicMock()
-    mock_stdout = MagicMock()
-    mock_stderr = MagicMock()
+    instance.exec_command.return_value = exec_result(stdout=b"command output\n")
+
+    output = ssh.run_command("ls")
 
-    mock_stdout.read.return_value = b"command output\n"
-    mock_stderr.read.return_value = b""
+    assert output == "command output"
 
-    instance.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
+
+def test_run_command_error_output(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = instance
+
+    instance.exec_command.return_value = exec_result(stderr=b"some error", exit_status=1)
 
     output = ssh.run_command("ls")
 
-    assert output == "command output"
+    assert output == "Error Collecting : some error"
 
 
-def test_run_command_error_output(mock_sshclient):
+def test_run_command_keeps_stdout_when_stderr_has_warnings(mock_sshclient, exec_result):
     instance = mock_sshclient.return_value
     ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
     ssh.client = instance
 
-    mock_stdin = MagicMock()
-    mock_stdout = MagicMock()
-    mock_stderr = MagicMock()
+    instance.exec_command.return_value = exec_result(stdout=b"-- entries --\n", stderr=b"Hint: not in group")
 
-    mock_stdout.read.return_value = b""
-    mock_stderr.read.return_value = b"some error"
+    assert ssh.run_command("journalctl") == "-- entries --"
 
-    instance.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
 
-    output = ssh.run_command("ls")
+def test_execute_drains_both_streams_and_reports_exit_status(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = instance
 
-    assert output == "Error Collecting : some error"
+    _, mock_stdout, _ = result = exec_result(stdout=b"line one\nline two\n", stderr=b"warning: partial\n", exit_status=2)
+    instance.exec_command.return_value = result
+
+    output = ssh.execute("df -h")
+
+    assert output.stdout == "line one\nline two"
+    assert output.stderr == "warning: partial"
+    assert output.exit_status == 2
+    # reads alternate between the streams instead of finishing stderr first
+    assert mock_stdout.channel.reads[:2] == ["stdout", "stderr"]
+
+
+def test_execute_reads_output_sent_after_exit_status(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = instance
+
+    _, mock_stdout, _ = result = exec_result(stdout=b"first\n")
+    channel = mock_stdout.channel
+    channel.eof_received = False
+    instance.exec_command.return_value = result
+
+    def deliver_tail(*args):
+        channel.stdout.extend(b"tail\n")
+        channel.eof_received = True
+
+    with patch("select.select", side_effect=deliver_tail):
+        output = ssh.execute("cat log")
+
+    assert output.stdout == "first\ntail"
+    assert output.exit_status == 0
+
+
+def test_execute_caps_buffered_output(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret", max_output=10)
+    ssh.client = instance
+
+    instance.exec_command.return_value = exec_result(stdout=b"x" * 100)
+
+    assert ssh.execute("yes").stdout == "x" * 10
+
+
+def test_iter_lines_streams_stdout(mock_sshclient, exec_result):
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = instance
+
+    instance.exec_command.return_value = exec_result(stdout="first\nsecönd\nlast".encode(), stderr=b"noise")
+
+    assert list(ssh.iter_lines("journalctl")) == ["first", "secönd", "last"]
 
 
 def test_run_command_raises_if_not_connected():
@@ -120,3 +168,42 @@ def test_close_no_client_does_not_raise():
     ssh.client = None
 
     ssh.close()
+
+
+def test_run_commands_overlaps_channels_up_to_limit(mock_sshclient, exec_result):
+    import threading
+    import time
+
+    instance = mock_sshclient.return_value
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+    ssh.client = instance
+
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def exec_command(command, timeout=None):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05 if command == "slow" else 0.01)
+        with lock:
+            active["now"] -= 1
+
+        return exec_result(stdout=f"{command} output".encode())
+
+    instance.exec_command.side_effect = exec_command
+
+    commands = {"Slow": "slow", "A": "a", "B": "b", "C": "c", "D": "d"}
+    outputs = ssh.run_commands(commands, max_channels=3)
+
+    assert list(outputs) == list(commands)
+    assert outputs["Slow"] == "slow output"
+    assert outputs["D"] == "d output"
+    assert 1 < active["peak"] <= 3
+
+
+def test_run_commands_raises_if_not_connected():
+    ssh = SSHConnection(host="1.2.3.4", user="testuser", password="secret")
+
+    with pytest.raises(RuntimeError):
+        ssh.run_commands({"Hostname": "hostname"})
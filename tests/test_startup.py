@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+from syscheck.registry import COLLECTORS, CONNECTORS, FORMATTERS, load
+
+HEAVY_MODULES = ["paramiko", "winrm", "asyncio", "sqlite3", "syscheck.connectors.ssh", "syscheck.formatter.htmlFormatter"]
+
+# Generous so slow CI machines pass, eager imports of paramiko and pywinrm alone took about 300 ms
+IMPORT_BUDGET = 0.25
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_importing_main_skips_heavy_dependencies():
+    loaded = run_python(
+        "import sys, syscheck.main\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+
+    assert loaded == ""
+
+
+def test_version_does_not_load_connectors():
+    loaded = run_python(
+        "import sys\n"
+        "from syscheck.main import main\n"
+        "sys.argv = ['syscheck', '--version']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+
+    assert loaded.splitlines()[-1] == "loaded:"
+
+
+def test_import_time_within_budget():
+    # Best of three, a fresh interpreter each time so nothing is already cached in sys.modules
+    timings = [
+        float(run_python("import time; start = time.perf_counter(); import syscheck.main; print(time.perf_counter() - start)"))
+        for _ in range(3)
+    ]
+
+    assert min(timings) < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize("registry", [CONNECTORS, COLLECTORS, FORMATTERS])
+def test_registry_entries_resolve(registry):
+    for key in registry:
+        assert callable(load(registry, key))
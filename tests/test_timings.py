@@ -0,0 +1,74 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from syscheck import timings
+from syscheck.collectors.WindowsCollector import WindowsCollector
+from syscheck.connectors.ssh import SSHConnection
+
+
+@pytest.fixture
+def recorder():
+    recorder = timings.enable()
+    yield recorder
+    timings.disable()
+
+
+def test_disabled_timings_share_a_no_op_span():
+    span = timings.timed("web01", "command", "uptime")
+
+    assert span is timings.NULL_SPAN
+    with span:
+        span.bytes_in += 10
+    assert span.bytes_in == 0
+
+
+def test_ssh_records_connect_and_command_bytes(recorder, mock_sshclient, exec_result):
+    mock_sshclient.return_value.exec_command.return_value = exec_result(b"hello world", b"warn")
+    ssh = SSHConnection(host="web01", user="root", password="secret")
+    ssh.connect()
+    ssh.run_command("echo   hello\n world")
+
+    spans = {span.category: span for span in recorder.spans}
+    assert set(spans) == {"connect", "command"}
+    assert spans["command"].name == "echo hello world"
+    assert spans["command"].bytes_in == len(b"hello world") + len(b"warn")
+    assert spans["command"].bytes_out == len("echo   hello\n world")
+
+
+def test_collector_records_batch_and_retries(recorder):
+    collector = WindowsCollector(batched=True)
+    collector.services = []
+    connector = MagicMock()
+    connector.host = "win01"
+    # A payload that is not JSON makes every metric fall back to its own command
+    connector.run_command.return_value = "garbled"
+
+    collector.collect(connector)
+
+    categories = [span.category for span in recorder.spans]
+    assert categories.count("batch") == 1
+    assert categories.count("collect") == 1
+    metric_spans = [span for span in recorder.spans if span.category == "metric"]
+    assert len(metric_spans) == len(collector.collection_commands)
+    assert all(span.retries == 1 for span in metric_spans)
+    assert recorder.breakdown()[0].category == "collect"
+
+
+def test_exports_json_and_chrome_trace(recorder, tmp_path):
+    with timings.timed("web01", "connect", "ssh"):
+        pass
+    with timings.timed("web02", "command", "uptime -p") as span:
+        span.bytes_in = 12
+
+    recorder.export(str(tmp_path / "timings.json"))
+    recorder.export(str(tmp_path / "trace.json"), "chrome")
+
+    summary = json.loads((tmp_path / "timings.json").read_text())
+    assert summary["totals"]["command"]["bytes_in"] == 12
+    assert len(summary["spans"]) == 2
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert {event["name"] for event in events} == {"ssh", "uptime -p"}
+    assert len({event["pid"] for event in events}) == 2
+    assert all(event["dur"] >= 0 for event in events)
@@ -0,0 +1,52 @@
+import json
+from unittest.mock import MagicMock
+from syscheck.watch import MetricStats, watch
+
+
+def test_metric_stats_min_max_avg():
+    stats = MetricStats()
+    for cpu in ("10.0% used", "30.0% used", "Error Collecting", "20.0% used"):
+        stats.update({"CPU Usage": cpu, "Disk Usage": ["/dev/sda1 90%"]})
+
+    summary = stats.summary()
+    assert summary == {"CPU Usage": {"last": 20.0, "min": 10.0, "max": 30.0, "avg": 20.0, "samples": 3}}
+
+
+def test_watch_emits_ndjson_per_tick(capfd):
+    collector = MagicMock()
+    collector.collect_volatile.side_effect = [{"CPU Usage": "10.0% used"}, {"CPU Usage": "30.0% used"}]
+    connector = MagicMock()
+
+    watch(collector, connector, interval=0, output="json", host="web01", ticks=2)
+
+    lines = capfd.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 2
+    assert records[1]["host"] == "web01"
+    assert records[1]["stats"]["CPU Usage"]["avg"] == 20.0
+    connector.connect.assert_not_called()
+
+
+def test_watch_redraws_terminal(capfd):
+    collector = MagicMock()
+    collector.collect_volatile.return_value = {"Memory Usage": "5.73% used"}
+
+    watch(collector, MagicMock(), interval=0, host="web01", ticks=2)
+
+    output = capfd.readouterr().out
+    assert output.count("\033[H\033[J") == 2
+    assert "Watching web01 - sample 2" in output
+
+
+def test_collect_volatile_skips_static_metrics():
+    from syscheck.collectors.LinuxCollector import LinuxCollector
+
+    collector = LinuxCollector(distro="rhel", mode="proc", batched=True)
+    connector = MagicMock()
+    connector.run_command.return_value = "Error Collecting"
+
+    results = collector.collect_volatile(connector)
+
+    commands = " ".join(c[0][0] for c in connector.run_command.call_args_list)
+    assert "hostname" not in commands and "uname" not in commands
+    assert set(results) == {"Uptime", "Load Average", "CPU Usage", "Memory Usage", "Swap Usage", "Disk Usage", "Services"}
@@ -1,6 +1,10 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from syscheck.connectors.winrm import WinRMConnection 
+from winrm.exceptions import WinRMOperationTimeoutError
+from syscheck.collectors.batch import build_powershell_batch
+from syscheck.collectors.WindowsCollector import WindowsCollector
+from syscheck.connectors.compression import gzip_powershell_command
+from syscheck.connectors.winrm import CMD_LINE_LIMIT, STDIN_COMMAND_LINE, WinRMConnection, encode_powershell, fits_command_line
 
 
 @pytest.fixture
@@ -9,9 +13,16 @@ def mock_winrm_session():
         yield mock_session
 
 
-def test_connect_success_without_domain(mock_winrm_session):
+def winrm_client(std_out=b"", std_err=b"", status_code=0):
     mock_client = MagicMock()
-    mock_client.run_cmd.return_value = None
+    mock_client.protocol.open_shell.return_value = "shell"
+    mock_client.protocol.run_command.return_value = "command"
+    mock_client.protocol.get_command_output_raw.return_value = (std_out, std_err, status_code, True)
+    return mock_client
+
+
+def test_connect_success_without_domain(mock_winrm_session):
+    mock_client = winrm_client()
     mock_winrm_session.return_value = mock_client
 
     conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret", domain=None)
@@ -21,13 +32,14 @@ def test_connect_success_without_domain(mock_winrm_session):
         "http://1.2.3.4:5985/wsman",
         auth=("testuser", "secret"),
         transport="ntlm",
+        operation_timeout_sec=60,
+        read_timeout_sec=66,
     )
-    mock_client.run_cmd.assert_called_once_with("whoami")
+    mock_client.protocol.run_command.assert_called_once_with("shell", "whoami")
 
 
 def test_connect_success_with_domain(mock_winrm_session):
-    mock_client = MagicMock()
-    mock_client.run_cmd.return_value = None
+    mock_client = winrm_client()
     mock_winrm_session.return_value = mock_client
 
     conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret", domain="MYDOMAIN")
@@ -37,8 +49,10 @@ def test_connect_success_with_domain(mock_winrm_session):
         "http://1.2.3.4:5985/wsman",
         auth=("MYDOMAIN\\testuser", "secret"),
         transport="kerberos",
+        operation_timeout_sec=60,
+        read_timeout_sec=66,
     )
-    mock_client.run_cmd.assert_called_once_with("whoami")
+    mock_client.protocol.run_command.assert_called_once_with("shell", "whoami")
 
 
 def test_connect_raises_connection_error(mock_winrm_session):
@@ -53,10 +67,7 @@ def test_connect_raises_connection_error(mock_winrm_session):
 
 
 def test_run_command_success(mock_winrm_session):
-    mock_client = MagicMock()
-    mock_result = MagicMock()
-    mock_result.std_out = b"output from command\n"
-    mock_client.run_ps.return_value = mock_result
+    mock_client = winrm_client(b"output from command\n")
     mock_winrm_session.return_value = mock_client
 
     conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
@@ -67,10 +78,7 @@ def test_run_command_success(mock_winrm_session):
 
 
 def test_run_command_returns_error_collecting_if_empty_stdout(mock_winrm_session):
-    mock_client = MagicMock()
-    mock_result = MagicMock()
-    mock_result.std_out = b""
-    mock_client.run_ps.return_value = mock_result
+    mock_client = winrm_client(b"")
     mock_winrm_session.return_value = mock_client
 
     conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
@@ -81,8 +89,8 @@ def test_run_command_returns_error_collecting_if_empty_stdout(mock_winrm_session
 
 
 def test_run_command_returns_error_collecting_on_exception(mock_winrm_session):
-    mock_client = MagicMock()
-    mock_client.run_ps.side_effect = Exception("Execution failed")
+    mock_client = winrm_client()
+    mock_client.protocol.get_command_output_raw.side_effect = Exception("Execution failed")
     mock_winrm_session.return_value = mock_client
 
     conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
@@ -108,3 +116,81 @@ def test_close_resets_client(mock_winrm_session):
 
     conn.close()
     assert conn.client is None
+
+
+def batch_scripts():
+    # The default batch script plus the incremental and compressed variants, the largest the CLI sends
+    collector = WindowsCollector(batched=True)
+    incremental = WindowsCollector(batched=True, incremental=True)
+    script = build_powershell_batch(collector.build_commands())
+    incremental_script = build_powershell_batch(incremental.build_commands())
+    return [script, incremental_script, gzip_powershell_command(incremental_script)]
+
+
+@pytest.mark.parametrize("script", batch_scripts())
+def test_batch_scripts_keep_command_line_under_cmd_limit(script):
+    mock_client = winrm_client(b"{}")
+
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
+    conn.client = mock_client
+    conn.run_ps(script)
+
+    command_lines = [call.args[1] for call in mock_client.protocol.run_command.call_args_list]
+    assert command_lines
+    assert all(len(command_line) <= CMD_LINE_LIMIT for command_line in command_lines)
+
+
+def test_long_script_is_sent_on_stdin():
+    script = batch_scripts()[0]
+    assert not fits_command_line(script)
+
+    mock_client = winrm_client(b"{\"Hostname\":\"win01\"}")
+
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
+    conn.client = mock_client
+
+    assert conn.run_command(script) == "{\"Hostname\":\"win01\"}"
+    mock_client.protocol.run_command.assert_called_once_with("shell", STDIN_COMMAND_LINE)
+    mock_client.protocol.send_command_input.assert_called_once_with("shell", "command", script.encode(), end=True)
+    mock_client.protocol.cleanup_command.assert_called_once_with("shell", "command")
+    mock_client.protocol.close_shell.assert_called_once_with("shell")
+
+
+def test_short_script_runs_encoded_command():
+    mock_client = winrm_client(b"win01")
+
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret")
+    conn.client = mock_client
+
+    assert conn.run_command("hostname") == "win01"
+    mock_client.protocol.run_command.assert_called_once_with("shell", f"powershell -encodedcommand {encode_powershell('hostname')}")
+    mock_client.protocol.send_command_input.assert_not_called()
+
+
+def test_command_timeout_stops_waiting_on_output():
+    # pywinrm's get_command_output would retry these operation timeouts forever
+    mock_client = winrm_client()
+    mock_client.protocol.get_command_output_raw.side_effect = WinRMOperationTimeoutError()
+
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret", command_timeout=0.2)
+    conn.client = mock_client
+
+    assert conn.run_command("Get-Process") == "ERROR_COLLECTING"
+    mock_client.protocol.get_command_output.assert_not_called()
+    mock_client.protocol.cleanup_command.assert_called_once_with("shell", "command")
+    mock_client.protocol.close_shell.assert_called_once_with("shell")
+
+
+def test_connect_probe_uses_connect_timeout(mock_winrm_session):
+    mock_client = winrm_client()
+    probe_timeouts = []
+    mock_client.protocol.run_command.side_effect = lambda shell_id, command: probe_timeouts.append(
+        (mock_client.protocol.operation_timeout_sec, mock_client.protocol.transport.read_timeout_sec))
+    mock_winrm_session.return_value = mock_client
+
+    conn = WinRMConnection(host="1.2.3.4", user="testuser", password="secret", connect_timeout=3, command_timeout=60)
+    assert conn.connect() is True
+
+    assert probe_timeouts == [(3, (3, 4))]
+    assert mock_client.protocol.operation_timeout_sec == 60
+    assert mock_client.protocol.transport.read_timeout_sec == (3, 64)